@@ -1,18 +1,18 @@
 from dataclasses import is_dataclass, fields
 from enum import Enum
 from json import load
-from typing import Type, TypeVar
+from typing import Type, TypeVar, Union, get_args, get_origin
 
 from numpy import ndarray, array
 
-from comp.models import CenterConfig, CenterData, ElementConfig, ElementData
+from comp.models import CenterConfig, CenterData, ElementConfig, ElementData, SparseMatrix
 
 T_dataclass = TypeVar("T_dataclass")
 
 
 def _parse_dataclass(cls: Type[T_dataclass], data: dict) -> T_dataclass:
     """
-    Parse a dictionary into a dataclass instance, handling Enums and nested dataclasses.
+    Parse a dictionary into a dataclass instance, handling (optional) Enums and nested dataclasses.
 
     :param cls: The dataclass type to parse into.
     :param data: Dictionary containing the data to parse.
@@ -25,6 +25,9 @@ def _parse_dataclass(cls: Type[T_dataclass], data: dict) -> T_dataclass:
         if name not in data:
             continue
         value = data[name]
+        options = [option for option in get_args(field_type) if option is not type(None)]
+        if get_origin(field_type) is Union and len(options) == 1:
+            field_type = options[0] if value is not None else None  # Optional[X]: parse as X unless it is None
         if isinstance(field_type, type) and issubclass(field_type, Enum):
             kwargs[name] = field_type[value]
         elif is_dataclass(field_type):
@@ -38,6 +41,9 @@ def _parse_element_data(data: dict) -> ElementData:
     """
     Parse element data from a dictionary, converting lists to numpy arrays.
 
+    The aggregated plan costs are either a dense nested list or a sparse matrix object
+    with CSR ("shape", "indptr", "indices", "data") or COO ("shape", "row", "col", "data") keys.
+
     :param data: Dictionary containing element data.
     :return: ElementData object containing the parsed data.
     """
@@ -51,7 +57,8 @@ def to_array(lst: list | None) -> ndarray | None:
         coeffs_functional=to_array(data["coeffs_functional"]),
         resource_constraints=(to_array(rc_raw[0]), to_array(rc_raw[1]), to_array(rc_raw[2]),
                               ) if rc_raw else (None, None, None),
-        aggregated_plan_costs=to_array(data["aggregated_plan_costs"]),
+        aggregated_plan_costs=SparseMatrix.from_dict(costs) if isinstance(
+            costs := data["aggregated_plan_costs"], dict) else to_array(costs),
         delta=data.get("delta") if data.get("delta") is not None else None,
         w=to_array(data.get("w")) if data.get("w") is not None else None,
     )
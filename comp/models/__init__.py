@@ -1,6 +1,10 @@
 from .base import BaseConfig, BaseData
-from .center import CenterConfig, CenterData, CenterType
+from .center import (CenterConfig, CenterData, CenterType, ExecutionBackend, ExecutionMode, ExecutionStatus,
+                     SchedulerType)
 from .element import ElementConfig, ElementData, ElementType, ElementSolution
+from .packed import PackedCenterData, segment_sum
+from .sparse import SparseMatrix, count_nonzero_costs, iter_rows
+from .sweep import WeightSweep
 
 __all__ = [
     "BaseConfig",
@@ -8,8 +12,18 @@
     "CenterConfig",
     "CenterData",
     "CenterType",
+    "ExecutionBackend",
+    "ExecutionMode",
+    "ExecutionStatus",
     "ElementConfig",
     "ElementData",
     "ElementType",
     "ElementSolution",
+    "PackedCenterData",
+    "SchedulerType",
+    "segment_sum",
+    "SparseMatrix",
+    "count_nonzero_costs",
+    "iter_rows",
+    "WeightSweep",
 ]
@@ -1,5 +1,27 @@
 from dataclasses import dataclass
 from enum import Enum
+from typing import Optional
+
+from numpy import ndarray
+
+
+def read_only(values: Optional[ndarray]) -> Optional[ndarray]:
+    """
+    Get a read-only view of an array without copying its buffer.
+
+    The caller’s array keeps its own flags; only the returned view is protected against writes.
+    Non-array values (including None) are returned unchanged.
+
+    :param values: The array to protect.
+    :return: A non-writeable view sharing the memory of `values`.
+    """
+
+    if not isinstance(values, ndarray):
+        return values
+
+    view = values.view()
+    view.flags.writeable = False
+    return view
 
 
 @dataclass(frozen=True)
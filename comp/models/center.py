@@ -5,7 +5,7 @@
 from numpy import ndarray
 
 from comp.utils.json_base_serializer import save_to_json as global_save_json_util
-from .base import BaseConfig, BaseData
+from .base import BaseConfig, BaseData, read_only
 from .element import ElementData
 
 
@@ -40,17 +40,142 @@ class CenterType(Enum):
     RESOURCE_ALLOCATION_COMPROMISE = auto()
 
 
+class SchedulerType(Enum):
+    """
+    Enumeration for the algorithms that assign element tasks to threads (multiprocessor scheduling, P||Cmax).
+
+    LPT:
+        Longest processing time first: every task goes to the least loaded thread, in decreasing order of duration.
+
+    A0:
+        LPT followed by the A0 refinement, which swaps one or two tasks between the most loaded
+        and the underloaded threads while this lowers the load of the most loaded one.
+
+    KARMARKAR_KARP:
+        The largest differencing method: partial partitions are repeatedly merged,
+        the two with the largest spread first, combining the largest subset of one with the smallest of the other.
+
+    MULTIFIT:
+        Binary search for the smallest thread capacity into which first-fit decreasing packs all tasks.
+        Like KARMARKAR_KARP, it assumes threads of equal speed and falls back to A0 for different worker speeds.
+
+    EXACT:
+        Branch-and-bound search for an optimal schedule, for small task counts;
+        larger instances (or an exhausted node budget) keep the best schedule found, starting from A0.
+    """
+
+    LPT = auto()
+    A0 = auto()
+    KARMARKAR_KARP = auto()
+    MULTIFIT = auto()
+    EXACT = auto()
+
+
+class ExecutionMode(Enum):
+    """
+    Enumeration for the ways the parallel executor hands element tasks to the worker processes.
+
+    STATIC:
+        Every thread receives its whole list of tasks from the schedule (see `SchedulerType`) up front.
+
+    DYNAMIC:
+        Tasks are submitted longest-first in small cost-bounded chunks, and idle workers pull the next chunk,
+        so a mispredicted duration delays only the worker running it.
+    """
+
+    STATIC = auto()
+    DYNAMIC = auto()
+
+
+class ExecutionBackend(Enum):
+    """
+    Enumeration for the ways `ParallelExecutor` can run a batch of tasks.
+
+    SEQUENTIAL:
+        All tasks run one after another in the calling process.
+
+    THREAD:
+        Tasks run on a thread pool and share the data in memory without copies. They are cheap to start,
+        but parallel only where the tasks release the GIL, or on a free-threaded interpreter.
+        The tasks must not share mutable state, e.g., every task builds its own solver.
+
+    PROCESS:
+        Tasks run on a process pool: truly parallel, but every worker has to start
+        and every task group is pickled to the workers.
+
+    INTERPRETER:
+        Tasks run on a pool of sub-interpreters with a GIL each, in the calling process: truly parallel
+        and cheaper to start than processes, while the task groups are still pickled to the interpreters.
+        Falls back to PROCESS where sub-interpreters or the extension modules do not support it.
+
+    DISTRIBUTED:
+        Tasks run on node daemons connected over TCP, one worker per daemon (see `NodePool`):
+        beyond the CPUs of one machine, while the arrays cross the network once per node, by content hash.
+        Only run when requested, with the addresses of the nodes.
+    """
+
+    SEQUENTIAL = auto()
+    THREAD = auto()
+    PROCESS = auto()
+    INTERPRETER = auto()
+    DISTRIBUTED = auto()
+
+
+class ExecutionStatus(Enum):
+    """
+    Enumeration for the outcomes of a task, or of a whole run, of the parallel executor and the center solvers.
+
+    COMPLETED:
+        The task finished; its result may still be None if it failed.
+
+    TIMED_OUT:
+        The task did not finish within the time limit of the run, or its solve stopped at the time limit
+        of its element; partial runs keep the results of the completed tasks.
+
+    CANCELLED:
+        The run was cancelled (see `CancellationToken`) before the task finished.
+
+    FAILED:
+        The worker of the task died on every attempt, e.g., a process worker that crashed in the native solver
+        or was killed for lack of memory (see `ParallelExecutor.max_retries`).
+    """
+
+    COMPLETED = auto()
+    TIMED_OUT = auto()
+    CANCELLED = auto()
+    FAILED = auto()
+
+
 @dataclass(frozen=True)
 class CenterConfig(BaseConfig):
     """Configuration data for the system center."""
 
-    min_parallelisation_threshold: Optional[int]
+    min_parallelisation_threshold: Optional[int]  # None lets the cost-aware `ExecutionPlanner` decide
     num_threads: int
 
     type: CenterType
 
     num_elements: int  # m
 
+    sweep_plans_top_k: Optional[int] = None  # plans kept per element besides the chosen one (WEIGHTED_BALANCE)
+    runtime_history_path: Optional[str] = None  # JSON file of observed element durations used for scheduling
+    scheduler: SchedulerType = SchedulerType.A0  # algorithm assigning the element tasks to threads
+    execution_mode: ExecutionMode = ExecutionMode.STATIC  # how the element tasks are handed to the workers
+    speculation_factor: Optional[float] = None  # re-execute tasks running this many times past their estimate
+    worker_affinity: bool = False  # run all tasks of an element on one worker, which reuses the element's model
+    memory_budget: Optional[float] = None  # bytes the concurrently running element tasks may take; None for no limit
+    worker_speeds: Optional[List[float]] = None  # relative speed of every thread's CPU; None for identical CPUs
+    measure_worker_speeds: bool = False  # probe the relative CPU speeds at startup instead (see `measure_cpu_speeds`)
+    max_element_threads: int = 1  # threads a huge element task may take (moldable tasks); 1 keeps every task serial
+    execution_backend: Optional[ExecutionBackend] = None  # None lets the planner or the threshold choose the backend
+    shared_memory_transport: bool = False  # hand arrays and plans to process workers through shared memory segments
+    worker_nodes: Optional[List[str]] = None  # "host:port" of the node daemon of every thread (DISTRIBUTED backend)
+    results_stream_path: Optional[str] = None  # JSON Lines file receiving every element solution as it is solved
+    task_time_limit: Optional[float] = None  # seconds every element solve may take (see `ElementConfig.time_limit`)
+    run_time_limit: Optional[float] = None  # seconds a coordination may take; unfinished tasks are then stopped
+    max_task_retries: int = 2  # reruns of a task whose worker died (e.g., crashed) before it is given up as FAILED
+    isolate_crashed_tasks: bool = False  # rerun such tasks one at a time, so a repeated crash takes no others along
+
 
 @dataclass(frozen=True)
 class CenterData(BaseData):
@@ -63,5 +188,12 @@ class CenterData(BaseData):
     global_resource_constraints: Optional[ndarray] = None  # b
     f: Optional[ndarray] = None  # f
 
+    def __post_init__(self) -> None:
+        """Freeze all arrays of the center data (see `ElementData.__post_init__`)."""
+
+        object.__setattr__(self, "coeffs_functional", list(map(read_only, self.coeffs_functional)))
+        object.__setattr__(self, "global_resource_constraints", read_only(self.global_resource_constraints))
+        object.__setattr__(self, "f", read_only(self.f))
+
     def save_to_json(self, filepath: str) -> None:
         global_save_json_util(self, filepath)
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Optional, Tuple, Dict, List
+from typing import Optional, Tuple, Dict, List, Union
 
 try:
     from typing import Self
@@ -9,7 +9,8 @@
 
 from numpy import ndarray
 
-from .base import BaseConfig, BaseData
+from .base import BaseConfig, BaseData, read_only
+from .sparse import SparseMatrix, count_nonzero_costs
 
 
 @dataclass(frozen=True)
@@ -18,6 +19,7 @@ class ElementSolution:
 
     objective: float = float("-inf")
     plan: Dict[str, List[float | List[float]]] = field(default_factory=dict)
+    timed_out: bool = False  # the solve stopped at the time limit of the element before finding a solution
 
 
 class ElementType(Enum):
@@ -46,6 +48,8 @@ class ElementConfig(BaseConfig):
     num_decision_variables: int  # n_e
     num_constraints: int  # m_e
 
+    time_limit: Optional[float] = None  # seconds a solve of the element may take (GLOP time limit); None for no limit
+
 
 @dataclass(frozen=True)
 class ElementData(BaseData):
@@ -54,29 +58,50 @@ class ElementData(BaseData):
     config: ElementConfig
     coeffs_functional: ndarray  # c_e
     resource_constraints: Tuple[Optional[ndarray], ndarray, ndarray]  # b_e, b_e_1, b_e_2
-    aggregated_plan_costs: ndarray  # A_e
+    aggregated_plan_costs: Union[ndarray, SparseMatrix]  # A_e, dense or CSR
 
     delta: Optional[float] = None  # delta_e
     w: Optional[ndarray] = None  # w_e
 
+    def __post_init__(self) -> None:
+        """
+        Freeze all arrays of the element data.
+
+        Every array is replaced with a read-only view of itself, so the data can be shared between
+        solvers and tasks without defensive copies, and any accidental in-place modification fails loudly.
+        """
+
+        object.__setattr__(self, "coeffs_functional", read_only(self.coeffs_functional))
+        object.__setattr__(self, "resource_constraints", tuple(map(read_only, self.resource_constraints)))
+        object.__setattr__(self, "aggregated_plan_costs", read_only(self.aggregated_plan_costs))
+        object.__setattr__(self, "w", read_only(self.w))
+
+    @property
+    def nnz(self) -> int:
+        """The number of non-zero entries of the aggregated plan costs A_e."""
+
+        return count_nonzero_costs(self.aggregated_plan_costs)
+
     def copy(self) -> Self:
         """
         Create a deep copy of the ElementData instance.
 
-        This method generates a new ElementData object with all its mutable
-        attributes (numpy arrays) copied, ensuring that modifications to the
-        new instance do not affect the original.
-        Immutable attributes like delta and w are assigned directly.
+        This method generates a new ElementData object with all its
+        attributes (numpy arrays) copied into new buffers.
+        Since the arrays are read-only, solvers share the original instance instead;
+        a copy is only needed to detach the data from the original buffers.
 
         :return: A new ElementData instance that is a deep copy of the original.
         """
 
         b_e, b_e_1, b_e_2 = self.resource_constraints
+        a_e = self.aggregated_plan_costs
         return ElementData(
             config=self.config,
             coeffs_functional=self.coeffs_functional.copy(),
             resource_constraints=(b_e.copy() if b_e is not None else None, b_e_1.copy(), b_e_2.copy()),
-            aggregated_plan_costs=self.aggregated_plan_costs.copy(),
+            aggregated_plan_costs=SparseMatrix(a_e.shape, a_e.indptr.copy(), a_e.indices.copy(), a_e.data.copy())
+            if isinstance(a_e, SparseMatrix) else a_e.copy(),
             delta=self.delta,
             w=self.w.copy() if self.w is not None else None,
         )
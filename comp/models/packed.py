@@ -0,0 +1,331 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    from typing import Self
+except ImportError:
+    from typing_extensions import Self
+
+from numpy import (add, append, arange, array, asarray, bincount, concatenate, cumsum, diff, full, isnan, nan, ndarray,
+                   repeat, where, zeros, float64, int64)
+
+from comp.utils.assertions import assert_valid_dimensions
+from .base import read_only
+from .center import CenterConfig, CenterData
+from .element import ElementConfig, ElementData, ElementType
+from .sparse import SparseMatrix
+
+
+def segment_sum(values: ndarray, offsets: ndarray) -> ndarray:
+    """
+    Sum consecutive segments of a flat array.
+
+    Segment `i` is `values[offsets[i]:offsets[i + 1]]`; empty segments sum to zero.
+
+    :param values: The flat array of values.
+    :param offsets: The segment boundaries, of length (number of segments + 1).
+    :return: An array with the sum of every segment.
+    """
+
+    if len(offsets) < 2:
+        return zeros(0)
+
+    starts = offsets[:-1]
+    sums = add.reduceat(append(asarray(values, dtype=float64), 0.), starts)
+    sums[starts == offsets[1:]] = 0.
+    return sums
+
+
+def _offsets(lengths: ndarray) -> ndarray:
+    """
+    Convert segment lengths into segment boundaries.
+
+    :param lengths: The length of every segment.
+    :return: The boundaries, starting with 0, of length (len(lengths) + 1).
+    """
+
+    return concatenate(([0], cumsum(lengths))).astype(int64)
+
+
+def _concat(parts: Sequence[Optional[ndarray]], lengths: ndarray) -> ndarray:
+    """
+    Concatenate per-element vectors, padding missing ones with NaN of the expected length.
+
+    :param parts: The vectors to concatenate, None where the element has no such vector.
+    :param lengths: The expected length of every vector.
+    :return: The flat concatenation as a float array.
+    """
+
+    return concatenate([asarray(part, dtype=float64).ravel() if part is not None else full(length, nan)
+                        for part, length in zip(parts, lengths)]) if len(parts) else zeros(0)
+
+
+@dataclass(frozen=True)
+class PackedCenterData:
+    """
+    Struct-of-arrays (CSR-style) representation of `CenterData`.
+
+    All per-element vectors are concatenated into flat arrays: element `e` owns the variables
+    `var_offsets[e]:var_offsets[e + 1]` and the constraints `con_offsets[e]:con_offsets[e + 1]`.
+    The matrices A_e are stored as one CSR matrix over all constraint rows,
+    with column indices local to the owning element.
+    Missing optional values (b_e, delta_e) are stored as NaN.
+    Cross-element metrics are computed with segment reductions instead of Python loops.
+    """
+
+    config: CenterConfig
+    element_configs: Tuple[ElementConfig, ...]
+
+    var_offsets: ndarray  # [E + 1]
+    con_offsets: ndarray  # [E + 1]
+    w_offsets: ndarray  # [E + 1]
+
+    c: ndarray  # [N], c_e
+    d: ndarray  # [N], d_e
+    lower: ndarray  # [N], b_e_1
+    upper: ndarray  # [N], b_e_2
+    b: ndarray  # [M], b_e
+    a_indptr: ndarray  # [M + 1], rows of A_e
+    a_indices: ndarray  # [nnz], local columns of A_e
+    a_data: ndarray  # [nnz], values of A_e
+    a_columns: ndarray  # [E], number of columns of A_e
+    a_is_sparse: ndarray  # [E], A_e was given as a SparseMatrix
+
+    delta: ndarray  # [E], delta_e
+    w: ndarray  # [sum W], w_e
+    has_w: ndarray  # [E]
+
+    global_resource_constraints: Optional[ndarray] = None  # b
+    f: Optional[ndarray] = None  # f
+
+    def __post_init__(self) -> None:
+        """Freeze all packed arrays (see `ElementData.__post_init__`)."""
+
+        for name in ("var_offsets", "con_offsets", "w_offsets", "c", "d", "lower", "upper", "b", "a_indptr",
+                     "a_indices", "a_data", "a_columns", "a_is_sparse", "delta", "w", "has_w",
+                     "global_resource_constraints", "f"):
+            object.__setattr__(self, name, read_only(getattr(self, name)))
+
+    @classmethod
+    def from_center_data(cls, data: CenterData) -> Self:
+        """
+        Pack a `CenterData` instance.
+
+        Offsets are derived from the actual array lengths, so `validate` can compare them against the configuration.
+        The vectors b_e, b_e_1, b_e_2 and d_e are checked against the configuration before they are concatenated,
+        since a wrong length would shift the values of every following element.
+        Sparse A_e are copied from their CSR arrays without densification.
+
+        :param data: The center data to pack.
+        :return: The packed representation.
+        :raises AssertionError: If a vector of an element does not match its configuration.
+        """
+
+        elements = data.elements
+        for e, (element, coeffs) in enumerate(zip(elements, data.coeffs_functional)):
+            b, lower, upper = element.resource_constraints
+            n, m = element.config.num_decision_variables, element.config.num_constraints
+            assert_valid_dimensions(
+                [lower, upper, coeffs] + ([b] if b is not None else []),
+                [(n,), (n,), (n,), (m,)],
+                [f"elements[{e}].resource_constraints[1]", f"elements[{e}].resource_constraints[2]",
+                 f"coeffs_functional[{e}]", f"elements[{e}].resource_constraints[0]"]
+            )
+
+        num_variables = array([len(element.coeffs_functional) for element in elements], dtype=int64)
+        num_constraints = array([len(element.aggregated_plan_costs) for element in elements], dtype=int64)
+        num_w = array([len(element.w) if element.w is not None else 0 for element in elements], dtype=int64)
+
+        row_counts, indices, values, a_columns = list(), list(), list(), list()
+        for element in elements:
+            if isinstance(costs := element.aggregated_plan_costs, SparseMatrix):
+                a_columns.append(costs.shape[1])
+                row_counts.append(diff(costs.indptr))
+                indices.append(costs.indices)
+                values.append(costs.data)
+                continue
+
+            rows, columns = (costs := asarray(costs, dtype=float64).reshape(len(costs), -1)).nonzero()
+            a_columns.append(costs.shape[1])
+            row_counts.append(bincount(rows, minlength=len(costs)))
+            indices.append(columns.astype(int64))
+            values.append(costs[rows, columns])
+
+        return cls(
+            config=data.config,
+            element_configs=tuple(element.config for element in elements),
+            var_offsets=_offsets(num_variables),
+            con_offsets=_offsets(num_constraints),
+            w_offsets=_offsets(num_w),
+            c=_concat([element.coeffs_functional for element in elements], num_variables),
+            d=_concat(data.coeffs_functional, num_variables),
+            lower=_concat([element.resource_constraints[1] for element in elements], num_variables),
+            upper=_concat([element.resource_constraints[2] for element in elements], num_variables),
+            b=_concat([element.resource_constraints[0] for element in elements], num_constraints),
+            a_indptr=_offsets(concatenate(row_counts) if row_counts else zeros(0, dtype=int64)),
+            a_indices=concatenate(indices) if indices else zeros(0, dtype=int64),
+            a_data=concatenate(values) if values else zeros(0),
+            a_columns=array(a_columns, dtype=int64),
+            a_is_sparse=array([isinstance(element.aggregated_plan_costs, SparseMatrix) for element in elements],
+                              dtype=bool),
+            delta=array([element.delta if element.delta is not None else nan for element in elements], dtype=float64),
+            w=_concat([element.w for element in elements], num_w),
+            has_w=array([element.w is not None for element in elements], dtype=bool),
+            global_resource_constraints=data.global_resource_constraints,
+            f=data.f,
+        )
+
+    def to_center_data(self) -> CenterData:
+        """
+        Unpack into the per-element `CenterData` representation.
+
+        :return: A `CenterData` equal to the one this instance was packed from
+                 (A_e as SparseMatrix where it was packed from one, as dense arrays otherwise).
+        """
+
+        elements = list()
+        for e, config in enumerate(self.element_configs):
+            variables = slice(self.var_offsets[e], self.var_offsets[e + 1])
+            constraints = slice(self.con_offsets[e], self.con_offsets[e + 1])
+            b_e = self.b[constraints]
+
+            indptr = self.a_indptr[constraints.start:constraints.stop + 1]
+            nonzeros = slice(indptr[0], indptr[-1])
+            costs = SparseMatrix((len(indptr) - 1, self.a_columns[e]), indptr - indptr[0],
+                                 self.a_indices[nonzeros].copy(), self.a_data[nonzeros].copy())
+
+            elements.append(ElementData(
+                config=config,
+                coeffs_functional=self.c[variables].copy(),
+                resource_constraints=(None if isnan(b_e).all() and len(b_e) else b_e.copy(),
+                                      self.lower[variables].copy(), self.upper[variables].copy()),
+                aggregated_plan_costs=costs if self.a_is_sparse[e] else costs.to_dense(),
+                delta=None if isnan(self.delta[e]) else float(self.delta[e]),
+                w=self.w[self.w_offsets[e]:self.w_offsets[e + 1]].copy() if self.has_w[e] else None,
+            ))
+
+        return CenterData(
+            config=self.config,
+            coeffs_functional=[self.d[self.var_offsets[e]:self.var_offsets[e + 1]].copy()
+                               for e in range(self.num_elements)],
+            elements=elements,
+            global_resource_constraints=self.global_resource_constraints,
+            f=self.f,
+        )
+
+    @property
+    def num_elements(self) -> int:
+        """The number of packed elements."""
+
+        return len(self.element_configs)
+
+    @property
+    def num_decision_variables(self) -> ndarray:
+        """The number of decision variables n_e of every element."""
+
+        return diff(self.var_offsets)
+
+    @property
+    def num_constraints(self) -> ndarray:
+        """The number of constraints m_e of every element."""
+
+        return diff(self.con_offsets)
+
+    @property
+    def nnz(self) -> ndarray:
+        """The number of non-zero entries of A_e of every element."""
+
+        return diff(self.a_indptr[self.con_offsets])
+
+    @property
+    def negotiated_variables(self) -> ndarray:
+        """A mask over all variables, True where the owning element is NEGOTIATED."""
+
+        return repeat(array([config.type == ElementType.NEGOTIATED for config in self.element_configs], dtype=bool),
+                      self.num_decision_variables)
+
+    def problem_sizes(self, include_nnz: bool = False) -> List[Tuple[int, ...]]:
+        """
+        Get the linear programming problem sizes of all elements (see `get_lp_problem_sizes`).
+
+        :param include_nnz: If True, append the nnz of A_e to every tuple.
+        :return: A list of (num_constraints, num_decision_variables[, nnz]) tuples.
+        """
+
+        if include_nnz:
+            return list(zip(self.num_constraints.tolist(), self.num_decision_variables.tolist(), self.nnz.tolist()))
+        return list(zip(self.num_constraints.tolist(), self.num_decision_variables.tolist()))
+
+    def pack_plans(self, plans: Sequence[Optional[Sequence[float]]]) -> ndarray:
+        """
+        Concatenate per-element plan vectors into a flat array aligned with the packed variables.
+
+        :param plans: One plan vector per element; None or empty for elements without a plan.
+        :return: The flat plan, with NaN for the variables of elements without a plan.
+        """
+
+        return _concat([plan if plan is not None and len(plan) else None for plan in plans],
+                       self.num_decision_variables)
+
+    def center_quality(self, y: ndarray) -> ndarray:
+        """
+        Compute the center’s quality functional d_e^T * y_e of every element.
+
+        :param y: The flat plan y (see `pack_plans`).
+        :return: The value for every element, NaN for elements without a plan.
+        """
+
+        return segment_sum(self.d * y, self.var_offsets)
+
+    def element_quality(self, y: ndarray, y_star: Optional[ndarray] = None) -> ndarray:
+        """
+        Compute the element’s own quality functional of every element (see `calculate_element_own_quality`).
+
+        It is c_e^T * y_star_e for NEGOTIATED elements and c_e^T * y_e for DECENTRALIZED ones.
+
+        :param y: The flat plan y (see `pack_plans`).
+        :param y_star: The flat private plan y_star, if any element is NEGOTIATED.
+        :return: The value for every element, NaN for elements without a plan.
+        """
+
+        return segment_sum(self.c * (where(self.negotiated_variables, y_star, y) if y_star is not None else y),
+                           self.var_offsets)
+
+    def resource_usage(self, y: ndarray) -> ndarray:
+        """
+        Compute A_e * y_e for all elements at once.
+
+        :param y: The flat vector to multiply, aligned with the packed variables.
+        :return: The flat usage of every constraint row, aligned with `b`.
+        """
+
+        row_elements = repeat(arange(self.num_elements), self.num_constraints)
+        columns = self.var_offsets[repeat(row_elements, diff(self.a_indptr))] + self.a_indices
+        return segment_sum(self.a_data * y[columns], self.a_indptr)
+
+    def validate(self) -> None:
+        """
+        Validate all elements at once against their configurations.
+
+        Checks the same invariants as `ElementSolver.validate_input`, vectorized over the elements:
+        dimensions of c_e and A_e (b_e, b_e_1, b_e_2 and d_e are checked by `from_center_data`),
+        non-negativity of delta_e, w_e and the ids, and positivity of the variable and constraint counts.
+
+        :raises AssertionError: If any element is invalid; the message names the first offending element.
+        """
+
+        def check(mask: ndarray, message: str) -> None:
+            assert not mask.any(), f"Element {(e := int(mask.nonzero()[0][0]))} ({message}): {self.element_configs[e]}"
+
+        configured_variables = array([config.num_decision_variables for config in self.element_configs], dtype=int64)
+        configured_constraints = array([config.num_constraints for config in self.element_configs], dtype=int64)
+
+        check(self.num_decision_variables != configured_variables, "invalid number of decision variables")
+        check(self.num_constraints != configured_constraints, "invalid number of constraints")
+        check(self.a_columns != configured_variables, "invalid number of aggregated_plan_costs columns")
+        check(configured_variables <= 0, "num_decision_variables must be positive")
+        check(configured_constraints <= 0, "num_constraints must be positive")
+        check(array([config.id < 0 for config in self.element_configs], dtype=bool), "id must be non-negative")
+        check(self.delta < 0, "delta must be non-negative")
+        check(segment_sum(self.w < 0, self.w_offsets) > 0, "w must be non-negative")
+        check(segment_sum(isnan(self.lower) | isnan(self.upper), self.var_offsets) > 0, "missing plan bounds")
@@ -0,0 +1,165 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Tuple, Union
+
+try:
+    from typing import Self
+except ImportError:
+    from typing_extensions import Self
+
+from numpy import (add, arange, asanyarray, asarray, bincount, concatenate, count_nonzero, diff, flatnonzero, float64,
+                   int64, lexsort, ndarray, repeat, zeros)
+
+from .base import read_only
+
+
+@dataclass(frozen=True)
+class SparseMatrix:
+    """
+    Compressed sparse row (CSR) matrix, used for sparse aggregated plan costs A_e.
+
+    Row `i` holds the values `data[indptr[i]:indptr[i + 1]]` in the columns `indices[indptr[i]:indptr[i + 1]]`.
+    Only the non-zero entries are stored, so model builders and size estimates work on nnz instead of m * n.
+    """
+
+    shape: Tuple[int, int]
+    indptr: ndarray  # [m + 1]
+    indices: ndarray  # [nnz]
+    data: ndarray  # [nnz]
+
+    def __post_init__(self) -> None:
+        """
+        Normalize the shape, validate the CSR structure and freeze the arrays (see `ElementData.__post_init__`).
+
+        :raises ValueError: If `indptr` does not have m + 1 non-decreasing offsets from 0 to nnz,
+                            `indices` and `data` differ in length, or a column index lies outside [0, n).
+        """
+
+        object.__setattr__(self, "shape", (int(self.shape[0]), int(self.shape[1])))
+        object.__setattr__(self, "indptr", read_only(asanyarray(self.indptr, dtype=int64)))
+        object.__setattr__(self, "indices", read_only(asanyarray(self.indices, dtype=int64)))
+        object.__setattr__(self, "data", read_only(asanyarray(self.data, dtype=float64)))
+
+        (m, n), indptr = self.shape, self.indptr
+        if len(indptr) != m + 1:
+            raise ValueError(f"indptr must have {m + 1} entries for {m} rows, got {len(indptr)}")
+        if len(self.indices) != len(self.data):
+            raise ValueError(f"indices and data must have equal lengths, got {len(self.indices)} and {len(self.data)}")
+        if indptr[0] != 0 or indptr[-1] != len(self.data) or (diff(indptr) < 0).any():
+            raise ValueError(f"indptr must be non-decreasing from 0 to nnz = {len(self.data)}, got {indptr}")
+        if len(self.indices) and not (0 <= self.indices.min() and self.indices.max() < n):
+            raise ValueError(f"Column indices must lie in [0, {n}), got {self.indices}")
+
+    @classmethod
+    def from_dense(cls, matrix: Any) -> Self:
+        """
+        Build a sparse matrix from a dense 2-D array, dropping explicit zeros.
+
+        :param matrix: The dense matrix (array-like of shape (m, n)).
+        :return: The CSR representation of `matrix`.
+        """
+
+        rows, columns = (matrix := asarray(matrix, dtype=float64)).nonzero()
+        return cls(matrix.shape, concatenate(([0], bincount(rows, minlength=matrix.shape[0]).cumsum())),
+                   columns, matrix[rows, columns])
+
+    @classmethod
+    def from_coo(cls, shape: Tuple[int, int], row: Any, col: Any, data: Any) -> Self:
+        """
+        Build a sparse matrix from coordinate (COO) triplets.
+
+        Entries are sorted by (row, column); duplicates are kept and therefore summed by all consumers.
+
+        :param shape: The (m, n) shape of the matrix.
+        :param row: The row index of every entry.
+        :param col: The column index of every entry.
+        :param data: The value of every entry.
+        :return: The CSR representation of the triplets.
+        :raises ValueError: If a row index lies outside [0, m) or the CSR structure is invalid (see `__post_init__`).
+        """
+
+        row, col, data = asarray(row, dtype=int64), asarray(col, dtype=int64), asarray(data, dtype=float64)
+        if len(row) and not (0 <= row.min() and row.max() < shape[0]):
+            raise ValueError(f"Row indices must lie in [0, {shape[0]}), got {row}")
+        if not len(row) == len(col) == len(data):
+            raise ValueError(f"row, col and data must have equal lengths, got {len(row)}, {len(col)} and {len(data)}")
+        permutation = lexsort((col, row))
+        return cls(shape, concatenate(([0], bincount(row, minlength=shape[0]).cumsum())),
+                   col[permutation], data[permutation])
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> Self:
+        """
+        Build a sparse matrix from its JSON form.
+
+        Accepts either CSR keys ("shape", "indptr", "indices", "data")
+        or COO triplet keys ("shape", "row", "col", "data").
+
+        :param raw: The dictionary loaded from JSON.
+        :return: The parsed sparse matrix.
+        """
+
+        if "indptr" in raw:
+            return cls(tuple(raw["shape"]), raw["indptr"], raw["indices"], raw["data"])
+        return cls.from_coo(tuple(raw["shape"]), raw["row"], raw["col"], raw["data"])
+
+    def __len__(self) -> int:
+        """The number of rows, matching `len()` of a dense matrix."""
+
+        return self.shape[0]
+
+    @property
+    def nnz(self) -> int:
+        """The number of stored (non-zero) entries."""
+
+        return len(self.data)
+
+    def row(self, i: int) -> Tuple[ndarray, ndarray]:
+        """
+        Get the non-zero entries of a row.
+
+        :param i: The row index.
+        :return: A tuple of the column indices and the values of row `i`.
+        """
+
+        return self.indices[self.indptr[i]:self.indptr[i + 1]], self.data[self.indptr[i]:self.indptr[i + 1]]
+
+    def to_dense(self) -> ndarray:
+        """
+        Convert to a dense array, summing duplicate entries like all other consumers.
+
+        :return: A new (m, n) float array.
+        """
+
+        dense = zeros(self.shape)
+        add.at(dense, (repeat(arange(self.shape[0]), diff(self.indptr)), self.indices), self.data)
+        return dense
+
+
+def iter_rows(matrix: Union[ndarray, SparseMatrix]) -> Iterator[Tuple[ndarray, ndarray]]:
+    """
+    Iterate over the non-zero entries of every row of a dense or sparse matrix.
+
+    Model builders use this to emit only the non-zero terms of A_e * y_e.
+
+    :param matrix: The dense array or the SparseMatrix.
+    :return: An iterator of (column indices, values) tuples, one per row, empty rows included.
+    """
+
+    if isinstance(matrix, SparseMatrix):
+        for i in range(matrix.shape[0]):
+            yield matrix.row(i)
+        return
+
+    for row in asarray(matrix):
+        yield (columns := flatnonzero(row)), row[columns]
+
+
+def count_nonzero_costs(matrix: Union[ndarray, SparseMatrix]) -> int:
+    """
+    Count the non-zero entries of a dense or sparse matrix.
+
+    :param matrix: The dense array or the SparseMatrix.
+    :return: The number of non-zero entries.
+    """
+
+    return matrix.nnz if isinstance(matrix, SparseMatrix) else int(count_nonzero(matrix))
@@ -0,0 +1,203 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+try:
+    from typing import Self
+except ImportError:
+    from typing_extensions import Self
+
+from numpy import full, nan, ndarray, unique, zeros, dot, argsort, isfinite, flatnonzero, array
+
+from .element import ElementData, ElementSolution, ElementType
+
+
+@dataclass
+class WeightSweep:
+    """
+    Dense storage of the weighted balance sweep results for all elements and all w values.
+
+    Row `e` describes element `e`, column `k` describes its `k`-th distinct w value (ascending).
+    Rows are padded with NaN up to the longest w grid among the elements.
+    Plans are kept in a separate slot tensor, so only a bounded number of plans per element
+    (the chosen one and the top-k by element quality) can be retained while summaries are kept for all w.
+    """
+
+    w: ndarray  # [E, W]
+    objectives: ndarray  # [E, W]
+    element_qf: ndarray  # [E, W]
+    num_w: ndarray  # [E]
+    num_decision_variables: ndarray  # [E]
+    plan_slot: ndarray  # [E, W], -1 if the plan is not kept
+    y_e: ndarray  # [E, S, n_max]
+    y_star_e: ndarray  # [E, S, n_max]
+
+    @classmethod
+    def allocate(cls, elements: List[ElementData], plans_top_k: Optional[int] = None) -> Self:
+        """
+        Preallocate the sweep storage for the given elements.
+
+        The w grid of each element is deduplicated and sorted in ascending order.
+
+        :param elements: The elements taking part in the sweep.
+        :param plans_top_k: If given, keep plans only for the chosen w and the `plans_top_k` best w values
+                            (by element quality) of each element; otherwise keep all plans.
+        :return: A new WeightSweep with all results unset (NaN).
+        """
+
+        grids = [unique(element.w) if element.w is not None else zeros(0) for element in elements]
+        num_w = array([len(grid) for grid in grids], dtype=int)
+        num_decision_variables = array([element.config.num_decision_variables for element in elements], dtype=int)
+        w_max, n_max = int(num_w.max(initial=0)), int(num_decision_variables.max(initial=0))
+        num_slots = w_max if plans_top_k is None else min(w_max, plans_top_k + 1)
+
+        w = full((len(elements), w_max), nan)
+        for e, grid in enumerate(grids):
+            w[e, :len(grid)] = grid
+
+        return cls(
+            w=w,
+            objectives=full((len(elements), w_max), nan),
+            element_qf=full((len(elements), w_max), nan),
+            num_w=num_w,
+            num_decision_variables=num_decision_variables,
+            plan_slot=full((len(elements), w_max), -1, dtype=int),
+            y_e=full((len(elements), num_slots, n_max), nan),
+            y_star_e=full((len(elements), num_slots if any(
+                element.config.type == ElementType.NEGOTIATED for element in elements) else 0, n_max), nan),
+        )
+
+    @property
+    def center_qf(self) -> ndarray:
+        """
+        Center’s contribution to the combined objective (d^T * y_e) for every element and w value.
+
+        :return: An [E, W] array computed as objective - w * element_qf.
+        """
+
+        return self.objectives - self.w * self.element_qf
+
+    def record(self, e: int, k: int, solution: ElementSolution, element: ElementData) -> None:
+        """
+        Store the summary of one sweep solution.
+
+        The element’s own quality functional is computed from the plan; an infeasible solution
+        (no plan) is stored with -inf objective and element quality.
+
+        :param e: The element index.
+        :param k: The w index inside the element’s grid.
+        :param solution: The solution obtained for (e, w[e, k]).
+        :param element: The element data, used for its functional coefficients and type.
+        """
+
+        self.objectives[e, k] = solution.objective
+        if not solution.plan or not solution.plan.get("y_e"):
+            self.element_qf[e, k] = float("-inf")
+            return
+
+        plan_component = solution.plan.get("y_star_e" if element.config.type == ElementType.NEGOTIATED else "y_e")
+        self.element_qf[e, k] = dot(element.coeffs_functional, plan_component)
+
+    def best_indices(self, tolerance: float = 1e-9) -> ndarray:
+        """
+        Select, for every element, the w index maximizing the element’s own quality functional.
+
+        Scanning w in ascending order, a later w replaces the current best only if it improves
+        the element quality by more than `tolerance`.
+
+        :param tolerance: The tolerance for comparing floating-point numbers.
+        :return: An [E] array of chosen w indices, -1 for elements without any feasible solution.
+        """
+
+        chosen = full(len(self.num_w), -1, dtype=int)
+        for e, row in enumerate(self.element_qf):
+            best = float("-inf")
+            for k in flatnonzero(isfinite(row[:self.num_w[e]])):
+                if row[k] - best > tolerance:
+                    best, chosen[e] = row[k], k
+        return chosen
+
+    def select_plans(self, chosen: ndarray) -> List[List[int]]:
+        """
+        Decide which plans to keep: the chosen w first, then the best w values by element quality.
+
+        :param chosen: The chosen w index of every element (see `best_indices`).
+        :return: For every element, the w indices whose plans are kept, at most one per plan slot.
+        """
+
+        selected = list()
+        for e, row in enumerate(self.element_qf):
+            ranked = [k for k in argsort(-row[:self.num_w[e]], kind="stable") if isfinite(row[k]) and k != chosen[e]]
+            selected.append(([int(chosen[e])] if chosen[e] >= 0 else list()) + ranked)
+            selected[-1] = selected[-1][:self.y_e.shape[1]]
+        return selected
+
+    def plan_candidates(self, e: int, tolerance: float = 1e-9) -> List[int]:
+        """
+        Get the w indices of element e whose plans `select_plans` may still keep, given the results recorded so far.
+
+        These are the best w values by element quality, one per plan slot, and those that can still be chosen:
+        `best_indices` never chooses a w preceded by one of at least its quality, or with one better by more
+        than `tolerance`. Recording more results of the row only shrinks the candidates of the recorded ones.
+
+        :param e: The element index.
+        :param tolerance: The tolerance for comparing floating-point numbers (see `best_indices`).
+        :return: The candidate w indices in ascending order.
+        """
+
+        row = self.element_qf[e, :self.num_w[e]]
+        if not len(finite := flatnonzero(isfinite(row))):
+            return list()
+
+        candidates = set(finite[argsort(-row[finite], kind="stable")][:self.y_e.shape[1]])
+        best, running = row[finite].max(), float("-inf")
+        for k in finite:
+            if row[k] > running:
+                if row[k] >= best - tolerance:
+                    candidates.add(k)
+                running = row[k]
+        return sorted(int(k) for k in candidates)
+
+    def store_plan(self, e: int, k: int, solution: ElementSolution) -> None:
+        """
+        Store the full plan of the sweep solution (e, k) in the next free plan slot of element e.
+
+        :param e: The element index.
+        :param k: The w index inside the element’s grid.
+        :param solution: The solution whose plan is stored.
+        """
+
+        slot = int((self.plan_slot[e] >= 0).sum())
+        n_e = self.num_decision_variables[e]
+        self.plan_slot[e, k] = slot
+        self.y_e[e, slot, :n_e] = solution.plan.get("y_e")
+        if solution.plan.get("y_star_e") is not None:
+            self.y_star_e[e, slot, :n_e] = solution.plan.get("y_star_e")
+
+    def get_plan(self, e: int, k: int) -> Optional[dict]:
+        """
+        Get the kept plan of the sweep solution (e, k) in the `ElementSolution.plan` format.
+
+        :param e: The element index.
+        :param k: The w index inside the element’s grid.
+        :return: A dictionary with "y_e" (and "y_star_e" if present), or None if the plan was not kept.
+        """
+
+        if (slot := self.plan_slot[e, k]) < 0:
+            return None
+
+        n_e = self.num_decision_variables[e]
+        plan = {"y_e": self.y_e[e, slot, :n_e].tolist()}
+        if self.y_star_e.shape[1] > 0 and isfinite(self.y_star_e[e, slot, :n_e]).all():
+            plan["y_star_e"] = self.y_star_e[e, slot, :n_e].tolist()
+        return plan
+
+    def get_solution(self, e: int, k: int) -> ElementSolution:
+        """
+        Rebuild the `ElementSolution` of the sweep solution (e, k).
+
+        :param e: The element index.
+        :param k: The w index inside the element’s grid.
+        :return: The solution with its objective and the kept plan (empty if the plan was not kept).
+        """
+
+        return ElementSolution(float(self.objectives[e, k]), self.get_plan(e, k) or dict())
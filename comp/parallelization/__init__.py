@@ -1,7 +1,33 @@
+from .cancellation import CancellationToken
 from .heuristic import get_order
-from .parallel_executor import ParallelExecutor
+from .history import RuntimeHistory, blend_durations, element_fingerprint
+from .moldable import allot_threads
+from .nodes import LocalNodes, NodePool, serve_node
+from .parallel_executor import ExecutionReport, ExecutionStatus, ParallelExecutor
+from .planner import ExecutionBackend, ExecutionPlan, ExecutionPlanner
+from .schedulers import new_scheduler
+from .shared import SharedArena, SharedArray
+from .worker_cache import WorkerCache, worker_cache
 
 __all__ = [
+    "allot_threads",
+    "blend_durations",
+    "CancellationToken",
+    "element_fingerprint",
+    "ExecutionBackend",
+    "ExecutionPlan",
+    "ExecutionPlanner",
+    "ExecutionReport",
+    "ExecutionStatus",
     "get_order",
+    "LocalNodes",
+    "new_scheduler",
+    "NodePool",
     "ParallelExecutor",
+    "RuntimeHistory",
+    "serve_node",
+    "SharedArena",
+    "SharedArray",
+    "WorkerCache",
+    "worker_cache",
 ]
@@ -0,0 +1,42 @@
+from concurrent.futures import Future, InvalidStateError
+from typing import Tuple
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation of the runs of a `ParallelExecutor`, e.g., by the stop button of a GUI.
+
+    The token is a `Future` that completes on `cancel`, so the executor waits for its tasks and the token at once
+    and reacts without polling. Cancellation is final: a cancelled executor stops every later run as well.
+    A token pickled to a worker (with a task that references the executor) arrives as a new, uncancelled token;
+    the executor stops the workers itself.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an uncancelled token."""
+
+        self.future: Future = Future()
+        self.future.set_running_or_notify_cancel()  # a running future cannot be cancelled, only completed
+
+    def __reduce__(self) -> Tuple:
+        """
+        Reduce the token to a new one for pickling (see the class description).
+
+        :return: The reconstruction of an uncancelled token.
+        """
+
+        return CancellationToken, ()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether `cancel` was called."""
+
+        return self.future.done()
+
+    def cancel(self) -> None:
+        """Cancel the runs; further calls change nothing. Safe to call from any thread."""
+
+        try:
+            self.future.set_result(None)
+        except InvalidStateError:
+            pass  # already cancelled
@@ -1,9 +1,20 @@
+from .cost_model import effective_problem_sizes, estimate_durations, estimate_memory
 from .device import Device
-from .empiric import empiric
+from .empiric import (EmpiricCoefficients, empiric, empiric_batch, fit_empiric, get_profile_path, load_coefficients,
+                      save_coefficients)
 from .operation import Operation
 
 __all__ = [
     "Device",
+    "effective_problem_sizes",
     "empiric",
+    "empiric_batch",
+    "EmpiricCoefficients",
+    "estimate_durations",
+    "estimate_memory",
+    "fit_empiric",
+    "get_profile_path",
+    "load_coefficients",
     "Operation",
+    "save_coefficients",
 ]
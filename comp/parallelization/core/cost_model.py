@@ -0,0 +1,78 @@
+from typing import List, Optional, Tuple
+
+from numpy import array, full, ndarray, where
+
+from comp.models import CenterType, ElementType, PackedCenterData
+from .empiric import EmpiricCoefficients, empiric
+
+# Peak memory of building and solving one element model with GLOP, fitted on generated elements
+# (growth of the resident set size, including the transient OR-Tools expressions)
+MEMORY_BASE_BYTES = 2 << 20
+MEMORY_BYTES_PER_LINE = 1 << 10  # per row or column
+MEMORY_BYTES_PER_NONZERO = 64
+
+
+def effective_problem_sizes(packed: PackedCenterData,
+                            center_type: Optional[CenterType] = None,
+                            element_type: Optional[ElementType] = None) -> List[Tuple[int, int, int]]:
+    """
+    Estimate the size of the LP actually built for every element.
+
+    The raw (m_e, n_e) of an element understate its model: box bounds add 2 * n_e rows,
+    the NEGOTIATED formulation doubles the variables (y_e, y_star_e) and the A_e terms,
+    and the coordination strategy adds its own rows and columns:
+
+    - DECENTRALIZED: n_e columns, m_e + 2 * n_e rows, nnz(A_e) + 2 * n_e non-zeros.
+    - NEGOTIATED: 2 * n_e columns, m_e + 2 * n_e rows, 2 * nnz(A_e) + 3 * n_e non-zeros.
+    - STRICT_PRIORITY, GUARANTEED_CONCESSION: one functional row with n_e non-zeros.
+    - WEIGHTED_BALANCE: only the objective changes.
+    - RESOURCE_ALLOCATION_COMPROMISE: m_e columns b_e, one functional row,
+      and n_e + 2 * m_e non-zeros for the functional, A_e * y_e <= b_e and the linked rows.
+
+    :param packed: The packed center data.
+    :param center_type: The coordination strategy modifying the element problems; None for the plain element problems.
+    :param element_type: If given, every element is formulated with this type instead of its own
+                         (e.g., the DECENTRALIZED optima computed by STRICT_PRIORITY).
+    :return: A list of (rows, columns, nnz) tuples, one per element, accepted by `empiric` and `get_order`.
+    """
+
+    m, n, nnz = packed.num_constraints, packed.num_decision_variables, packed.nnz
+    negotiated = array([config.type == ElementType.NEGOTIATED for config in packed.element_configs], dtype=bool) \
+        if element_type is None else full(packed.num_elements, element_type == ElementType.NEGOTIATED)
+
+    rows: ndarray = m + 2 * n
+    columns: ndarray = where(negotiated, 2 * n, n)
+    nonzeros: ndarray = where(negotiated, 2 * nnz + 3 * n, nnz + 2 * n)
+
+    if center_type in (CenterType.STRICT_PRIORITY, CenterType.GUARANTEED_CONCESSION):
+        rows, nonzeros = rows + 1, nonzeros + n
+    elif center_type == CenterType.RESOURCE_ALLOCATION_COMPROMISE:
+        rows, columns, nonzeros = rows + 1, columns + m, nonzeros + n + 2 * m
+
+    return list(zip(rows.tolist(), columns.tolist(), nonzeros.tolist()))
+
+
+def estimate_durations(sizes: List[Tuple[int, ...]],
+                       coefficients: Optional[EmpiricCoefficients] = None) -> List[float]:
+    """
+    Convert problem sizes into relative duration estimates with the empiric formula.
+
+    :param sizes: A list of (m, n) or (m, n, nnz) tuples (see `effective_problem_sizes`).
+    :param coefficients: The empiric formula coefficients; defaults to the calibration profile.
+    :return: The estimated duration of every problem, in arbitrary but consistent units.
+    """
+
+    return [empiric(size, coefficients) for size in sizes]
+
+
+def estimate_memory(sizes: List[Tuple[int, ...]]) -> List[float]:
+    """
+    Estimate the peak memory of building and solving every problem.
+
+    :param sizes: A list of (m, n) or (m, n, nnz) tuples (see `effective_problem_sizes`);
+                  without nnz, the constraint matrix is taken as dense.
+    :return: The estimated peak memory of every problem, in bytes.
+    """
+
+    return [MEMORY_BASE_BYTES + MEMORY_BYTES_PER_LINE * (size[0] + size[1])
+            + MEMORY_BYTES_PER_NONZERO * (size[2] if len(size) > 2 else size[0] * size[1]) for size in sizes]
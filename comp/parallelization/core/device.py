@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional, Tuple
 
 try:
     from typing import Self
@@ -11,22 +11,85 @@
 
 @dataclass
 class Device:
-    """Class representing a device in the system with its operations."""
+    """
+    Class representing a device in the system with its operations.
+
+    The load and the sorted view of the operations are maintained by `add` and `replace`,
+    so the operations should be changed through these methods.
+    Operation durations are given for a device of speed 1; a device of speed s runs them s times faster
+    (uniform related machines).
+    """
 
     operations: List[Operation] = field(default_factory=list)
+    speed: float = 1.  # relative speed of the device
+    load: float = field(default=.0, init=False)  # total duration of the operations, maintained incrementally
+    _sorted: Optional[Tuple[List[float], List[int]]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Initialize the load from the initial operations."""
+
+        self.load = sum(operation.duration for operation in self.operations)
 
     @property
     def end(self: Self) -> float:
         """
         Calculate the end time of the last operation on this device.
 
-        The end time is determined by summing the durations of all operations
-        currently assigned to this device.
+        The end time is the total duration of all operations currently assigned to this device, divided by its speed.
+        The load is maintained incrementally by `add` and `replace`, so reading it is O(1).
+
+        :return: The total duration of all operations on the device at its speed, representing its finish time.
+        """
+
+        return self.load / self.speed
+
+    def add(self, operation: Operation) -> None:
+        """
+        Append an operation to the device.
+
+        :param operation: The operation to append.
+        """
+
+        self.operations.append(operation)
+        self.load += operation.duration
+        self._sorted = None
+
+    def replace(self, positions: List[int], operations: List[Operation]) -> List[Operation]:
+        """
+        Replace the operations at the given positions with other operations.
+
+        The new operations take the first freed positions; the remaining ones are removed or appended.
+
+        :param positions: The positions of the operations to take out.
+        :param operations: The operations to put in.
+        :return: The operations taken out, in the order of `positions`.
+        """
+
+        removed = [self.operations[position] for position in positions]
+        for position, operation in zip(positions, operations):
+            self.operations[position] = operation
+        for position in sorted(positions[len(operations):], reverse=True):
+            del self.operations[position]
+        self.operations.extend(operations[len(positions):])
+
+        self.load += sum(operation.duration for operation in operations) - sum(
+            operation.duration for operation in removed)
+        self._sorted = None
+        return removed
+
+    def sorted_operations(self) -> Tuple[List[float], List[int]]:
+        """
+        Get the operations sorted by duration.
+
+        The result is cached until the next `add` or `replace`.
 
-        :return: The total duration of all operations on the device, representing its finish time.
+        :return: A tuple of the ascending durations and the positions of the corresponding operations.
         """
 
-        return sum(operation.duration for operation in self.operations)
+        if self._sorted is None:
+            pairs = sorted((operation.duration, position) for position, operation in enumerate(self.operations))
+            self._sorted = [pair[0] for pair in pairs], [pair[1] for pair in pairs]
+        return self._sorted
 
     def update_operation_times(self) -> None:
         """
@@ -34,11 +97,13 @@ def update_operation_times(self) -> None:
 
         This method iterates through the operations on the device, sequentially
         calculating and setting their individual start and end times based on
-        their durations and the end times of preceding operations.
+        their durations at the device speed and the end times of preceding operations.
+        The load is resynchronized with the exact total to drop accumulated rounding errors.
         """
 
-        current_op_start_time = .0
+        load = .0
         for operation in self.operations:
-            operation.start_time_on_device = current_op_start_time
-            current_op_start_time += operation.duration
-            operation.end_time_on_device = current_op_start_time
+            operation.start_time_on_device = load / self.speed
+            load += operation.duration
+            operation.end_time_on_device = load / self.speed
+        self.load = load
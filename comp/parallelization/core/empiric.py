@@ -1,19 +1,207 @@
+from dataclasses import asdict, dataclass, fields
+from functools import lru_cache
+from json import dump, load
 from math import log
-from typing import Tuple
+from os import environ, makedirs, path
+from typing import Optional, Sequence, Tuple
 
+from numpy import (array, column_stack, concatenate, exp, eye, log as np_log, logaddexp, mean, ndarray,
+                   power as np_power, zeros)
+from numpy.linalg import lstsq
 
-def empiric(size: Tuple[int, int]) -> float:
+PROFILE_ENV_VARIABLE = "COMP_EMPIRIC_PROFILE"
+DEFAULT_PROFILE_PATH = path.join(path.expanduser("~"), ".comp", "empiric_profile.json")
+
+
+@dataclass(frozen=True)
+class EmpiricCoefficients:
+    """
+    Coefficients of the empiric formula a * m^b * n^c * ln(n)^d + e * m^f * n^g.
+
+    The defaults were fitted to the W1/W2 study datasets; `fit_empiric` refits them to timings of the host machine.
+    """
+
+    a: float = .63
+    b: float = 2.96
+    c: float = .02
+    d: float = 1.62
+    e: float = 4.04
+    f: float = -4.11
+    g: float = 2.92
+
+
+def get_profile_path() -> str:
+    """
+    Get the path of the calibration profile.
+
+    :return: The value of the COMP_EMPIRIC_PROFILE environment variable if set, otherwise ~/.comp/empiric_profile.json.
+    """
+
+    return environ.get(PROFILE_ENV_VARIABLE, DEFAULT_PROFILE_PATH)
+
+
+def save_coefficients(coefficients: EmpiricCoefficients, filepath: Optional[str] = None) -> None:
+    """
+    Persist calibrated coefficients, so that `empiric` picks them up automatically.
+
+    :param coefficients: The coefficients to save.
+    :param filepath: The profile path; defaults to `get_profile_path()`.
+    """
+
+    if directory := path.dirname(filepath := filepath or get_profile_path()):
+        makedirs(directory, exist_ok=True)
+    with open(filepath, "w") as f:
+        dump(asdict(coefficients), f, indent=2)
+    load_coefficients.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def load_coefficients(filepath: Optional[str] = None) -> EmpiricCoefficients:
+    """
+    Load the coefficients of the calibration profile.
+
+    The result is cached per path; `save_coefficients` invalidates the cache.
+
+    :param filepath: The profile path; defaults to `get_profile_path()`.
+    :return: The calibrated coefficients, or the default ones if there is no profile.
+    """
+
+    if not path.isfile(filepath := filepath or get_profile_path()):
+        return EmpiricCoefficients()
+    with open(filepath, "r") as f:
+        raw = load(f)
+    return EmpiricCoefficients(**{field.name: float(raw[field.name]) for field in fields(EmpiricCoefficients)})
+
+
+def empiric(size: Tuple[int, ...], coefficients: Optional[EmpiricCoefficients] = None) -> float:
     """
     Calculate an empiric score based on the size of a linear programming problem.
 
     The score is computed using a formula involving the dimensions (m, n)
     provided in the size of tuple.
-    The values of m and n are clamped to a minimum of 1.
+    The values of m and n are clamped to a minimum of 1; the ln(n) term vanishes for n = 1.
+    If the tuple carries a third value, the number of non-zero entries of the constraint matrix,
+    the score is scaled by the density nnz / (m * n), clamped to [1 / (m * n), 1],
+    so sparse problems are estimated cheaper than dense ones of the same shape.
 
-    :param size: A tuple (m, n) representing the dimensions of the problem,
-                 where m is the number of constraints and n is the number of variables.
+    :param size: A tuple (m, n) or (m, n, nnz) representing the dimensions of the problem,
+                 where m is the number of constraints, n is the number of variables
+                 and nnz is the number of non-zero constraint coefficients.
+    :param coefficients: The formula coefficients; defaults to the calibration profile (see `load_coefficients`).
     :return: A float score calculated based on the empiric formula.
     """
 
-    return abs(.63 * (m := max(1, size[0])) ** 2.96 * (n := max(1, size[1])) ** .02 * log(n) ** 1.62
-               + 4.04 * m ** -4.11 * n ** 2.92)
+    k = coefficients or load_coefficients()
+    m, n = max(1, size[0]), max(1, size[1])
+    return (abs(k.a * m ** k.b * n ** k.c * (log(n) ** k.d if n > 1 else 0.) + k.e * m ** k.f * n ** k.g)
+            * _density(size))
+
+
+def empiric_batch(sizes: Sequence[Tuple[int, ...]], coefficients: Optional[EmpiricCoefficients] = None) -> ndarray:
+    """
+    Vectorized `empiric` over many problem sizes.
+
+    :param sizes: A sequence of (m, n) or (m, n, nnz) tuples; sizes without nnz are treated as dense.
+    :param coefficients: The formula coefficients; defaults to the calibration profile (see `load_coefficients`).
+    :return: An array with the score of every size.
+    """
+
+    if not len(sizes):
+        return zeros(0)
+
+    k = coefficients or load_coefficients()
+    m = array([size[0] for size in sizes], dtype=float).clip(1)
+    n = array([size[1] for size in sizes], dtype=float).clip(1)
+    nnz = array([size[2] if len(size) > 2 else m[i] * n[i] for i, size in enumerate(sizes)], dtype=float)
+
+    log_term = np_log(n, out=zeros(len(n)), where=n > 1)
+    log_term = np_power(log_term, k.d, out=zeros(len(n)), where=n > 1)
+    return abs(k.a * m ** k.b * n ** k.c * log_term + k.e * m ** k.f * n ** k.g) * (nnz.clip(1) / (m * n)).clip(max=1.)
+
+
+def _density(size: Tuple[int, ...]) -> float:
+    """
+    Get the density factor of `empiric`: nnz / (m * n) clamped to [1 / (m * n), 1], or 1 without nnz.
+
+    :param size: A tuple (m, n) or (m, n, nnz).
+    :return: The density factor.
+    """
+
+    return min(1., max(size[2], 1) / (max(1, size[0]) * max(1, size[1]))) if len(size) > 2 else 1.
+
+
+def fit_empiric(sizes: Sequence[Tuple[int, ...]], times: Sequence[float],
+                initial: Optional[EmpiricCoefficients] = None, regularization: float = 1e-4, max_iterations: int = 200,
+                tolerance: float = 1e-10) -> Tuple[EmpiricCoefficients, float]:
+    """
+    Fit the empiric coefficients to measured solve times by least squares in log space.
+
+    Minimizes sum (ln empiric(size) - ln t)^2 with the Levenberg–Marquardt method,
+    parameterizing a and e by their logarithms to keep both terms positive.
+    A small ridge penalty towards the initial coefficients keeps the parameters of a term
+    that the timings cannot identify (e.g., the small-m term on a grid without tiny problems) finite.
+    Sizes with n < 2 are skipped, because ln(n)^d is undefined for n = 1 and d < 0.
+
+    :param sizes: The (m, n) or (m, n, nnz) sizes of the timed problems, as passed to `empiric`
+                  (the density factor of `empiric` is applied to the fitted formula as well).
+    :param times: The measured solve time of every problem (any consistent unit).
+    :param initial: The starting point and the centre of the ridge penalty; defaults to the default coefficients.
+    :param regularization: The weight of the ridge penalty, relative to the number of timings.
+    :param max_iterations: The maximal number of Levenberg–Marquardt iterations.
+    :param tolerance: Stop once the relative decrease of the residual sum of squares falls below this value.
+    :return: A tuple of the fitted coefficients and the root-mean-square error of the fit in log space.
+    """
+
+    density = array([_density(size) for size in sizes])
+    sizes_array = array([size[:2] for size in sizes], dtype=float).reshape(-1, 2)
+    times_array = array(times, dtype=float)
+    keep = (sizes_array[:, 1] >= 2) & (times_array > 0)
+    log_m, log_n = np_log(sizes_array[keep, 0].clip(1)), np_log(sizes_array[keep, 1])
+    log_log_n, target = np_log(log_n), np_log(times_array[keep] / density[keep])
+    assert len(target) >= len(fields(EmpiricCoefficients)), "not enough valid timings to fit the coefficients"
+
+    def evaluate(theta: ndarray) -> Tuple[ndarray, ndarray]:
+        """
+        Evaluate the penalized residuals of the fit and their Jacobian.
+
+        With first = ln(a m^b n^c ln(n)^d) and second = ln(e m^f n^g), the log of `empiric` is
+        logaddexp(first, second), whose derivatives are those of the two terms weighted by their shares of the sum.
+
+        :param theta: The parameters (ln a, b, c, d, ln e, f, g).
+        :return: A tuple of the residuals (log-space errors followed by the ridge penalty terms)
+                 and their Jacobian with respect to `theta`.
+        """
+
+        first = theta[0] + theta[1] * log_m + theta[2] * log_n + theta[3] * log_log_n
+        second = theta[4] + theta[5] * log_m + theta[6] * log_n
+        weight = exp(first - logaddexp(first, second))
+        jacobian = column_stack((weight, weight * log_m, weight * log_n, weight * log_log_n,
+                                 1 - weight, (1 - weight) * log_m, (1 - weight) * log_n))
+        return (concatenate((logaddexp(first, second) - target, penalty * (theta - origin))),
+                concatenate((jacobian, penalty * eye(len(theta)))))
+
+    start = initial or EmpiricCoefficients()
+    origin = theta = array([log(start.a), start.b, start.c, start.d, log(start.e), start.f, start.g])
+    penalty = (regularization * len(target)) ** .5
+    residuals, jacobian = evaluate(theta)
+    cost, damping = float(residuals @ residuals), 1e-3
+    for _ in range(max_iterations):
+        normal = jacobian.T @ jacobian
+        step = -lstsq(normal + damping * eye(len(theta)) * normal.diagonal().clip(1e-12), jacobian.T @ residuals,
+                      rcond=None)[0]
+        candidate_residuals, candidate_jacobian = evaluate(candidate := theta + step)
+        if (candidate_cost := float(candidate_residuals @ candidate_residuals)) < cost:
+            converged = cost - candidate_cost <= tolerance * cost
+            theta, residuals, jacobian, cost, damping = (candidate, candidate_residuals, candidate_jacobian,
+                                                         candidate_cost, max(damping / 10, 1e-12))
+            if converged:
+                break
+        else:
+            damping *= 10
+            if damping > 1e12:
+                break
+
+    coefficients = EmpiricCoefficients(float(exp(theta[0])), *map(float, theta[1:4]), float(exp(theta[4])),
+                                       *map(float, theta[5:]))
+    return coefficients, float(mean(residuals[:len(target)] ** 2) ** .5)
+
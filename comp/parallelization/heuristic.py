@@ -1,26 +1,46 @@
-from typing import List, Tuple
+from bisect import bisect_left
+from heapq import heapreplace
+from itertools import combinations
+from math import ceil, inf, nextafter
+from typing import Callable, List, Optional, Sequence, Tuple
 
-from comp.parallelization.core import Device, Operation, empiric
+from comp.parallelization.core import Device, EmpiricCoefficients, Operation, empiric_batch
+from comp.parallelization.history import blend_durations
+from comp.utils import assert_positive
 
+# A scheduling algorithm: (threads, operations) -> devices with the assigned operations
+Scheduler = Callable[[int, List[Operation]], List[Device]]
 
-def get_multi_device_heuristic_order(threads: int, operations: List[Operation]) -> List[Device]:
+
+def get_multi_device_heuristic_order(threads: int, operations: List[Operation],
+                                     speeds: Optional[Sequence[float]] = None) -> List[Device]:
     """
     Assign operations to a specified number of devices using the longest processing time (LPT) heuristic.
 
     Operations are first sorted by duration in descending order.
-    Then, each operation is assigned to the device that currently has the minimum total processing time.
+    Then, each operation is assigned to the device that currently has the minimum total processing time,
+    found with a heap of device loads (ties go to the lowest device index), so the assignment is O(T log D).
+    With device speeds (uniform related machines), each operation goes to the device that would complete it first,
+    i.e., with the minimal (load + duration) / speed, found by a scan in O(T D).
     After all assignments, operation times on each device are updated.
 
     :param threads: The number of threads (devices) to distribute the operations across.
     :param operations: A list of Operation objects to be scheduled.
+    :param speeds: The relative speed of every device; None for identical devices.
     :return: A list of Device objects, each with its assigned operations and updated times.
     """
 
     operations.sort(key=lambda op: op.duration, reverse=True)
 
-    ordered_devices = [Device() for _ in range(threads)]
-    for operation in operations:
-        min(ordered_devices, key=lambda dev: dev.end).operations.append(operation)
+    ordered_devices = _new_devices(threads, speeds)
+    if speeds is None:
+        loads = [(.0, d) for d in range(threads)]
+        for operation in operations:
+            (device := ordered_devices[loads[0][1]]).add(operation)
+            heapreplace(loads, (device.end, loads[0][1]))
+    else:
+        for operation in operations:
+            min(ordered_devices, key=lambda dev: (dev.load + operation.duration) / dev.speed).add(operation)
 
     for ordered_device in ordered_devices:
         ordered_device.update_operation_times()
@@ -28,15 +48,99 @@ def get_multi_device_heuristic_order(threads: int, operations: List[Operation])
     return ordered_devices
 
 
+def _new_devices(threads: int, speeds: Optional[Sequence[float]] = None) -> List[Device]:
+    """
+    Create empty devices.
+
+    :param threads: The number of devices.
+    :param speeds: The relative speed of every device; None for identical devices.
+    :return: The devices.
+    """
+
+    if speeds is None:
+        return [Device() for _ in range(threads)]
+
+    assert len(speeds) == threads, f"Expected {threads} device speeds, got {len(speeds)}"
+    for speed in speeds:
+        assert_positive(speed, "speed")
+    return [Device(speed=speed) for speed in speeds]
+
+
+def _gap(lagged: Device, advanced: Device, average_deadline: float) -> float:
+    """
+    Get the largest amount of work a swap may move from a lagged device to an advanced device.
+
+    Moving theta in (0, gap] of work strictly decreases the sum of the squared loads divided by the speeds,
+    and the advanced device then ends no later than the lagged device did, so the makespan never grows.
+    For identical devices, the gap is the excess of the lagged device over the average deadline.
+
+    :param lagged: The device finishing later than the average deadline.
+    :param advanced: The device finishing earlier than the average deadline.
+    :param average_deadline: The common end time of a perfectly balanced schedule.
+    :return: The gap, in units of operation duration.
+    """
+
+    return min((lagged.end - average_deadline) * lagged.speed, (lagged.end - advanced.end) * advanced.speed)
+
+
+def _candidates(count: int, window: int) -> range:
+    """
+    Select at most `window` evenly spaced indices of a sorted sequence, so pair searches stay bounded.
+
+    :param count: The length of the sequence.
+    :param window: The maximal number of indices.
+    :return: The selected indices.
+    """
+
+    return range(0, count, max(1, ceil(count / window)))
+
+
+def _find_pair(durations: List[float], low: float, high: float, window: int) -> Optional[Tuple[int, int]]:
+    """
+    Find two distinct entries of a sorted list whose sum lies in [low, high].
+
+    The first entry is one of at most `window` evenly spaced candidates, the second one is found by bisection,
+    so the search is O(window * log(k)).
+
+    :param durations: The ascending durations.
+    :param low: The lower bound of the sum.
+    :param high: The upper bound of the sum.
+    :param window: The maximal number of candidates for the first entry.
+    :return: The indices of the two entries, or None if there is no such pair.
+    """
+
+    for i in _candidates(len(durations), window):
+        j = bisect_left(durations, low - durations[i])
+        if j == i:
+            j += 1
+        if j < len(durations) and durations[i] + durations[j] <= high:
+            return i, j
+    return None
+
+
+def _exchange(lagged: Device, lagged_positions: List[int], advanced: Device, advanced_positions: List[int]) -> None:
+    """
+    Exchange operations between two devices.
+
+    :param lagged: The first device.
+    :param lagged_positions: The positions of the operations leaving the first device.
+    :param advanced: The second device.
+    :param advanced_positions: The positions of the operations leaving the second device.
+    """
+
+    advanced.replace(advanced_positions, lagged.replace(
+        lagged_positions, [advanced.operations[position] for position in advanced_positions]))
+
+
 def make_permutation_1_1(lagged: Device, advanced: Device, average_deadline: float) -> bool:
     """
     Attempt to swap one operation from a lagged device with one from an advanced device.
 
-    This function tries to improve load balance by moving a longer operation from the
-    lagged device to the advanced device.
-    A shorter operation from the advanced
-    device to the lagged device, if the swap reduces the lagged device’s end time
-    sufficiently without making it finish before the average deadline by too much.
+    This function tries to improve load balance by moving a longer operation x from the
+    lagged device to the advanced device and a shorter operation y from the advanced
+    device to the lagged device, if the difference theta = x - y does not exceed the excess of the lagged device
+    over the average deadline (see `_gap`).
+    For every x, the shortest fitting y (the largest theta) is found by bisection over the sorted durations.
 
     :param lagged: The Device instance that is currently finishing later (lagging).
     :param advanced: The Device instance that is currently finishing earlier (advanced).
@@ -44,104 +148,108 @@ def make_permutation_1_1(lagged: Device, advanced: Device, average_deadline: flo
     :return: True if a beneficial swap was performed, False otherwise.
     """
 
-    for i in range(len(lagged.operations)):
-        for j in range(len(advanced.operations)):
-            if (theta := lagged.operations[i].duration - advanced.operations[j].duration) <= 0:
-                continue
-            if theta <= (lagged.end - average_deadline):
-                lagged.operations.insert(i, advanced.operations.pop(j))
-                advanced.operations.insert(j, lagged.operations.pop(i))
-                return True
+    gap = _gap(lagged, advanced, average_deadline)
+    durations, positions = advanced.sorted_operations()
+    for i, operation in enumerate(lagged.operations):
+        # theta = x - y in (0, gap] <=> y in [x - gap, x)
+        if (j := bisect_left(durations, operation.duration - gap)) < len(durations) \
+                and durations[j] < operation.duration:
+            _exchange(lagged, [i], advanced, [positions[j]])
+            return True
     return False
 
 
-def make_permutation_1_2(lagged: Device, advanced: Device, average_deadline: float) -> bool:
+def make_permutation_1_2(lagged: Device, advanced: Device, average_deadline: float, window: int = 32) -> bool:
     """
     Attempt to swap one operation from a lagged device with two from an advanced device.
 
     This function tries to improve load balance by moving one operation from the lagged
     device and replacing it with two operations from the advanced device if this
     swap reduces the lagged device’s end time sufficiently.
+    Pairs are found by bisection over the sorted durations (see `_find_pair`),
+    for at most `window` evenly spaced operations of the lagged device.
 
     :param lagged: The Device instance that is currently finishing later (lagging).
     :param advanced: The Device instance that is currently finishing earlier (advanced).
     :param average_deadline: The target average completion time for devices.
+    :param window: The maximal number of lagged operations tried, and the window of `_find_pair`.
     :return: True if a beneficial swap was performed, False otherwise.
     """
 
-    for i in range(len(lagged.operations)):
-        for j in range(len(advanced.operations)):
-            for k in range(j + 1, len(advanced.operations)):
-                if (theta := lagged.operations[i].duration
-                             - (advanced.operations[j].duration + advanced.operations[k].duration)) <= 0:
-                    continue
-                if theta <= (lagged.end - average_deadline):
-                    lagged.operations.insert(i, advanced.operations.pop(j))
-                    lagged.operations.insert(i + 1, advanced.operations.pop(k))
-                    advanced.operations.insert(j, lagged.operations.pop(i))
-                    return True
+    gap = _gap(lagged, advanced, average_deadline)
+    lagged_durations, lagged_positions = lagged.sorted_operations()
+    durations, positions = advanced.sorted_operations()
+    for i in _candidates(len(lagged_durations), window):
+        # theta = x - (y1 + y2) in (0, gap] <=> y1 + y2 in [x - gap, x)
+        if pair := _find_pair(durations, lagged_durations[i] - gap, nextafter(lagged_durations[i], -inf), window):
+            _exchange(lagged, [lagged_positions[i]], advanced, [positions[pair[0]], positions[pair[1]]])
+            return True
     return False
 
 
-def make_permutation_2_1(lagged: Device, advanced: Device, average_deadline: float) -> bool:
+def make_permutation_2_1(lagged: Device, advanced: Device, average_deadline: float, window: int = 32) -> bool:
     """
     Attempt to swap two operations from a lagged device with one from an advanced device.
 
     This function tries to improve load balance by moving two operations from the lagged
     device and replacing them with one operation from the advanced device if this
     swap reduces the lagged device’s end time sufficiently.
+    Pairs are found by bisection over the sorted durations (see `_find_pair`),
+    for at most `window` evenly spaced operations of the advanced device.
 
     :param lagged: The Device instance that is currently finishing later (lagging).
     :param advanced: The Device instance that is currently finishing earlier (advanced).
     :param average_deadline: The target average completion time for devices.
+    :param window: The maximal number of advanced operations tried, and the window of `_find_pair`.
     :return: True if a beneficial swap was performed, False otherwise.
     """
 
-    for i in range(len(lagged.operations)):
-        for j in range(i + 1, len(lagged.operations)):
-            for k in range(len(advanced.operations)):
-                if (theta := (lagged.operations[i].duration
-                              + lagged.operations[j].duration) - advanced.operations[k].duration) <= 0:
-                    continue
-                if theta <= (lagged.end - average_deadline):
-                    lagged.operations.insert(i, advanced.operations.pop(k))
-                    advanced.operations.insert(k, lagged.operations.pop(i))
-                    advanced.operations.insert(k + 1, lagged.operations.pop(j))
-                    return True
+    gap = _gap(lagged, advanced, average_deadline)
+    durations, positions = lagged.sorted_operations()
+    advanced_durations, advanced_positions = advanced.sorted_operations()
+    for k in _candidates(len(advanced_durations), window):
+        # theta = (x1 + x2) - y in (0, gap] <=> x1 + x2 in (y, y + gap]
+        y = advanced_durations[k]
+        if pair := _find_pair(durations, nextafter(y, inf), y + gap, window):
+            _exchange(lagged, [positions[pair[0]], positions[pair[1]]], advanced, [advanced_positions[k]])
+            return True
     return False
 
 
-def make_permutation_2_2(lagged: Device, advanced: Device, average_deadline: float) -> bool:
+def make_permutation_2_2(lagged: Device, advanced: Device, average_deadline: float, window: int = 32) -> bool:
     """
     Attempt to swap two operations from a lagged device with two from an advanced device.
 
     This function tries to improve load balance by moving two operations from the lagged
     device and replacing them with two operations from the advanced device if this
     swap reduces the lagged device’s end time sufficiently.
+    The pair sums of at most `window` evenly spaced operations per device are matched by bisection.
 
     :param lagged: The Device instance that is currently finishing later (lagging).
     :param advanced: The Device instance that is currently finishing earlier (advanced).
     :param average_deadline: The target average completion time for devices.
+    :param window: The maximal number of operations per device whose pairs are tried.
     :return: True if a beneficial swap was performed, False otherwise.
     """
 
-    for i in range(len(lagged.operations)):
-        for j in range(i + 1, len(lagged.operations)):
-            for k in range(len(advanced.operations)):
-                for l in range(k + 1, len(advanced.operations)):
-                    if (theta := (lagged.operations[i].duration + lagged.operations[j].duration)
-                                 - (advanced.operations[k].duration + advanced.operations[l].duration)) <= 0:
-                        continue
-                    if theta <= (lagged.end - average_deadline):
-                        lagged.operations.insert(i, advanced.operations.pop(k))
-                        lagged.operations.insert(i + 1, advanced.operations.pop(l))
-                        advanced.operations.insert(k, lagged.operations.pop(i))
-                        advanced.operations.insert(k + 1, lagged.operations.pop(j))
-                        return True
+    gap = _gap(lagged, advanced, average_deadline)
+    lagged_durations, lagged_positions = lagged.sorted_operations()
+    durations, positions = advanced.sorted_operations()
+    advanced_pairs = sorted((durations[k] + durations[l], k, l)
+                            for k, l in combinations(_candidates(len(durations), window), 2))
+    pair_sums = [pair[0] for pair in advanced_pairs]
+    for i, j in combinations(_candidates(len(lagged_durations), window), 2):
+        # theta = (x1 + x2) - (y1 + y2) in (0, gap] <=> y1 + y2 in [x1 + x2 - gap, x1 + x2)
+        lagged_sum = lagged_durations[i] + lagged_durations[j]
+        if (p := bisect_left(pair_sums, lagged_sum - gap)) < len(pair_sums) and pair_sums[p] < lagged_sum:
+            _exchange(lagged, [lagged_positions[i], lagged_positions[j]],
+                      advanced, [positions[advanced_pairs[p][1]], positions[advanced_pairs[p][2]]])
+            return True
     return False
 
 
-def get_multi_device_order_A0(threads: int, operations: List[Operation], tolerance: float = 1e-9) -> List[Device]:
+def get_multi_device_order_A0(threads: int, operations: List[Operation], tolerance: float = 1e-9,
+                              window: int = 32, speeds: Optional[Sequence[float]] = None) -> List[Device]:
     """
     Assign operations to devices aiming for balanced end times using iterative permutation heuristics.
 
@@ -149,16 +257,24 @@ def get_multi_device_order_A0(threads: int, operations: List[Operation], toleran
     is applied using permutation strategies (1-1, 1-2, 2-1, 2-2 swaps) between the most
     lagged device and advanced devices to balance a load until end times are within tolerance
     or no further improvements can be made.
+    With device speeds (uniform related machines), end times are the loads divided by the speeds
+    and the average deadline is the total duration divided by the total speed.
+    Every swap strictly decreases the sum of squared device loads divided by the speeds (see `_gap`),
+    so the refinement terminates, and it never increases the makespan of the LPT schedule.
+    Device loads are maintained incrementally and swap searches use sorted durations,
+    so the refinement scales to large numbers of operations.
 
     :param threads: The number of threads (devices) to distribute tasks across.
     :param operations: A list of Operation objects to be ordered.
     :param tolerance: The tolerance for checking if device end times are balanced.
+    :param window: The bound on the operations per device tried in the pair swaps (see `make_permutation_2_2`).
+    :param speeds: The relative speed of every device; None for identical devices.
     :return: A list of Device objects with their assigned operations, balanced as much as possible.
     """
 
-    processed_devices = get_multi_device_heuristic_order(threads, operations)
+    processed_devices = get_multi_device_heuristic_order(threads, operations, speeds)
 
-    average_deadline = sum(op.duration for op in operations) / len(processed_devices)
+    average_deadline = sum(op.duration for op in operations) / sum(dev.speed for dev in processed_devices)
 
     while True:
         if not processed_devices:
@@ -182,9 +298,9 @@ def get_multi_device_order_A0(threads: int, operations: List[Operation], toleran
             if not max_lagged_device.operations:
                 continue
             if (make_permutation_1_1(max_lagged_device, advanced_device, average_deadline) or
-                    make_permutation_1_2(max_lagged_device, advanced_device, average_deadline) or
-                    make_permutation_2_1(max_lagged_device, advanced_device, average_deadline) or
-                    make_permutation_2_2(max_lagged_device, advanced_device, average_deadline)):
+                    make_permutation_1_2(max_lagged_device, advanced_device, average_deadline, window) or
+                    make_permutation_2_1(max_lagged_device, advanced_device, average_deadline, window) or
+                    make_permutation_2_2(max_lagged_device, advanced_device, average_deadline, window)):
                 found_permutation_this_iteration = True
                 break
 
@@ -197,25 +313,36 @@ def get_multi_device_order_A0(threads: int, operations: List[Operation], toleran
     return processed_devices
 
 
-def get_order(sizes: List[Tuple[int, int]], threads: int) -> List[List[int]]:
+def get_order(sizes: List[Tuple[int, ...]], threads: int,
+              coefficients: Optional[EmpiricCoefficients] = None,
+              observed: Optional[Sequence[Optional[float]]] = None,
+              scheduler: Optional[Scheduler] = None) -> List[List[int]]:
     """
     Assign tasks, defined by their sizes, to threads for balanced parallel execution.
 
     This function converts task sizes into operation durations using an empiric function,
-    then uses a multi-device scheduling algorithm (A0) to distribute these operations
+    replacing them with observed durations where a runtime history is available (see `blend_durations`),
+    then uses a multi-device scheduling algorithm (A0 by default, see `new_scheduler`) to distribute these operations
     (tasks) across the specified number of threads.
     The result is a list of task indices assigned to each thread.
 
-    :param sizes: A list of tuples, where each tuple (m, n) represents the characteristics
-                  (e.g., constraints and variables) of a task.
+    :param sizes: A list of tuples, where each tuple (m, n) or (m, n, nnz) represents the characteristics
+                  (e.g., constraints, variables and non-zero coefficients) of a task.
     :param threads: The number of threads (devices) to distribute the tasks across.
+    :param coefficients: The empiric formula coefficients; defaults to the calibration profile.
+    :param observed: The observed duration of every task in seconds (None where unknown), preferred over the formula.
+    :param scheduler: The scheduling algorithm; defaults to `get_multi_device_order_A0`.
     :return: A list of lists, where each inner list contains the original indices of the
              tasks assigned to the corresponding thread.
     """
 
+    durations = empiric_batch(sizes, coefficients).tolist()
+    if observed is not None:
+        durations = blend_durations(durations, observed)
+
     return [[operation.original_index for operation in device.operations]
-            for device in get_multi_device_order_A0(
-            threads, [Operation(empiric(size_tuple), i) for i, size_tuple in enumerate(sizes)])]
+            for device in (scheduler or get_multi_device_order_A0)(
+            threads, [Operation(duration, i) for i, duration in enumerate(durations)])]
 
 
 if __name__ == "__main__":
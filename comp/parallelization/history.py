@@ -0,0 +1,134 @@
+from dataclasses import dataclass, field
+from json import dump, load
+from os import makedirs, path
+from typing import Dict, List, Optional, Sequence
+
+try:
+    from typing import Self
+except ImportError:
+    from typing_extensions import Self
+
+from numpy import array, isfinite, median
+
+from comp.models import ElementData
+from comp.utils import assert_bounds
+
+
+def element_fingerprint(element: ElementData) -> str:
+    """
+    Get a fingerprint of an element that is stable under small data changes.
+
+    Only the identity and structure of the element enter the fingerprint (id, type, m_e, n_e, nnz of A_e),
+    so repeated runs on slightly modified coefficients share their history,
+    while a changed problem structure starts a new one.
+
+    :param element: The element data.
+    :return: The fingerprint, e.g., "3/NEGOTIATED/4x6/24".
+    """
+
+    return (f"{element.config.id}/{element.config.type.name}/"
+            f"{element.config.num_constraints}x{element.config.num_decision_variables}/{element.nnz}")
+
+
+@dataclass
+class RuntimeHistory:
+    """
+    Store of observed task durations, keyed by strategy and element fingerprint.
+
+    Every new observation is merged into an exponentially smoothed estimate, so the estimates follow
+    gradual changes of the data or the host while damping the noise of single runs.
+    """
+
+    smoothing: float = .3  # weight of the newest observation
+    entries: Dict[str, Dict[str, float]] = field(default_factory=dict)  # key -> {"duration", "samples"}
+
+    def __post_init__(self) -> None:
+        """Validate the smoothing factor."""
+
+        assert_bounds(self.smoothing, (0., 1.), "smoothing")
+
+    @staticmethod
+    def key(strategy: str, element: ElementData) -> str:
+        """
+        Build the history key of an element task.
+
+        :param strategy: The name of the strategy (phase) that ran the task, e.g., the center type name.
+        :param element: The element data.
+        :return: The key.
+        """
+
+        return f"{strategy}:{element_fingerprint(element)}"
+
+    def record(self, key: str, duration: float) -> None:
+        """
+        Merge an observed duration into the smoothed estimate of a key.
+
+        :param key: The history key (see `key`).
+        :param duration: The observed duration, in seconds.
+        """
+
+        if (entry := self.entries.get(key)) is None:
+            self.entries[key] = {"duration": float(duration), "samples": 1}
+            return
+
+        entry["duration"] += self.smoothing * (float(duration) - entry["duration"])
+        entry["samples"] += 1
+
+    def estimate(self, key: str) -> Optional[float]:
+        """
+        Get the smoothed duration of a key.
+
+        :param key: The history key (see `key`).
+        :return: The smoothed duration in seconds, or None if the key was never observed.
+        """
+
+        return entry["duration"] if (entry := self.entries.get(key)) is not None else None
+
+    @classmethod
+    def load(cls, filepath: str, smoothing: float = .3) -> Self:
+        """
+        Load a history from a JSON file.
+
+        :param filepath: The path of the history file.
+        :param smoothing: The smoothing factor of the new observations.
+        :return: The loaded history, or an empty one if the file does not exist.
+        """
+
+        if not path.isfile(filepath):
+            return cls(smoothing)
+        with open(filepath, "r") as f:
+            return cls(smoothing, load(f))
+
+    def save(self, filepath: str) -> None:
+        """
+        Save the history to a JSON file.
+
+        :param filepath: The path of the history file.
+        """
+
+        if directory := path.dirname(filepath):
+            makedirs(directory, exist_ok=True)
+        with open(filepath, "w") as f:
+            dump(self.entries, f, indent=2)
+
+
+def blend_durations(estimates: Sequence[float], observed: Sequence[Optional[float]]) -> List[float]:
+    """
+    Combine formula estimates with observed durations, preferring the observations.
+
+    Formula estimates are in arbitrary units, so they are rescaled to seconds by the median ratio
+    between the observed durations and the estimates of the observed tasks.
+    Without any observation, the estimates are returned unchanged.
+
+    :param estimates: The formula estimate of every task (e.g., from `empiric`).
+    :param observed: The observed duration of every task in seconds, None where there is no history.
+    :return: The duration of every task: the observed one where available, the rescaled estimate otherwise.
+    """
+
+    known = [(o, e) for o, e in zip(observed, estimates) if o is not None and e > 0]
+    if not known:
+        return list(estimates)
+
+    ratios = array([o / e for o, e in known])
+    scale = float(median(ratios[isfinite(ratios)])) if isfinite(ratios).any() else 1.
+    return [o if o is not None else e * scale for o, e in zip(observed, estimates)]
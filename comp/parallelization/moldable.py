@@ -0,0 +1,103 @@
+from collections import deque
+from heapq import heappop, heappush
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from comp.utils import assert_bounds, assert_non_negative, assert_positive
+
+# Share of the single-threaded duration of a task that does not shrink with more threads (Amdahl's law)
+DEFAULT_SERIAL_FRACTION = .2
+
+
+def moldable_duration(duration: float, threads: int, serial_fraction: float = DEFAULT_SERIAL_FRACTION) -> float:
+    """
+    Predict the duration of a task run with several threads by Amdahl's law.
+
+    :param duration: The single-threaded duration of the task.
+    :param threads: The number of threads of the task.
+    :param serial_fraction: The share of the duration that does not shrink with more threads.
+    :return: duration * (serial_fraction + (1 - serial_fraction) / threads).
+    """
+
+    return duration * (serial_fraction + (1. - serial_fraction) / threads)
+
+
+def simulate_makespan(durations: Sequence[float], allotment: Sequence[int], threads: int) -> float:
+    """
+    Predict the makespan of moldable tasks by list scheduling, as `ParallelExecutor` runs them.
+
+    Tasks are tried longest first; a task starts as soon as its threads are free (or nothing else runs),
+    and later tasks that fit start before a waiting one (backfilling).
+    The pending tasks are queued by their number of threads, so the longest task that fits is found
+    among the queue heads; with K distinct thread counts this takes O(T (log T + K)) for T tasks.
+
+    :param durations: The duration of every task with its allotted threads.
+    :param allotment: The number of threads of every task.
+    :param threads: The number of available threads.
+    :return: The predicted makespan.
+    """
+
+    order = sorted(range(len(durations)), key=lambda j: durations[j], reverse=True)
+    queues: Dict[int, Deque[int]] = dict()  # the pending tasks of every thread count, longest first
+    for i in order:
+        queues.setdefault(allotment[i], deque()).append(i)
+    rank = {i: r for r, i in enumerate(order)}
+    running: List[Tuple[float, int]] = list()  # heap of (end time, threads) of the running tasks
+    now, free = .0, threads
+    while queues or running:
+        while queues:
+            fitting = [k for k in queues if not running or k <= free]
+            if not fitting:
+                break
+            k = min(fitting, key=lambda count: rank[queues[count][0]])
+            i = queues[k].popleft()
+            if not queues[k]:
+                del queues[k]
+            heappush(running, (now + durations[i], k))
+            free -= k
+        now, released = heappop(running)
+        free += released
+    return now
+
+
+def allot_threads(durations: Sequence[float], threads: int, max_threads: Optional[int] = None,
+                  serial_fraction: float = DEFAULT_SERIAL_FRACTION) -> List[int]:
+    """
+    Choose the number of threads of every moldable task so that the predicted makespan is minimal.
+
+    All tasks start with one thread. Only tasks longer than the total duration per thread can bound the makespan,
+    so only they are candidates: in every step, the candidate with the longest predicted duration gets
+    the number of threads (up to `max_threads`) that lowers the predicted makespan (see `simulate_makespan`)
+    the most, until a step brings no improvement; so a few huge tasks run multi-threaded
+    while the small ones share the remaining threads.
+
+    :param durations: The single-threaded duration of every task (any consistent unit).
+    :param threads: The number of available threads.
+    :param max_threads: The largest number of threads of a task; defaults to `threads`.
+    :param serial_fraction: The share of a duration that does not shrink with more threads (see `moldable_duration`).
+    :return: The number of threads of every task.
+    """
+
+    assert_positive(threads, "threads")
+    assert_bounds(serial_fraction, (0, 1), "serial_fraction")
+    for duration in durations:
+        assert_non_negative(duration, "duration")
+    max_threads = min(max_threads or threads, threads)
+
+    allotment = [1] * len(durations)
+    predicted = list(durations)
+    best = simulate_makespan(predicted, allotment, threads)
+    share = sum(durations) / threads
+    candidates = set(i for i in range(len(durations)) if max_threads > 1 and durations[i] > share)
+    while candidates:
+        i = max(candidates, key=lambda j: predicted[j])
+        improvement = None
+        for k in range(allotment[i] + 1, max_threads + 1):
+            trial = predicted[:i] + [moldable_duration(durations[i], k, serial_fraction)] + predicted[i + 1:]
+            if (makespan := simulate_makespan(trial, allotment[:i] + [k] + allotment[i + 1:], threads)) < best:
+                best, improvement = makespan, (k, trial[i])
+        if improvement is None:
+            break
+        allotment[i], predicted[i] = improvement
+        if allotment[i] == max_threads:
+            candidates.discard(i)
+    return allotment
@@ -0,0 +1,435 @@
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import Executor, Future
+from functools import partial
+from hashlib import blake2b
+from io import BytesIO
+from multiprocessing import AuthenticationError, Pipe, Process, current_process
+from multiprocessing.connection import Client, Connection, Listener
+from os import environ
+from pickle import HIGHEST_PROTOCOL, Pickler, Unpickler
+from threading import Condition, Thread
+from traceback import format_exc
+from typing import Any, BinaryIO, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from numpy import ascontiguousarray, ndarray
+
+from comp.parallelization.worker_cache import WorkerCache
+from comp.utils import assert_positive
+
+# Environment variable with the shared secret of the node daemons and their clients;
+# without it, only the daemons started by the same process tree (e.g., `LocalNodes`) accept a connection
+AUTHKEY_VARIABLE = "COMP_NODE_AUTHKEY"
+
+# Arrays of at least this many bytes are sent by content hash, once per node (see `NodePool`)
+MIN_BLOB_BYTES = 1024
+
+# Number of arrays a node daemon keeps for later tasks
+BLOB_CACHE_SIZE = 4096
+
+Address = Tuple[str, int]
+_Submission = Tuple[Future, Callable[..., Any], Tuple]
+
+
+def parse_address(address: str) -> Address:
+    """
+    Parse the address of a node daemon.
+
+    :param address: The address as "host:port".
+    :return: The host and the port.
+    """
+
+    host, _, port = address.rpartition(":")
+    assert host and port.isdigit(), f"Expected a host:port node address, got {address!r}"
+    return host, int(port)
+
+
+def node_authkey() -> bytes:
+    """
+    Get the secret that authenticates the connections between node daemons and clients.
+
+    :return: The value of `AUTHKEY_VARIABLE` if set, otherwise the authentication key of the process tree.
+    """
+
+    return environ[AUTHKEY_VARIABLE].encode() if environ.get(AUTHKEY_VARIABLE) else bytes(current_process().authkey)
+
+
+def array_digest(array: ndarray) -> str:
+    """
+    Get the content hash of an array.
+
+    :param array: The array.
+    :return: The hexadecimal BLAKE2 digest of its dtype, shape and values.
+    """
+
+    digest = blake2b(f"{array.dtype.str}{array.shape}".encode(), digest_size=16)
+    digest.update(ascontiguousarray(array).data)
+    return digest.hexdigest()
+
+
+class _BlobPickler(Pickler):
+    """Pickler that replaces the large arrays of a payload with their content hash (see `NodePool`)."""
+
+    def __init__(self, file: BinaryIO, digests: Dict[int, Tuple[ndarray, str]], blobs: Dict[str, ndarray]) -> None:
+        """
+        Initialize the pickler.
+
+        :param file: The output.
+        :param digests: The known digests of read-only arrays by their id, filled in place.
+        :param blobs: The arrays of the payload by digest, filled in place.
+        """
+
+        super().__init__(file, HIGHEST_PROTOCOL)
+        self.digests = digests
+        self.blobs = blobs
+
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        """
+        Replace a large array with its digest.
+
+        :param obj: The object to pickle.
+        :return: The digest of a large array, None to pickle the object normally.
+        """
+
+        if not isinstance(obj, ndarray) or obj.nbytes < MIN_BLOB_BYTES or obj.dtype.hasobject:
+            return None
+        if obj.flags.writeable:
+            digest = array_digest(obj)  # a writeable array may change between submissions
+        elif (known := self.digests.get(id(obj))) is None or known[0] is not obj:
+            digest = (self.digests.setdefault(id(obj), (obj, array_digest(obj))))[1]
+        else:
+            digest = known[1]
+        self.blobs[digest] = obj
+        return digest
+
+
+class _BlobUnpickler(Unpickler):
+    """Unpickler that resolves the digests of `_BlobPickler` from the arrays of a node."""
+
+    def __init__(self, file: BinaryIO, blobs: Dict[str, ndarray]) -> None:
+        """
+        Initialize the unpickler.
+
+        :param file: The input.
+        :param blobs: The arrays of the payload by digest.
+        """
+
+        super().__init__(file)
+        self.blobs = blobs
+
+    def persistent_load(self, pid: Any) -> ndarray:
+        """
+        Resolve a digest.
+
+        :param pid: The digest.
+        :return: The array.
+        """
+
+        return self.blobs[pid]
+
+
+def _serve_connection(connection: Connection, blobs: WorkerCache) -> None:
+    """
+    Run the tasks of one client, one at a time, until it disconnects.
+
+    Messages: ("task", digests, payload) runs the pickled (function, arguments) of the payload and answers
+    ("done", result) or ("error", traceback); if arrays of the digests are not cached, ("need", digests) asks
+    for them first, which the client sends as ("blobs", {digest: array}).
+
+    :param connection: The connection to the client.
+    :param blobs: The cached arrays of the node by digest.
+    """
+
+    with connection:
+        while True:
+            try:
+                _, digests, payload = connection.recv()
+                found = {digest: blobs.get(digest) for digest in digests}
+                if missing := [digest for digest, array in found.items() if array is None]:
+                    connection.send(("need", missing))
+                    for digest, array in connection.recv()[1].items():
+                        array.flags.writeable = False
+                        blobs.put(digest, array)
+                        found[digest] = array
+            except (EOFError, OSError):
+                return
+            try:
+                function, arguments = _BlobUnpickler(BytesIO(payload), found).load()
+                connection.send(("done", function(*arguments)))
+            except Exception:
+                connection.send(("error", format_exc()))
+
+
+def serve_node(address: Address, authkey: Optional[bytes] = None, ready: Optional[Connection] = None) -> None:
+    """
+    Run a node daemon: accept `NodePool` connections and run their tasks until the process is stopped.
+
+    Every client connection is served by a thread of its own, one task at a time (see `_serve_connection`);
+    a daemon is one worker, so a machine with several CPUs runs one daemon per CPU.
+    Arrays stay cached across connections (up to `BLOB_CACHE_SIZE`), and so does the `worker_cache` of the tasks.
+    The tasks are unpickled by reference, so the daemon needs the same version of the code as its clients.
+
+    :param address: The host and the port to listen on; port 0 picks a free one.
+    :param authkey: The secret of the connections; defaults to `node_authkey`.
+    :param ready: A connection that receives the bound address once the daemon listens.
+    """
+
+    blobs = WorkerCache(BLOB_CACHE_SIZE)
+    with Listener(address, authkey=authkey or node_authkey()) as listener:
+        if ready is not None:
+            ready.send(listener.address)
+            ready.close()
+        while True:
+            try:
+                connection = listener.accept()
+            except (AuthenticationError, OSError):
+                continue
+            Thread(target=_serve_connection, args=(connection, blobs), daemon=True).start()
+
+
+class NodePool(Executor):
+    """
+    Pool of node daemons (see `serve_node`) with one worker slot per address.
+
+    Tasks are pickled with their large arrays replaced by content hashes (see `MIN_BLOB_BYTES`);
+    a node receives an array only if it has not cached it yet, so the data of a run crosses the network once
+    per node instead of once per task. Results come back pickled as they are.
+    `submit` hands a task to the next free slot, `submit_to` to a given slot, e.g., the thread of a static schedule.
+    A slot whose node becomes unreachable fails its running task with a `ConnectionError`
+    and leaves its queued tasks to the other slots.
+    """
+
+    def __init__(self, addresses: Sequence[str], authkey: Optional[bytes] = None,
+                 initializer: Optional[Callable[..., None]] = None, initargs: Tuple = ()) -> None:
+        """
+        Connect to the node daemons.
+
+        :param addresses: The "host:port" address of every slot.
+        :param authkey: The secret of the connections; defaults to `node_authkey`.
+        :param initializer: A function every node calls before the first task of the pool.
+        :param initargs: The arguments of the initializer.
+        """
+
+        assert_positive(len(addresses), "len(addresses)")
+
+        self.addresses = list(addresses)
+        self._connections: List[Connection] = list()
+        try:
+            for address in self.addresses:
+                self._connections.append(Client(parse_address(address), authkey=authkey or node_authkey()))
+        except Exception:
+            for connection in self._connections:
+                connection.close()
+            raise
+
+        self._digests: Dict[int, Tuple[ndarray, str]] = dict()
+        self._shared: Deque[_Submission] = deque()
+        self._routed: List[Deque[_Submission]] = [deque() for _ in self.addresses]
+        self._alive = [True] * len(self.addresses)
+        self._condition = Condition()
+        self._shutdown = False
+        self._threads = [Thread(target=self._run_slot, args=(slot, initializer, initargs), daemon=True)
+                         for slot in range(len(self.addresses))]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        """
+        Submit a task to the next free slot.
+
+        :param fn: The function.
+        :param args: The arguments of the function.
+        :param kwargs: The keyword arguments of the function.
+        :return: The future of the result.
+        """
+
+        return self._enqueue(None, partial(fn, **kwargs) if kwargs else fn, args)
+
+    def submit_to(self, slot: int, fn: Callable[..., Any], /, *args: Any) -> Future:
+        """
+        Submit a task to a given slot, or to the next free one if the node of the slot is unreachable.
+
+        :param slot: The slot; taken modulo the number of slots.
+        :param fn: The function.
+        :param args: The arguments of the function.
+        :return: The future of the result.
+        """
+
+        return self._enqueue(slot % len(self.addresses), fn, args)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop accepting tasks and disconnect once the queued tasks are done.
+
+        :param wait: Whether to wait until the slots are disconnected.
+        :param cancel_futures: Whether to cancel the queued tasks instead of running them.
+        """
+
+        with self._condition:
+            self._shutdown = True
+            if cancel_futures:
+                for queue in (self._shared, *self._routed):
+                    while queue:
+                        queue.popleft()[0].cancel()
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _enqueue(self, slot: Optional[int], fn: Callable[..., Any], args: Tuple) -> Future:
+        """
+        Queue a task (see `submit` and `submit_to`).
+
+        :param slot: The slot, None for the next free one.
+        :param fn: The function.
+        :param args: The arguments of the function.
+        :return: The future of the result.
+        """
+
+        future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit tasks after the node pool is shut down")
+            if not any(self._alive):
+                future.set_exception(ConnectionError("No node of the pool is reachable"))
+                return future
+            (self._routed[slot] if slot is not None and self._alive[slot] else self._shared).append((future, fn, args))
+            self._condition.notify_all()
+        return future
+
+    def _run_slot(self, slot: int, initializer: Optional[Callable[..., None]], initargs: Tuple) -> None:
+        """
+        Run the queued tasks of a slot on its node until the pool is shut down.
+
+        :param slot: The slot.
+        :param initializer: A function the node calls first, if any.
+        :param initargs: The arguments of the initializer.
+        """
+
+        connection, submission = self._connections[slot], None
+        try:
+            if initializer is not None:
+                self._call(slot, initializer, initargs)
+            while True:
+                with self._condition:
+                    while not (self._routed[slot] or self._shared or self._shutdown):
+                        self._condition.wait()
+                    if not (self._routed[slot] or self._shared):
+                        return
+                    submission = (self._routed[slot] or self._shared).popleft()
+                future, function, arguments = submission
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(self._call(slot, function, arguments))
+                    except (ConnectionError, EOFError, OSError):
+                        raise
+                    except Exception as exception:
+                        future.set_exception(exception)
+                submission = None
+        except (ConnectionError, EOFError, OSError) as exception:
+            self._disconnect(slot, submission, exception)
+        finally:
+            connection.close()
+
+    def _disconnect(self, slot: int, submission: Optional[_Submission], exception: BaseException) -> None:
+        """
+        Give up a slot whose node is unreachable.
+
+        :param slot: The slot.
+        :param submission: The task the slot was running, if any, which fails.
+        :param exception: The connection error.
+        """
+
+        error = ConnectionError(f"Node {self.addresses[slot]} is unreachable: {exception!r}")
+        if submission is not None and not submission[0].done():
+            submission[0].set_exception(error)
+        with self._condition:
+            self._alive[slot] = False
+            self._shared.extend(self._routed[slot])
+            self._routed[slot].clear()
+            if not any(self._alive):
+                while self._shared:
+                    if (future := self._shared.popleft()[0]).set_running_or_notify_cancel():
+                        future.set_exception(error)
+            self._condition.notify_all()
+
+    def _call(self, slot: int, function: Callable[..., Any], arguments: Tuple) -> Any:
+        """
+        Run a function on the node of a slot.
+
+        :param slot: The slot.
+        :param function: The function.
+        :param arguments: The arguments of the function.
+        :raises RuntimeError: If the function fails on the node.
+        :return: The result of the function.
+        """
+
+        blobs, payload = dict(), BytesIO()
+        _BlobPickler(payload, self._digests, blobs).dump((function, arguments))
+        connection = self._connections[slot]
+        connection.send(("task", list(blobs), payload.getvalue()))
+        while (reply := connection.recv())[0] == "need":
+            connection.send(("blobs", {digest: blobs[digest].view(ndarray) for digest in reply[1]}))
+        if reply[0] == "error":
+            raise RuntimeError(f"Task failed on node {self.addresses[slot]}:\n{reply[1]}")
+        return reply[1]
+
+
+class LocalNodes:
+    """
+    Node daemons (see `serve_node`) in local processes, e.g., to run the DISTRIBUTED backend on one machine.
+
+    The daemons share the authentication key of this process, so `NodePool` connects without `AUTHKEY_VARIABLE`.
+    """
+
+    def __init__(self, count: int) -> None:
+        """
+        Initialize the daemons, which start when entering the `with` block.
+
+        :param count: The number of daemons.
+        """
+
+        assert_positive(count, "count")
+
+        self.count = count
+        self.processes: List[Process] = list()
+        self.addresses: List[str] = list()
+
+    def __enter__(self) -> "LocalNodes":
+        """
+        Start the daemons on free ports of the loopback interface.
+
+        :return: The daemons, with their `addresses`.
+        """
+
+        for _ in range(self.count):
+            receiver, sender = Pipe(duplex=False)
+            process = Process(target=serve_node, args=(("127.0.0.1", 0), None, sender), daemon=True)
+            process.start()
+            sender.close()
+            host, port = receiver.recv()
+            receiver.close()
+            self.processes.append(process)
+            self.addresses.append(f"{host}:{port}")
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        """Stop the daemons."""
+
+        for process in self.processes:
+            process.terminate()
+            process.join()
+        self.processes, self.addresses = list(), list()
+
+
+if __name__ == "__main__":
+    """Run a node daemon for the DISTRIBUTED backend; set the same `COMP_NODE_AUTHKEY` here and on the clients."""
+
+    parser = ArgumentParser(description="Run a node daemon that executes COMP tasks sent over TCP.")
+    parser.add_argument("--host", default="0.0.0.0", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=6001, help="port to listen on")
+    arguments = parser.parse_args()
+
+    if not environ.get(AUTHKEY_VARIABLE):
+        parser.error(f"set the shared secret of the nodes and clients in {AUTHKEY_VARIABLE}")
+    serve_node((arguments.host, arguments.port))
@@ -1,115 +1,1207 @@
-from concurrent.futures import ProcessPoolExecutor
+from asyncio import get_running_loop, wait as wait_async, wrap_future
+from concurrent.futures import (FIRST_COMPLETED, BrokenExecutor, Executor, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from dataclasses import dataclass
 from functools import partial
-from typing import List, Callable, TypeVar, Optional, Dict
+from heapq import heapify, heappop, heappush
+from pickle import dumps
+from statistics import median
+from threading import get_native_id
+from time import perf_counter
+from typing import (Any, AsyncIterator, List, Callable, Collection, TypeVar, Optional, Dict, Hashable, Iterable,
+                    Iterator, Mapping, Set, Tuple, Sequence, Union)
 
-from comp.utils import assert_positive, assert_non_negative
+from comp.models import ExecutionBackend, ExecutionMode, ExecutionStatus
+from comp.parallelization.cancellation import CancellationToken
+from comp.parallelization.core import Operation
+from comp.parallelization.heuristic import get_multi_device_heuristic_order
+from comp.parallelization.nodes import NodePool
+from comp.parallelization.planner import (ExecutionPlan, ExecutionPlanner, InterpreterPoolExecutor,
+                                         interpreters_supported, pin_to_cpu, run_on_cpu)
+from comp.utils import assert_bounds, assert_positive, assert_non_negative
 
 T = TypeVar("T")
 
+# The tasks of the current graph batch of a process or sub-interpreter worker (see `load_graph_tasks`)
+_loaded_tasks: List[Callable[..., Any]] = list()
 
-def run_task_group(tasks: List[Callable[[], T]], num_tasks: int, task_indices: List[int]) -> Dict[int, Optional[T]]:
+# Errors of a future whose worker died, as opposed to a failed task, which returns None: a broken process
+# or sub-interpreter pool (e.g., a worker crashed in the native solver or was killed for lack of memory)
+# or an unreachable node
+WORKER_LOST = (BrokenExecutor, ConnectionError)
+
+
+def run_task_group(tasks: Union[Sequence[Callable[[], T]], Mapping[int, Callable[[], T]]], num_tasks: int,
+                   task_indices: List[int]) -> Dict[int, Tuple[Optional[T], float]]:
     """
     Execute a specified subgroup of tasks from a larger list of tasks.
 
     This function iterates through a list of task indices, and for each valid index,
     it executes the corresponding task from the provided list of callable tasks.
-    Results are stored in a dictionary mapping the task index to its result.
+    Results are stored in a dictionary mapping the task index to its result and wall time.
     If a task fails, its result is stored as None and an error message is printed.
 
-    :param tasks: A list of all callable tasks available for execution.
-    :param num_tasks: The total number of tasks in the `tasks` list.
+    :param tasks: A list of all callable tasks available for execution, or the tasks of the group by index.
+    :param num_tasks: The total number of tasks of the batch.
     :param task_indices: A list of integer indices specifying which tasks from the `tasks` list to execute.
-    :return: A dictionary mapping each executed task’s original index to its result (or None if failed).
+    :return: A dictionary mapping each executed task’s original index to a tuple of its result (or None if failed)
+             and its duration in seconds.
     """
 
     group_results = dict()
     for index in task_indices:
         if 0 <= index < num_tasks:
+            start = perf_counter()
             try:
-                group_results[index] = tasks[index]()
+                result = tasks[index]()
             except Exception as e:
-                group_results[index] = None
+                result = None
                 print(f"[PAR] Task {index} failed to execute: {e}")
+            group_results[index] = (result, perf_counter() - start)
     return group_results
 
 
+def run_worker_task_group(tasks: Union[Sequence[Callable[[], T]], Mapping[int, Callable[[], T]]], num_tasks: int,
+                          task_indices: List[int]) -> Tuple[int, float, Dict[int, Tuple[Optional[T], float]]]:
+    """
+    Execute a subgroup of tasks (see `run_task_group`) and report the worker that ran it.
+
+    :param tasks: A list of all callable tasks available for execution, or the tasks of the group by index.
+    :param num_tasks: The total number of tasks of the batch.
+    :param task_indices: A list of integer indices specifying which tasks from the `tasks` list to execute.
+    :return: A tuple of the worker id (the native thread id, which is the process id in a process pool worker),
+             the wall time of the whole group in seconds and the results of `run_task_group`.
+    """
+
+    start = perf_counter()
+    group_results = run_task_group(tasks, num_tasks, task_indices)
+    return get_native_id(), perf_counter() - start, group_results
+
+
+def bind_task_group(tasks: Sequence[Callable[[], T]],
+                    task_indices: List[int]) -> Callable[[], Tuple[int, float, Dict[int, Tuple[Optional[T], float]]]]:
+    """
+    Bind a group to its own tasks (see `run_worker_task_group`), so a submission pickles only them, not the batch.
+
+    :param tasks: All tasks of the batch.
+    :param task_indices: The indices of the tasks of the group.
+    :return: A callable running the group in a worker.
+    """
+
+    return partial(run_worker_task_group, {i: tasks[i] for i in task_indices if 0 <= i < len(tasks)}, len(tasks),
+                   task_indices)
+
+
+def run_graph_task(task: Callable[..., T], index: int, arguments: Sequence[Any]) -> Tuple[int, float, Optional[T]]:
+    """
+    Execute one task of a task graph with the results of its dependencies (see `ParallelExecutor.execute_graph`).
+
+    :param task: The callable task.
+    :param index: The index of the task in the graph, used in the error message.
+    :param arguments: The results of the dependencies of the task, passed positionally.
+    :return: A tuple of the worker id (see `run_worker_task_group`), the wall time of the task in seconds
+             and its result (None if it failed).
+    """
+
+    start = perf_counter()
+    try:
+        result = task(*arguments)
+    except Exception as e:
+        result = None
+        print(f"[PAR] Task {index} failed to execute: {e}")
+    return get_native_id(), perf_counter() - start, result
+
+
+def load_graph_tasks(cpu: Optional[int], tasks: List[Callable[..., Any]]) -> None:
+    """
+    Prepare a process or sub-interpreter worker for a batch of graph tasks (the initializer of its pool).
+
+    The worker is pinned to its CPU (see `pin_to_cpu`) and keeps the tasks, which are thereby transferred once
+    per worker (not at all by a forked process) instead of once per task, e.g., a solver bound by all of them;
+    the tasks are then submitted by index (see `run_loaded_task`).
+
+    :param cpu: The CPU of the worker, None for no pinning.
+    :param tasks: The tasks of the batch.
+    """
+
+    pin_to_cpu(cpu)
+    _loaded_tasks[:] = tasks
+
+
+def run_loaded_task(index: int, arguments: Sequence[Any]) -> Tuple[int, float, Any]:
+    """
+    Execute a task kept by `load_graph_tasks` (see `run_graph_task`).
+
+    :param index: The index of the task in the graph.
+    :param arguments: The results of the dependencies of the task.
+    :return: The worker id, the wall time and the result of the task (see `run_graph_task`).
+    """
+
+    return run_graph_task(_loaded_tasks[index], index, arguments)
+
+
+def make_chunks(costs: Sequence[float], num_workers: int, chunks_per_worker: int) -> List[List[int]]:
+    """
+    Split tasks into chunks for dynamic execution, longest first.
+
+    Tasks are visited in decreasing order of estimated cost and collected into a chunk until its cost would exceed
+    total / (num_workers * chunks_per_worker), so long tasks run alone and short ones travel together.
+
+    :param costs: The estimated cost of every task (any consistent unit).
+    :param num_workers: The number of workers.
+    :param chunks_per_worker: The number of chunks per worker of an evenly balanced workload.
+    :return: The task indices of every chunk, in submission order.
+    """
+
+    bound = sum(costs) / (num_workers * chunks_per_worker)
+    chunks, chunk, chunk_cost = list(), list(), .0
+    for index in sorted(range(len(costs)), key=lambda i: costs[i], reverse=True):
+        if chunk and chunk_cost + costs[index] > bound:
+            chunks.append(chunk)
+            chunk, chunk_cost = list(), .0
+        chunk.append(index)
+        chunk_cost += costs[index]
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def group_by_affinity(costs: Sequence[float], affinity: Sequence[Optional[Hashable]], num_workers: int,
+                      chunks_per_worker: Optional[int] = None,
+                      speeds: Optional[Sequence[float]] = None) -> List[List[int]]:
+    """
+    Group tasks so that all tasks with the same affinity key run on the same worker.
+
+    The tasks of a key form a unit costing the sum of their costs; a task without a key (None) is a unit of its own.
+    The units are distributed to `num_workers` groups by the LPT heuristic (see `get_multi_device_heuristic_order`),
+    or split into dynamic chunks (see `make_chunks`) if `chunks_per_worker` is given.
+
+    :param costs: The estimated cost of every task.
+    :param affinity: The affinity key of every task, e.g., the index of its element.
+    :param num_workers: The number of workers.
+    :param chunks_per_worker: The number of dynamic chunks per worker, None for one group per worker.
+    :param speeds: The relative speed of every worker, fastest first, for the LPT heuristic; None for identical ones.
+                   As empty groups are dropped, group g then belongs to worker g.
+    :return: The task indices of every group, the tasks of a key in ascending order.
+    """
+
+    members: Dict[Hashable, List[int]] = dict()
+    for i, key in enumerate(affinity):
+        members.setdefault((None, i) if key is None else (key,), list()).append(i)
+    units = list(members.values())
+    unit_costs = [sum(costs[i] for i in unit) for unit in units]
+
+    if chunks_per_worker is not None:
+        chunks = make_chunks(unit_costs, num_workers, chunks_per_worker)
+    else:
+        chunks = [[operation.original_index for operation in device.operations]
+                  for device in get_multi_device_heuristic_order(
+                num_workers, [Operation(cost, u) for u, cost in enumerate(unit_costs)], speeds)]
+    return [sorted(i for u in chunk for i in units[u]) for chunk in chunks if chunk]
+
+
+def terminate_workers(pool: ProcessPoolExecutor) -> None:
+    """
+    Terminate the worker processes of a pool, stopping the tasks they are running.
+
+    Uses `ProcessPoolExecutor.terminate_workers` where available (Python 3.14+),
+    otherwise terminates the worker processes directly and waits until they are gone.
+    Must be called before `shutdown`, which forgets the worker processes.
+    The pool is unusable afterward.
+
+    :param pool: The process pool.
+    """
+
+    if (terminate := getattr(pool, "terminate_workers", None)) is not None:
+        terminate()
+        return
+    processes = list((getattr(pool, "_processes", None) or dict()).values())
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join()
+
+
+def stop_pool(pool: Executor) -> None:
+    """
+    Shut a pool down at once: cancel the tasks not started yet and terminate the process workers running tasks.
+
+    Threads, sub-interpreters and node daemons cannot be stopped from outside; their running tasks finish
+    (within the time limits of their solvers) and their results are discarded.
+
+    :param pool: The pool.
+    """
+
+    if isinstance(pool, ProcessPoolExecutor):
+        terminate_workers(pool)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def new_pool(backend: ExecutionBackend, workers: int, initializer: Optional[Callable[..., None]] = None,
+             initargs: Tuple = (), nodes: Optional[Sequence[str]] = None) -> Executor:
+    """
+    Create the pool of a parallel backend.
+
+    :param backend: The backend: THREAD, PROCESS, INTERPRETER (which must be supported, see `interpreters_supported`)
+                    or DISTRIBUTED.
+    :param workers: The number of workers.
+    :param initializer: A function every worker calls on start, e.g., `pin_to_cpu`.
+    :param initargs: The arguments of the initializer.
+    :param nodes: The "host:port" addresses of the node daemons of the DISTRIBUTED backend,
+                  of which the first `workers` are used.
+    :raises ValueError: If the backend has no pool, or DISTRIBUTED has no nodes.
+    :return: The pool.
+    """
+
+    if backend == ExecutionBackend.THREAD:
+        return ThreadPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+    elif backend == ExecutionBackend.PROCESS:
+        return ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+    elif backend == ExecutionBackend.INTERPRETER:
+        return InterpreterPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+    elif backend == ExecutionBackend.DISTRIBUTED:
+        if not nodes:
+            raise ValueError("The DISTRIBUTED execution backend needs the addresses of its nodes")
+        return NodePool(nodes[:workers], initializer=initializer, initargs=initargs)
+    else:
+        raise ValueError(f"Execution backend {backend} has no pool")
+
+
+@dataclass(frozen=True)
+class ExecutionReport:
+    """Timing summary of one parallel `ParallelExecutor.execute` call."""
+
+    mode: ExecutionMode
+    num_workers: int
+    makespan: float  # seconds from the first submission to the last collected result
+    busy: Dict[int, float]  # worker id (see `run_worker_task_group`) -> seconds spent running tasks
+    speculative_launches: int = 0  # backup copies of straggling task groups
+    speculative_wins: int = 0  # task groups whose backup copy finished first
+    restarts: int = 0  # new pools started after workers died, to retry their tasks
+
+    @property
+    def idle(self) -> Dict[int, float]:
+        """
+        Get the idle time of every worker that ran tasks.
+
+        :return: A mapping of the worker id to its idle time within the makespan, in seconds.
+        """
+
+        return {worker: max(.0, self.makespan - busy) for worker, busy in self.busy.items()}
+
+    @property
+    def total_idle(self) -> float:
+        """
+        Get the idle time summed over all workers, including the workers that never received a task.
+
+        :return: The total idle time, in seconds.
+        """
+
+        return max(.0, self.num_workers * self.makespan - sum(self.busy.values()))
+
+
 class ParallelExecutor:
-    def __init__(self, order: List[List[int]], min_threshold: int, num_threads: int) -> None:
+    def __init__(self, order: List[List[int]], min_threshold: Optional[int], num_threads: int,
+                 mode: ExecutionMode = ExecutionMode.STATIC, costs: Optional[Sequence[float]] = None,
+                 chunks_per_worker: int = 4, speculation_factor: Optional[float] = None,
+                 speculation_poll: float = .05, planner: Optional[ExecutionPlanner] = None,
+                 memory: Optional[Sequence[float]] = None, memory_budget: Optional[float] = None,
+                 speeds: Optional[Sequence[float]] = None, cpus: Optional[Sequence[int]] = None,
+                 backend: Optional[ExecutionBackend] = None, nodes: Optional[Sequence[str]] = None,
+                 max_retries: int = 2, isolate_crashes: bool = False) -> None:
         """
         Initialize the ParallelExecutor with scheduling and execution parameters.
 
         :param order: A list of lists,
         where each inner list contains task indices defining the execution order for a thread.
-        :param min_threshold: The minimum number of tasks required to enable parallel execution.
+        :param min_threshold: The minimum number of tasks required to enable parallel execution;
+                              None lets the `planner` decide from the estimated costs.
         :param num_threads: The number of worker threads/processes to use for parallel execution.
+        :param mode: Whether the tasks follow the static `order` or are pulled dynamically (see `ExecutionMode`).
+        :param costs: The estimated cost of every task of the `order`, which orders and chunks the dynamic mode.
+        :param chunks_per_worker: The number of dynamic chunks per worker (see `make_chunks`).
+        :param speculation_factor: If set, a task group running this many times longer than its estimate
+                                   is re-executed on an idle worker (see `execute`); None disables speculation.
+        :param speculation_poll: The interval of the straggler checks, in seconds.
+        :param planner: The cost model used without `min_threshold`; defaults to a new `ExecutionPlanner`.
+        :param memory: The estimated peak memory of every task of the `order`, in bytes (see `estimate_memory`).
+        :param memory_budget: If set, tasks are started only while the memory of the running tasks stays within it,
+                              in bytes (see `execute`); None for no limit.
+        :param speeds: The relative speed of every worker, fastest first, which `order` was scheduled for
+                       (see `new_scheduler`) and which balances the affinity groups; None for identical workers.
+        :param cpus: The CPU of every worker, which its groups are pinned to (see `run_on_cpu`); None for no pinning.
+        :param backend: The backend of every batch, e.g., THREAD to share the data in memory without copies;
+                        None lets the `planner` or `min_threshold` decide (see `execute`).
+        :param nodes: The "host:port" address of the node daemon of every worker of the DISTRIBUTED backend
+                      (see `serve_node`), in the order of the workers of `order` and `speeds`.
+        :param max_retries: How many times a task is rerun after its worker died (see `WORKER_LOST`)
+                            before it is given up as FAILED.
+        :param isolate_crashes: Whether such tasks are rerun alone on their pool, so that a task crashing its worker
+                                again takes no other tasks along and the crashes are charged to it only.
         """
 
         self.order = order
         self.min_threshold = min_threshold
         self.num_threads = num_threads
+        self.mode = mode
+        self.costs = costs
+        self.chunks_per_worker = chunks_per_worker
+        self.speculation_factor = speculation_factor
+        self.speculation_poll = speculation_poll
+        self.planner = (planner or ExecutionPlanner()) if min_threshold is None else planner
+        self.memory = memory
+        self.memory_budget = memory_budget
+        self.speeds = speeds
+        self.cpus = cpus
+        self.backend = backend
+        self.nodes = nodes
+        self.max_retries = max_retries
+        self.isolate_crashes = isolate_crashes
+
+        self.token = CancellationToken()  # stops the running and all later calls once cancelled (see `cancel`)
+        self.deadline: Optional[float] = None  # `perf_counter` time at which the unfinished tasks are stopped
+
+        self.durations: List[Optional[float]] = list()  # wall time of every task of the last `execute` call
+        self.statuses: List[ExecutionStatus] = list()  # outcome of every task of the last call
+        self.status: Optional[ExecutionStatus] = None  # outcome of the last call: COMPLETED unless interrupted
+        self.report: Optional[ExecutionReport] = None  # timing summary of the last parallel `execute` call
+        self.plan: Optional[ExecutionPlan] = None  # decision of the planner for the last `execute` call
 
         self.validate_input()
 
-    def execute(self, tasks: List[Callable[[], T]]) -> List[Optional[T]]:
+    def cancel(self) -> None:
+        """
+        Stop the running call and all later calls, from any thread (see `CancellationToken`).
+
+        The tasks not started yet are cancelled and process workers are terminated at once (see `stop_pool`);
+        the calls return the results of the completed tasks and mark the others CANCELLED in `self.statuses`.
+        `execute` returns whole groups only, so the completed tasks of an unfinished group are lost;
+        `execute_stream` keeps every completed task.
+        """
+
+        self.token.cancel()
+
+    def execute(self, tasks: List[Callable[[], T]], costs: Optional[Sequence[float]] = None,
+                backups: Optional[List[Callable[[], T]]] = None,
+                affinity: Optional[Sequence[Optional[Hashable]]] = None,
+                memory: Optional[Sequence[float]] = None,
+                allotment: Optional[Sequence[int]] = None,
+                backend: Optional[ExecutionBackend] = None) -> List[Optional[T]]:
         """
         Execute a list of tasks, potentially in parallel based on configuration.
 
-        If the number of tasks is below `min_threshold` or `num_threads` is 1 or less,
-        tasks are run sequentially.
-        Otherwise, tasks are distributed to a process pool according to the `self.order` schedule.
-        Tasks not covered by the schedule are run sequentially as a fallback.
+        The backend and the number of workers are chosen by `_choose_backend`.
+        The tasks run in groups: the `self.order` schedule in the STATIC mode, cost-bounded chunks in the DYNAMIC mode
+        (see `make_chunks`), the groups of the `affinity` keys (see `group_by_affinity`), or single tasks,
+        longest first, while a `memory_budget` or a moldable `allotment` limits the running groups.
+        The groups are run by `_collect_groups`, `_collect_within_budget` or `_collect_speculatively`.
+        Tasks whose worker died are retried on a new pool, one per group, up to `max_retries` times;
+        tasks not covered by any group run sequentially afterwards.
+        `cancel` and the `deadline` stop the call early (see `cancel`).
+        The wall time of every task is stored in `self.durations`, its outcome in `self.statuses`,
+        and the timing summary of a parallel run in `self.report`.
 
         :param tasks: A list of callable tasks to be executed.
+        :param costs: The estimated cost of every task; defaults to `self.costs` if it covers all tasks,
+                      otherwise every task costs the mean of `self.costs` (or 1).
+        :param backups: The tasks run by speculative copies, e.g., with another solver configuration;
+                        defaults to `tasks`.
+        :param affinity: The affinity key of every task (None for no preference); None disables the routing.
+        :param memory: The estimated peak memory of every task in bytes; defaults like `costs` to `self.memory`.
+        :param allotment: The number of threads every task runs with; None for one thread each.
+                          The tasks themselves start their threads, the executor only reserves them.
+        :param backend: The backend of this batch; defaults to `self.backend`.
         :return: A list containing the results of the tasks, in the same order as the input tasks.
                   Each result can be of type T or None if the task failed or was not executed.
         """
 
-        if (num_tasks := len(tasks)) == 0:
+        self.durations = [None] * (num_tasks := len(tasks))
+        if num_tasks == 0:
+            self._record_statuses()
             return list()
 
-        # Do not parallelize if the number of tasks is lower than the threshold
-        if num_tasks < self.min_threshold or self.num_threads <= 1:
-            return list(map(lambda task: task(), tasks))
+        costs = self._resolve_per_task(costs, self.costs, num_tasks)
+        admitted = self.memory_budget is not None or any(threads > 1 for threads in allotment or ())
+        # Admitted tasks are submitted one by one; every group carries only its own tasks (see `bind_task_group`)
+        submissions_per_worker = self.chunks_per_worker if self.mode == ExecutionMode.DYNAMIC \
+            else -(-num_tasks // self.num_threads) if admitted and affinity is None else 1
+        backend, workers = self._choose_backend(
+            costs, lambda: len(dumps(tasks)) // min(num_tasks, self.num_threads * submissions_per_worker),
+            submissions_per_worker, backend)
+        if backend == ExecutionBackend.SEQUENTIAL:
+            results = [None] * num_tasks
+            for i, task in enumerate(tasks):
+                if self._interruption() is not None:
+                    break
+                start = perf_counter()
+                results[i] = task()
+                self.durations[i] = perf_counter() - start
+            self._record_statuses()
+            if self.planner is not None:
+                self.planner.observe(costs, self.durations)
+            return results
+
+        if affinity is not None:
+            groups = group_by_affinity(costs, affinity, workers,
+                                       self.chunks_per_worker if self.mode == ExecutionMode.DYNAMIC else None,
+                                       self._worker_speeds(workers))
+        elif self.mode == ExecutionMode.DYNAMIC:
+            groups = make_chunks(costs, workers, self.chunks_per_worker)
+        elif admitted:
+            groups = [[i] for i in sorted(range(num_tasks), key=lambda i: costs[i], reverse=True)]
+        else:
+            groups = [group for group in self.order if group]
+        cpus = list(self.cpus or ())[:len(groups)] if self.mode == ExecutionMode.STATIC else list()
+        cpus += [None] * (len(groups) - len(cpus))
 
-        all_results_map = dict()
-        with ProcessPoolExecutor(max_workers=self.num_threads) as pool:
-            run_task = partial(run_task_group, tasks, num_tasks)
-            future_to_group_results = [
-                pool.submit(run_task, group)  # type: ignore
-                for group in self.order if group
-            ]
+        all_results_map, crashes, failed, reports = dict(), [0] * num_tasks, set(), list()
+        speculative = self.speculation_factor is not None and not admitted and backend == ExecutionBackend.PROCESS
+        bind, start = partial(bind_task_group, tasks), perf_counter()
+        if admitted:
+            memory = self._resolve_per_task(memory, self.memory, num_tasks)
+        while True:
+            crashed: Set[int] = set()
+            if alone := bool(reports) and self.isolate_crashes:
+                group_memory, group_threads = [.0] * len(groups), [workers] * len(groups)  # runs by itself
+            elif admitted:
+                group_memory = [max((memory[i] for i in group if 0 <= i < num_tasks), default=.0) for group in groups]
+                group_threads = [min(workers, max((allotment[i] for i in group if 0 <= i < num_tasks), default=1))
+                                 if allotment is not None else 1 for group in groups]
+            pool = new_pool(backend, workers, nodes=self.nodes)
+            try:
+                if admitted or alone:
+                    self.report = self._collect_within_budget(pool, workers, groups, group_memory, group_threads,
+                                                              bind, all_results_map, start, crashed)
+                elif not speculative:
+                    self.report = self._collect_groups(pool, workers, groups, cpus, bind, all_results_map, start,
+                                                       crashed)
+                else:
+                    self.report = self._collect_speculatively(
+                        pool, workers,
+                        [self._submit_group(pool, t, cpus[t], bind, group) for t, group in enumerate(groups)],
+                        groups, [sum(costs[i] for i in group if 0 <= i < num_tasks) for group in groups],
+                        partial(bind_task_group, backups or tasks), all_results_map, start, crashed)
+            finally:
+                if self._interruption() is not None:
+                    stop_pool(pool)
+                else:
+                    pool.shutdown(cancel_futures=True)
+            reports.append(self.report)
 
-            for future in future_to_group_results:
-                all_results_map.update(future.result())
+            # The unfinished tasks lost their worker: retry them one per group, longest first, on a new pool
+            unfinished = [i for group in groups for i in group if 0 <= i < num_tasks and i not in all_results_map]
+            if self._interruption() is not None or not unfinished:
+                break
+            for i in crashed.intersection(unfinished) or unfinished:
+                crashes[i] += 1
+            failed.update(i for i in unfinished if crashes[i] > self.max_retries)
+            if not (groups := [[i] for i in sorted(unfinished, key=lambda i: costs[i], reverse=True)
+                               if i not in failed]):
+                break
+            cpus = [None] * len(groups)
+        busy = dict()
+        for report in reports:
+            for worker, seconds in report.busy.items():
+                busy[worker] = busy.get(worker, .0) + seconds
+        self.report = ExecutionReport(self.mode, workers, perf_counter() - start, busy,
+                                      sum(report.speculative_launches for report in reports),
+                                      sum(report.speculative_wins for report in reports), len(reports) - 1)
+        if self.planner is not None:
+            self.planner.observe(costs, [all_results_map[i][1] if i in all_results_map else None
+                                         for i in range(num_tasks)])
 
         results: List[Optional[T]] = [None] * num_tasks
         for i in range(num_tasks):
             if i in all_results_map:
-                results[i] = all_results_map.get(i)
-            else:
+                results[i], self.durations[i] = all_results_map.get(i)
+            elif i not in failed and self._interruption() is None:
                 # This task was not in any scheduled group, run sequentially as a fallback.
                 # This might happen if "get_order" does not cover all indices.
                 # Or if the schedule is faulty.
                 # For safety, execute tasks not covered by the schedule.
+                start = perf_counter()
                 try:
                     results[i] = tasks[i]()
                 except Exception as exception:
                     results[i] = None
                     print(f"[SEQ] Task {i} failed to execute: {exception}")
+                self.durations[i] = perf_counter() - start
+
+        self._record_statuses(failed)
+        return results
+
+    async def execute_async(self, tasks: List[Callable[[], T]], costs: Optional[Sequence[float]] = None,
+                            pool: Optional[Executor] = None,
+                            backend: Optional[ExecutionBackend] = None) -> AsyncIterator[Tuple[int, Optional[T]]]:
+        """
+        Execute a list of tasks without blocking the event loop, yielding every result as soon as its task completes.
+
+        Tasks are submitted one by one, longest first by `costs`, with at most one task in flight per worker,
+        to `pool` if given, which many concurrent calls may share (e.g., the `coordinate_async` of several centers),
+        or otherwise to a pool of the backend chosen as in `execute`, which this call owns;
+        the SEQUENTIAL backend runs the tasks one at a time on the default executor of the loop.
+        Cancelling the consuming task (or closing the iterator early) stops the submission and cancels the tasks
+        not started yet; the tasks still running finish in their workers and their results are discarded.
+        The static `order`, affinity, memory budget, thread allotment and speculation of `execute` are not applied.
+        The wall time of every completed task is stored in `self.durations`.
+        `cancel` and the `deadline` end the iteration early, as in `execute`; the workers of a shared `pool`
+        are not terminated, only the tasks of this call that have not started are cancelled.
+        Tasks whose worker died are retried as in `execute_graph_stream`, on a new pool if the pool of this call
+        is broken; a broken shared `pool` is not replaced, and the call raises its `BrokenExecutor`.
+
+        :param tasks: A list of callable tasks to be executed.
+        :param costs: The estimated cost of every task (see `execute`).
+        :param pool: The pool to run the tasks on, of `num_threads` workers; None to create one for this call.
+        :param backend: The backend of the pool created for this call; defaults to `self.backend`.
+        :return: An asynchronous iterator of the index and the result (None if the task failed) of every task,
+                 in the order of completion.
+        """
+
+        self.durations = [None] * (num_tasks := len(tasks))
+        if num_tasks == 0:
+            self._record_statuses()
+            return
+
+        costs = self._resolve_per_task(costs, self.costs, num_tasks)
+        workers, owned = self.num_threads, None
+        if pool is None:
+            backend, workers = self._choose_backend(costs, lambda: len(dumps(tasks)) // num_tasks,
+                                                    -(-num_tasks // self.num_threads), backend)
+            if backend != ExecutionBackend.SEQUENTIAL:
+                pool = owned = new_pool(backend, workers, nodes=self.nodes)
+
+        loop = get_running_loop()
+        interrupted = wrap_future(self.token.future, loop=loop)
+        pending = sorted(range(num_tasks), key=lambda i: costs[i])  # the longest task is last, so taking it is cheap
+        running, crashes, failed, isolated = dict(), [0] * num_tasks, set(), False
+        try:
+            while (pending or running) and self._interruption() is None:
+                while pending and len(running) < workers and not isolated:
+                    if self.isolate_crashes and crashes[pending[-1]] and running:
+                        break  # the retried task runs by itself once the running tasks are done
+                    i = pending.pop()
+                    try:
+                        future = loop.run_in_executor(pool, run_graph_task, tasks[i], i, ())
+                    except BrokenExecutor:
+                        if owned is None:
+                            raise  # the pool of the caller is not replaced
+                        owned.shutdown(wait=False)
+                        pool = owned = new_pool(backend, workers, nodes=self.nodes)
+                        future = loop.run_in_executor(pool, run_graph_task, tasks[i], i, ())
+                    running[future] = i
+                    isolated = self.isolate_crashes and crashes[i] > 0
+                finished, _ = await wait_async({*running, interrupted}, timeout=self._remaining(),
+                                               return_when=FIRST_COMPLETED)
+                for future in finished - {interrupted}:
+                    i, isolated = running.pop(future), False
+                    try:
+                        _, self.durations[i], result = future.result()
+                    except WORKER_LOST:
+                        crashes[i] += 1
+                        if crashes[i] <= self.max_retries:
+                            pending.append(i)
+                            continue
+                        failed.add(i)
+                        result = None
+                    yield i, result
+        finally:
+            for future in running:
+                future.cancel()
+            if owned is not None and running:
+                stop_pool(owned)
+            elif owned is not None:
+                owned.shutdown(wait=False, cancel_futures=True)
+        self._record_statuses(failed)
+        if self.planner is not None:
+            self.planner.observe(costs, self.durations)
+
+    def execute_stream(self, tasks: List[Callable[[], T]], costs: Optional[Sequence[float]] = None,
+                       affinity: Optional[Sequence[Optional[Hashable]]] = None,
+                       memory: Optional[Sequence[float]] = None,
+                       allotment: Optional[Sequence[int]] = None,
+                       backend: Optional[ExecutionBackend] = None) -> Iterator[Tuple[int, Optional[T]]]:
+        """
+        Execute a list of tasks, yielding every result as soon as its task completes.
+
+        Unlike `execute`, which returns once every group is done, results are delivered per task, also within
+        the groups of the STATIC mode: the tasks of group t all run on worker t in turn (as the affinity key t,
+        see `execute_graph_stream`), so the `order` schedule is kept while every task reports on its own.
+        The DYNAMIC mode starts the tasks longest first on any free worker instead of in chunks;
+        speculation is not applied. Closing the iterator early cancels the tasks not started yet.
 
+        :param tasks: A list of callable tasks to be executed.
+        :param costs: The estimated cost of every task (see `execute`).
+        :param affinity: The affinity key of every task (see `execute`); defaults to the worker of `order` in the
+                         STATIC mode if `order` covers exactly the tasks, otherwise to none.
+        :param memory: The estimated peak memory of every task (see `execute`).
+        :param allotment: The number of threads of every task (see `execute`).
+        :param backend: The backend of this batch (see `execute`).
+        :return: An iterator of the index and the result (None if the task failed) of every task,
+                 in the order of completion.
+        """
+
+        workers = {i: t for t, group in enumerate(self.order) for i in group}
+        if affinity is None and self.mode == ExecutionMode.STATIC and sorted(workers) == list(range(len(tasks))):
+            affinity = [workers[i] for i in range(len(tasks))]
+        return self.execute_graph_stream(tasks, [()] * len(tasks), costs, affinity, memory, allotment, backend)
+
+    def execute_graph(self, tasks: List[Callable[..., T]], dependencies: Sequence[Sequence[int]],
+                      costs: Optional[Sequence[float]] = None,
+                      affinity: Optional[Sequence[Optional[Hashable]]] = None,
+                      memory: Optional[Sequence[float]] = None,
+                      allotment: Optional[Sequence[int]] = None,
+                      backend: Optional[ExecutionBackend] = None) -> List[Optional[T]]:
+        """
+        Execute tasks that depend on the results of other tasks.
+
+        Collects the results of `execute_graph_stream`, which describes the scheduling.
+
+        :param tasks: A list of callable tasks, each taking the results of its dependencies.
+        :param dependencies: The indices of the tasks every task depends on.
+        :param costs: The estimated cost of every task (see `execute`).
+        :param affinity: The affinity key of every task (None for no preference); None disables the routing.
+        :param memory: The estimated peak memory of every task (see `execute`).
+        :param allotment: The number of threads of every task (see `execute`).
+        :param backend: The backend of this batch (see `execute`).
+        :return: A list containing the results of the tasks, in the same order as the input tasks.
+        :raises AssertionError: If a dependency is not a task index or the dependencies contain a cycle.
+        """
+
+        results: List[Optional[T]] = [None] * len(tasks)
+        for i, result in self.execute_graph_stream(tasks, dependencies, costs, affinity, memory, allotment, backend):
+            results[i] = result
         return results
 
+    def execute_graph_stream(self, tasks: List[Callable[..., T]], dependencies: Sequence[Sequence[int]],
+                             costs: Optional[Sequence[float]] = None,
+                             affinity: Optional[Sequence[Optional[Hashable]]] = None,
+                             memory: Optional[Sequence[float]] = None,
+                             allotment: Optional[Sequence[int]] = None,
+                             backend: Optional[ExecutionBackend] = None) -> Iterator[Tuple[int, Optional[T]]]:
+        """
+        Execute tasks that depend on the results of other tasks, yielding every result as soon as its task completes.
+
+        Task i is called with the results of the tasks `dependencies[i]`, in that order, and starts as soon as
+        they are done, so, e.g., the chain of one element never waits for the other elements to finish a phase.
+        Ready tasks start by decreasing critical path (the largest cost of a chain from the task to the end
+        of the graph), with at most one task in flight per worker.
+        Process and sub-interpreter workers receive the tasks once, when they start (see `load_graph_tasks`),
+        and then only the index and the dependency results of every task.
+        With `affinity`, every worker is a pool of its own and all tasks with the same key run on the same worker
+        (see `group_by_affinity`), so, e.g., all phases of an element can share a `WorkerCache`;
+        with `cpus`, the worker of every pool is pinned to its CPU.
+        With `memory_budget` set, a ready task starts only if the memory of the running tasks stays within the budget,
+        otherwise the next ready task that fits goes first (see `_collect_within_budget`);
+        the same holds for the threads of moldable tasks (see `allotment` of `execute`).
+        The backend and the number of workers are chosen as in `execute`;
+        the `order` schedule, the dynamic chunks and speculation are for independent tasks and are not used.
+        A failed task yields None, which is passed on to the tasks depending on it.
+        A task whose worker died (see `WORKER_LOST`) is retried, on a new pool if the old one is broken,
+        at most `max_retries` times, and by itself on its pool with `isolate_crashes`;
+        it then yields None like a failed task and is FAILED in `self.statuses`.
+        The wall time of every task is stored in `self.durations` and the timing of a parallel run in `self.report`
+        once the iterator is exhausted. `cancel` and the `deadline` end the iteration early, as in `execute`,
+        and so does closing the iterator; the workers are then stopped at once (see `stop_pool`).
+
+        :param tasks: A list of callable tasks, each taking the results of its dependencies.
+        :param dependencies: The indices of the tasks every task depends on.
+        :param costs: The estimated cost of every task (see `execute`).
+        :param affinity: The affinity key of every task (None for no preference); None disables the routing.
+        :param memory: The estimated peak memory of every task (see `execute`).
+        :param allotment: The number of threads of every task (see `execute`).
+        :param backend: The backend of this batch (see `execute`).
+        :return: An iterator of the index and the result (None if the task failed) of every task,
+                 in the order of completion.
+        :raises AssertionError: If a dependency is not a task index or the dependencies contain a cycle.
+        """
+
+        self.durations = [None] * (num_tasks := len(tasks))
+        assert len(dependencies) == num_tasks, "Every task must have its dependencies"
+        if num_tasks == 0:
+            self._record_statuses()
+            return
+
+        costs = self._resolve_per_task(costs, self.costs, num_tasks)
+        memory = self._resolve_per_task(memory, self.memory, num_tasks)
+        successors: List[List[int]] = [list() for _ in range(num_tasks)]
+        for i, required in enumerate(dependencies):
+            for j in required:
+                assert_bounds(j, (0, num_tasks - 1), f"dependencies[{i}]")
+                successors[j].append(i)
+
+        waiting = [len(required) for required in dependencies]
+        topological, remaining = [i for i in range(num_tasks) if not waiting[i]], list(waiting)
+        for i in topological:
+            for successor in successors[i]:
+                remaining[successor] -= 1
+                if not remaining[successor]:
+                    topological.append(successor)
+        assert len(topological) == num_tasks, "The task dependencies must not contain a cycle"
+
+        priority = list(costs)
+        for i in reversed(topological):
+            priority[i] = costs[i] + max((priority[successor] for successor in successors[i]), default=.0)
+
+        backend, workers = self._choose_backend(costs, lambda: len(dumps(tasks)) // num_tasks,
+                                                -(-num_tasks // self.num_threads), backend)
+        lanes = [0] * num_tasks  # the pool of every task: its worker with affinity, a shared pool otherwise
+        if sticky := affinity is not None and backend != ExecutionBackend.SEQUENTIAL:
+            for lane, group in enumerate(group_by_affinity(costs, affinity, workers,
+                                                           speeds=self._worker_speeds(workers))):
+                for i in group:
+                    lanes[i] = lane
+        pool_workers = [1] * workers if sticky else [workers]
+        lane_cpus = list(self.cpus or ())[:workers] if sticky else list()
+        lane_cpus += [None] * (len(pool_workers) - len(lane_cpus))
+        nodes = list(self.nodes or ())
+        lane_nodes = [nodes[lane:lane + 1] for lane in range(workers)] if sticky else [nodes]
+
+        ready: List[List[Tuple[float, int]]] = [list() for _ in pool_workers]
+        for i in range(num_tasks):
+            if not waiting[i]:
+                ready[lanes[i]].append((-priority[i], i))
+        for lane_ready in ready:
+            heapify(lane_ready)
+
+        results: List[Optional[T]] = [None] * num_tasks
+        crashes, failed = [0] * num_tasks, set()  # the workers each task lost, the tasks given up (see `max_retries`)
+
+        def complete(index: int) -> None:
+            """Release the successors of a finished task whose dependencies are all done."""
+
+            for successor in successors[index]:
+                waiting[successor] -= 1
+                if not waiting[successor]:
+                    heappush(ready[lanes[successor]], (-priority[successor], successor))
+
+        if backend == ExecutionBackend.SEQUENTIAL:
+            while ready[0] and self._interruption() is None:
+                _, i = heappop(ready[0])
+                _, self.durations[i], results[i] = run_graph_task(tasks[i], i, [results[j] for j in dependencies[i]])
+                complete(i)
+                yield i, results[i]
+        else:
+            loaded = backend in (ExecutionBackend.PROCESS, ExecutionBackend.INTERPRETER)
+
+            def spawn(lane: int) -> Executor:
+                """Start the pool of a lane, again once its workers died."""
+
+                if loaded:
+                    return new_pool(backend, pool_workers[lane], load_graph_tasks, (lane_cpus[lane], tasks),
+                                    lane_nodes[lane])
+                return new_pool(backend, pool_workers[lane], pin_to_cpu, (lane_cpus[lane],), lane_nodes[lane])
+
+            pools = [spawn(lane) for lane in range(len(pool_workers))]
+            try:
+                start, running, busy, restarts = perf_counter(), dict(), dict(), 0
+                in_flight, used, reserved = [0] * len(pools), .0, 0
+                threads = [min(workers, k) for k in allotment or [1] * num_tasks]
+                isolated = [False] * len(pools)  # whether a retried task runs by itself on the pool
+                while (any(ready) or running) and self._interruption() is None:
+                    for lane, pool in enumerate(pools):
+                        skipped = list()
+                        while ready[lane] and in_flight[lane] < pool_workers[lane] and not isolated[lane]:
+                            _, i = entry = heappop(ready[lane])
+                            if self.isolate_crashes and crashes[i] and in_flight[lane]:
+                                skipped.append(entry)  # the pool drains first
+                                break
+                            if running and (reserved + threads[i] > workers or self.memory_budget is not None
+                                            and used + memory[i] > self.memory_budget):
+                                skipped.append(entry)
+                                continue
+                            arguments = [results[j] for j in dependencies[i]]
+                            submission = (run_loaded_task, i, arguments) if loaded \
+                                else (run_graph_task, tasks[i], i, arguments)
+                            try:
+                                running[pool.submit(*submission)] = i
+                            except BrokenExecutor:
+                                pool.shutdown(wait=False)
+                                pools[lane] = pool = spawn(lane)
+                                restarts += 1
+                                running[pool.submit(*submission)] = i
+                            in_flight[lane] += 1
+                            used += memory[i]
+                            reserved += threads[i]
+                            isolated[lane] = self.isolate_crashes and crashes[i] > 0
+                        for entry in skipped:
+                            heappush(ready[lane], entry)
+                    for future in self._wait(running):
+                        i = running.pop(future)
+                        in_flight[lanes[i]] -= 1
+                        isolated[lanes[i]] = False
+                        used -= memory[i]
+                        reserved -= threads[i]
+                        try:
+                            worker, self.durations[i], results[i] = future.result()
+                        except WORKER_LOST:
+                            crashes[i] += 1
+                            if crashes[i] <= self.max_retries:
+                                heappush(ready[lanes[i]], (-priority[i], i))
+                                continue
+                            failed.add(i)  # given up: its dependents receive None, as from a failed task
+                        else:
+                            busy[worker] = busy.get(worker, .0) + self.durations[i]
+                        complete(i)
+                        yield i, results[i]
+                self.report = ExecutionReport(self.mode, workers, perf_counter() - start, busy, restarts=restarts)
+            finally:
+                for pool in pools:
+                    if running:
+                        stop_pool(pool)
+                    else:
+                        pool.shutdown(cancel_futures=True)
+
+        self._record_statuses(failed)
+        if self.planner is not None:
+            self.planner.observe(costs, self.durations)
+
+    @staticmethod
+    def _submit_group(pool: Executor, worker: int, cpu: Optional[int], bind: Callable[[List[int]], Callable[[], Tuple]],
+                      group: List[int]) -> Future:
+        """
+        Submit a group of the STATIC mode to its worker.
+
+        The group is pinned to the CPU of its worker, so it runs at the speed it was scheduled for;
+        on the DISTRIBUTED backend, it runs on the node of its worker instead.
+
+        :param pool: The pool.
+        :param worker: The worker the group was scheduled for.
+        :param cpu: The CPU of the worker, None for no pinning (see `run_on_cpu`).
+        :param bind: Binds a group to the callable running it, like `bind_task_group`.
+        :param group: The task indices of the group.
+        :return: The future of the group, on the node of the worker for a `NodePool`.
+        """
+
+        if isinstance(pool, NodePool):
+            return pool.submit_to(worker, bind(group))
+        return pool.submit(run_on_cpu, cpu, bind(group))
+
+    def _interruption(self) -> Optional[ExecutionStatus]:
+        """
+        Check whether the running call has to stop.
+
+        :return: CANCELLED after `cancel`, TIMED_OUT past the `deadline`, None otherwise.
+        """
+
+        if self.token.cancelled:
+            return ExecutionStatus.CANCELLED
+        if self.deadline is not None and perf_counter() >= self.deadline:
+            return ExecutionStatus.TIMED_OUT
+        return None
+
+    def _remaining(self) -> Optional[float]:
+        """
+        Get the time left until the `deadline`.
+
+        :return: The remaining seconds (at least 0), None without a deadline.
+        """
+
+        return None if self.deadline is None else max(.0, self.deadline - perf_counter())
+
+    def _wait(self, futures: Iterable[Future], timeout: Optional[float] = None) -> Set[Future]:
+        """
+        Wait until one of the futures is done, the call is cancelled, or the `deadline` passes.
+
+        :param futures: The futures.
+        :param timeout: The longest wait in seconds, None to wait without a limit besides the `deadline`.
+        :return: The futures that are done; empty on an interruption (see `_interruption`) or a timeout.
+        """
+
+        if (remaining := self._remaining()) is not None:
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        finished, _ = wait([*futures, self.token.future], timeout, FIRST_COMPLETED)
+        finished.discard(self.token.future)
+        return finished
+
+    def _record_statuses(self, failed: Collection[int] = ()) -> None:
+        """
+        Store the outcome of every task of a call in `self.statuses` and of the call in `self.status`.
+
+        A task is COMPLETED if its duration was measured, and FAILED if it was given up after its worker died
+        on every attempt; the others were stopped by the interruption of the call (see `_interruption`),
+        or otherwise CANCELLED, e.g., by closing a stream early.
+        The call is COMPLETED if all tasks are, otherwise interrupted, FAILED or CANCELLED in this order.
+
+        :param failed: The tasks given up after their worker died (see `max_retries`).
+        """
+
+        stopped = self._interruption() or (ExecutionStatus.FAILED if failed else ExecutionStatus.CANCELLED)
+        self.statuses = [ExecutionStatus.COMPLETED if duration is not None else
+                         ExecutionStatus.FAILED if i in failed else stopped
+                         for i, duration in enumerate(self.durations)]
+        self.status = ExecutionStatus.COMPLETED if all(duration is not None for duration in self.durations) \
+            else stopped
+
+    def _worker_speeds(self, workers: int) -> Optional[List[float]]:
+        """
+        Get the speeds of the workers of a batch.
+
+        :param workers: The number of workers of the batch.
+        :return: The speeds of the first `workers` workers, None for identical or unknown speeds.
+        """
+
+        return list(self.speeds[:workers]) if self.speeds is not None and len(self.speeds) >= workers else None
+
+    @staticmethod
+    def _resolve_per_task(values: Optional[Sequence[float]], defaults: Optional[Sequence[float]],
+                          num_tasks: int) -> Sequence[float]:
+        """
+        Get an estimate (e.g., the cost) of every task of a batch.
+
+        :param values: The estimates given for the batch, if any.
+        :param defaults: The estimates of the `order` tasks (e.g., `self.costs`), if any.
+        :param num_tasks: The number of tasks of the batch.
+        :return: `values` if given, otherwise `defaults` if they cover all tasks,
+                 otherwise the mean of `defaults` (or 1) for every task.
+        """
+
+        if values is not None:
+            return values
+        if defaults is not None and len(defaults) == num_tasks:
+            return defaults
+        return [sum(defaults) / len(defaults) if defaults else 1.] * num_tasks
+
+    def _choose_backend(self, costs: Sequence[float], payload_bytes: Callable[[], int],
+                        submissions_per_worker: int,
+                        backend: Optional[ExecutionBackend] = None) -> Tuple[ExecutionBackend, int]:
+        """
+        Choose the backend and the number of workers of a batch.
+
+        Without a requested backend and `min_threshold`, the `planner` weighs the estimated work against the startup
+        and transfer costs of the pools; the decision and its reasoning are stored in `self.plan` on every path.
+
+        :param costs: The estimated cost of every task.
+        :param payload_bytes: Computes the pickled size of one process submission (see `ExecutionPlanner.plan`).
+        :param submissions_per_worker: The number of submissions per process worker.
+        :param backend: The backend requested for the batch; defaults to `self.backend`.
+        :return: The requested backend with `num_threads` workers (sequential execution if `num_threads` is 1,
+                 processes if sub-interpreters are requested but not supported, see `interpreters_supported`,
+                 and at most one worker per node on the DISTRIBUTED backend);
+                 without a request, the plan of the `planner` without `min_threshold`; otherwise sequential execution
+                 if the number of tasks is below `min_threshold` or `num_threads` is 1 or less,
+                 and a process pool with `num_threads` workers if not.
+        """
+
+        if (requested := backend or self.backend) is not None:
+            backend = requested
+            if self.num_threads <= 1:
+                backend = ExecutionBackend.SEQUENTIAL
+            elif backend == ExecutionBackend.INTERPRETER and not interpreters_supported():
+                backend = ExecutionBackend.PROCESS
+            workers = 1 if backend == ExecutionBackend.SEQUENTIAL else self.num_threads
+            if backend == ExecutionBackend.DISTRIBUTED:
+                workers = min(workers, len(self.nodes or ()))
+            reason = f"{len(costs)} tasks: {requested.name.lower()} requested, {backend.name.lower()} x{workers}"
+            self.plan = ExecutionPlan(backend, workers, dict(), reason)
+            return backend, workers
+        if self.min_threshold is None:
+            self.plan = self.planner.plan(costs, self.num_threads, payload_bytes, submissions_per_worker)
+            return self.plan.backend, self.plan.workers
+        if len(costs) < self.min_threshold or self.num_threads <= 1:
+            # Do not parallelize if the number of tasks is lower than the threshold
+            backend, workers = ExecutionBackend.SEQUENTIAL, 1
+        else:
+            backend, workers = ExecutionBackend.PROCESS, self.num_threads
+        reason = (f"{len(costs)} tasks, min_threshold {self.min_threshold}, {self.num_threads} threads: "
+                  f"{backend.name.lower()} x{workers}")
+        self.plan = ExecutionPlan(backend, workers, dict(), reason)
+        return backend, workers
+
+    def _collect_groups(self, pool: Executor, num_workers: int, groups: List[List[int]], cpus: List[Optional[int]],
+                        bind: Callable[[List[int]], Callable[[], Tuple]], all_results_map: Dict[int, Tuple],
+                        start: float, crashed: Set[int]) -> ExecutionReport:
+        """
+        Run task groups on the workers they were scheduled for (see `_submit_group`) and collect their results.
+
+        :param pool: The pool.
+        :param num_workers: The number of workers of the pool.
+        :param groups: The task indices of every group; group t belongs to worker t.
+        :param cpus: The CPU of the worker of every group, None for no pinning.
+        :param bind: Binds a group to the callable running it, like `bind_task_group`.
+        :param all_results_map: The results by task index, filled in place.
+        :param start: The time of the first submission (`perf_counter`).
+        :param crashed: The tasks of the groups whose worker died (see `WORKER_LOST`), filled in place.
+        :return: The execution report.
+        """
+
+        busy = dict()
+        running = {self._submit_group(pool, t, cpus[t], bind, group): t for t, group in enumerate(groups)}
+        while running and (finished := self._wait(running)):
+            for future in finished:
+                t = running.pop(future)
+                try:
+                    worker, seconds, group_results = future.result()
+                except WORKER_LOST:
+                    crashed.update(groups[t])
+                    continue
+                busy[worker] = busy.get(worker, .0) + seconds
+                all_results_map.update(group_results)
+        return ExecutionReport(self.mode, num_workers, perf_counter() - start, busy)
+
+    def _collect_within_budget(self, pool: Executor, num_workers: int, groups: List[List[int]],
+                               group_memory: List[float], group_threads: List[int],
+                               bind: Callable[[List[int]], Callable[[], Tuple]],
+                               all_results_map: Dict[int, Tuple], start: float, crashed: Set[int]) -> ExecutionReport:
+        """
+        Run task groups so that the memory of the running groups never exceeds `memory_budget` (if set)
+        and their threads never exceed the workers.
+
+        Groups start in their order whenever their threads are free and the group fits into the remaining budget;
+        a group that does not fit waits, while later groups that fit start first (backfilling).
+        A group larger than the whole budget runs once nothing else is running.
+        Groups are not pinned to CPUs, since they start on whichever worker is free, and not run speculatively.
+        Once the pool is broken, no further group starts; `execute` retries them on a new pool.
+
+        :param pool: The pool.
+        :param num_workers: The number of workers of the pool.
+        :param groups: The task indices of every group, in priority order.
+        :param group_memory: The estimated peak memory of every group, in bytes.
+        :param group_threads: The number of threads of every group, at most `num_workers`.
+        :param bind: Binds a group to the callable running it, like `bind_task_group`.
+        :param all_results_map: The results by task index, filled in place.
+        :param start: The time of the first submission (`perf_counter`).
+        :param crashed: The tasks of the groups whose worker died (see `WORKER_LOST`), filled in place.
+        :return: The execution report.
+        """
+
+        pending = list(reversed(range(len(groups))))  # the next group is last, so starting it is cheap
+        running: Dict[Future, int] = dict()
+        used, threads, busy = .0, 0, dict()
+        while pending or running:
+            position = len(pending) - 1
+            while position >= 0 and threads < num_workers:
+                g = pending[position]
+                if not running or (threads + group_threads[g] <= num_workers and (
+                        self.memory_budget is None or used + group_memory[g] <= self.memory_budget)):
+                    try:
+                        running[pool.submit(bind(groups[g]))] = g
+                    except BrokenExecutor:
+                        pending.clear()
+                        break
+                    pending.pop(position)
+                    used += group_memory[g]
+                    threads += group_threads[g]
+                position -= 1
+
+            if not running or not (finished := self._wait(running)):
+                break
+            for future in finished:
+                used -= group_memory[g := running.pop(future)]
+                threads -= group_threads[g]
+                try:
+                    worker, seconds, group_results = future.result()
+                except WORKER_LOST:
+                    crashed.update(groups[g])
+                    continue
+                busy[worker] = busy.get(worker, .0) + seconds
+                all_results_map.update(group_results)
+
+        return ExecutionReport(self.mode, num_workers, perf_counter() - start, busy)
+
+    def _collect_speculatively(self, pool: ProcessPoolExecutor, num_workers: int, futures: List[Future],
+                               groups: List[List[int]], group_costs: List[float],
+                               bind_backup: Callable[[List[int]], Callable[[], Tuple]],
+                               all_results_map: Dict[int, Tuple], start: float, crashed: Set[int]) -> ExecutionReport:
+        """
+        Collect the results of task groups and re-execute stragglers speculatively.
+
+        Used with `speculation_factor` on process pools, unless the running groups are limited
+        (see `_collect_within_budget`).
+        Finished groups calibrate the scale from estimated costs to seconds (the median ratio).
+        Once fewer groups remain than there are workers, a running group that exceeds
+        `speculation_factor` times its scaled estimate gets one backup copy on an idle worker.
+        The first copy to finish wins; the other one is cancelled if it has not started yet.
+        Copies still running once all groups are done are stopped by terminating the workers.
+        A group whose copies all lost their worker is done without results; `execute` retries it on a new pool.
+
+        :param pool: The process pool.
+        :param num_workers: The number of workers of the pool.
+        :param futures: The future of every group.
+        :param groups: The task indices of every group.
+        :param group_costs: The estimated cost of every group.
+        :param bind_backup: Binds a backup copy of a group to the callable running it, like `bind_task_group`.
+        :param all_results_map: The results by task index, filled in place.
+        :param start: The time of the first submission (`perf_counter`).
+        :param crashed: The tasks of the groups whose worker died (see `WORKER_LOST`), filled in place.
+        :return: The execution report.
+        """
+
+        owners = {future: g for g, future in enumerate(futures)}
+        copies: Dict[int, List[Future]] = {g: [future] for g, future in enumerate(futures)}
+        started: Dict[Future, float] = dict()
+        busy, ratios, losers, launches, wins, done = dict(), list(), list(), 0, 0, set()
+
+        while len(done) < len(groups) and self._interruption() is None:
+            finished = self._wait(owners, self.speculation_poll)
+            now = perf_counter()
+            for future in finished:
+                if (g := owners.pop(future, None)) is None or g in done or future.cancelled():
+                    continue
+                try:
+                    worker, seconds, group_results = future.result()
+                except WORKER_LOST:
+                    if not any(other in owners for other in copies[g]):
+                        crashed.update(groups[g])
+                        done.add(g)
+                    continue
+                busy[worker] = busy.get(worker, .0) + seconds
+                all_results_map.update(group_results)
+                done.add(g)
+                wins += future is not copies[g][0]
+                if group_costs[g] > 0:
+                    ratios.append(seconds / group_costs[g])
+                for other in copies[g]:
+                    if other is not future and owners.pop(other, None) is not None and not other.cancel():
+                        losers.append(other)
+
+            for future in owners:
+                if future not in started and future.running():
+                    started[future] = now
+
+            remaining = len(groups) - len(done)
+            if not ratios or remaining >= num_workers or len(owners) >= num_workers:
+                continue
+            scale = median(ratios)
+            for future, g in list(owners.items()):
+                if len(copies[g]) > 1 or future not in started or len(owners) >= num_workers:
+                    continue
+                if now - started[future] > self.speculation_factor * scale * group_costs[g]:
+                    try:
+                        backup = pool.submit(bind_backup(groups[g]))
+                    except BrokenExecutor:
+                        break
+                    copies[g].append(backup)
+                    owners[backup] = g
+                    launches += 1
+
+        if any(not future.done() for future in losers):
+            terminate_workers(pool)
+        return ExecutionReport(self.mode, num_workers, perf_counter() - start, busy, launches, wins)
+
     def validate_input(self) -> None:
         """
         Validate the input parameters provided during the executor’s initialization.
 
-        Checks if `min_threshold`, `num_threads`, and the length of `order` are positive.
+        Checks if `min_threshold` (if set), `num_threads`, `chunks_per_worker`, `speculation_factor` (if set),
+        `memory_budget` (if set), the `speeds` (if set), the number of `nodes` (of the DISTRIBUTED backend)
+        and the length of `order` are positive, and `max_retries` is non-negative.
         It also ensures all task IDs within the `order` schedule are non-negative.
         Raises an AssertionError if any validation fails.
         """
 
-        assert_positive(self.min_threshold, "min_threshold")
+        if self.min_threshold is not None:
+            assert_positive(self.min_threshold, "min_threshold")
         assert_positive(self.num_threads, "num_threads")
+        assert_positive(self.chunks_per_worker, "chunks_per_worker")
+        if self.speculation_factor is not None:
+            assert_positive(self.speculation_factor, "speculation_factor")
+        if self.memory_budget is not None:
+            assert_positive(self.memory_budget, "memory_budget")
+        for speed in self.speeds or ():
+            assert_positive(speed, "speed")
+        if self.backend == ExecutionBackend.DISTRIBUTED:
+            assert_positive(len(self.nodes or ()), "len(nodes)")
+        assert_non_negative(self.max_retries, "max_retries")
         assert_positive(len(self.order), "len(order)")
         for thread in self.order:
             for task_id in thread:
@@ -0,0 +1,358 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib import import_module
+from os import cpu_count
+from statistics import median
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+try:
+    from os import sched_getaffinity, sched_setaffinity
+except ImportError:
+    sched_getaffinity = sched_setaffinity = None
+
+try:
+    from sys import _is_gil_enabled
+except ImportError:
+    _is_gil_enabled = None
+
+try:
+    from concurrent.futures import InterpreterPoolExecutor
+except ImportError:
+    InterpreterPoolExecutor = None
+
+from comp.models import ExecutionBackend
+from comp.parallelization.core import EmpiricCoefficients, load_coefficients
+from comp.parallelization.nodes import NodePool
+from comp.utils import assert_non_negative, assert_positive
+
+# Seconds per unit of the default empiric coefficients for GLOP on a typical desktop core;
+# calibrated coefficients (see `fit_empiric`) estimate seconds directly
+DEFAULT_SECONDS_PER_UNIT = 1.5e-9
+
+# Iterations of the busy loop timed by `measure_cpu_speeds`, a few tens of milliseconds on a desktop core
+SPEED_PROBE_ITERATIONS = 500_000
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ExecutionOverheads:
+    """Measured costs of the execution backends, in seconds (see `measure_overheads`)."""
+
+    process_startup: float = .05  # start and shutdown of one pool worker process
+    process_task: float = 5e-4  # round trip of one task group to a worker process, without the payload
+    process_byte: float = 2e-9  # pickling and transfer of one byte of a task group
+    thread_startup: float = 1e-4  # start and shutdown of one pool thread
+    thread_task: float = 2e-5  # round trip of one task to a pool thread
+    thread_speedup: float = 0.  # share of the ideal speedup reached by threads; 0 for GIL-bound tasks
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """Decision of `ExecutionPlanner.plan`."""
+
+    backend: ExecutionBackend
+    workers: int
+    estimates: Dict[str, float]  # candidate, e.g., "process x4" -> estimated wall time in seconds
+    reason: str  # human-readable summary of the decision, for logging
+
+    def __str__(self) -> str:
+        """
+        Get the reasoning of the plan.
+
+        :return: The reason.
+        """
+
+        return self.reason
+
+
+def _measure_noop(payload: bytes = b"") -> int:
+    """
+    Do nothing but touch the payload; the probe task of `measure_overheads`.
+
+    :param payload: The payload sent to the worker.
+    :return: The payload size.
+    """
+
+    return len(payload)
+
+
+@lru_cache(maxsize=None)
+def measure_overheads(workers: int = 2, tasks: int = 32, payload_bytes: int = 1 << 20) -> ExecutionOverheads:
+    """
+    Measure the startup, round trip and transfer costs of process and thread pools on this machine.
+
+    The measurement takes a fraction of a second and is cached per process.
+    The thread speedup of the tasks cannot be measured with empty probes: it is taken as ideal on a free-threaded
+    interpreter (see `gil_enabled`) and as none otherwise, since the solvers hold the GIL.
+
+    :param workers: The number of pool workers of the measurement.
+    :param tasks: The number of empty probe tasks timed for the round trip.
+    :param payload_bytes: The size of the payload timed for the transfer.
+    :return: The measured overheads.
+    """
+
+    overheads = dict()
+    for name, pool_type in (("process", ProcessPoolExecutor), ("thread", ThreadPoolExecutor)):
+        start = perf_counter()
+        with pool_type(max_workers=workers) as pool:
+            list(pool.map(_measure_noop, [b""] * workers))
+        overheads[f"{name}_startup"] = (perf_counter() - start) / workers
+
+        with pool_type(max_workers=workers) as pool:
+            list(pool.map(_measure_noop, [b""] * workers))
+            start = perf_counter()
+            for _ in range(tasks):
+                pool.submit(_measure_noop).result()
+            overheads[f"{name}_task"] = (perf_counter() - start) / tasks
+            if name == "process":
+                start = perf_counter()
+                pool.submit(_measure_noop, bytes(payload_bytes)).result()
+                overheads["process_byte"] = max(.0, perf_counter() - start - overheads["process_task"]) / payload_bytes
+    overheads["thread_speedup"] = 0. if gil_enabled() else 1.
+
+    return ExecutionOverheads(**overheads)
+
+
+def _import_modules(names: Tuple[str, ...]) -> int:
+    """
+    Import modules; the probe task of `interpreters_supported`.
+
+    :param names: The module names.
+    :return: The number of imported modules.
+    """
+
+    for name in names:
+        import_module(name)
+    return len(names)
+
+
+@lru_cache(maxsize=None)
+def interpreters_supported(modules: Tuple[str, ...] = ("numpy", "ortools.linear_solver.pywraplp")) -> bool:
+    """
+    Check whether tasks can run on a sub-interpreter pool (`InterpreterPoolExecutor`, Python 3.14+).
+
+    Besides the pool itself, every extension module of the tasks must support per-interpreter GILs,
+    so a probe imports this package and the given modules in a sub-interpreter. The result is cached per process.
+
+    :param modules: The modules the tasks need in the sub-interpreters.
+    :return: True if the probe succeeded.
+    """
+
+    if InterpreterPoolExecutor is None:
+        return False
+    try:
+        with InterpreterPoolExecutor(max_workers=1) as pool:
+            pool.submit(_import_modules, modules).result()
+    except Exception:
+        return False
+    return True
+
+
+def gil_enabled() -> bool:
+    """
+    Check whether the interpreter runs with the global interpreter lock.
+
+    :return: False on a free-threaded build running without the GIL, True otherwise.
+    """
+
+    return _is_gil_enabled is None or _is_gil_enabled()
+
+
+def available_cpus() -> int:
+    """
+    Get the number of CPUs this process may run on.
+
+    :return: The size of the CPU affinity mask where supported, otherwise the CPU count.
+    """
+
+    return (len(sched_getaffinity(0)) if sched_getaffinity is not None else cpu_count()) or 1
+
+
+def usable_cpus() -> List[int]:
+    """
+    Get the CPUs this process may run on.
+
+    :return: The sorted ids of the CPU affinity mask where supported, otherwise all CPU ids.
+    """
+
+    return sorted(sched_getaffinity(0)) if sched_getaffinity is not None else list(range(cpu_count() or 1))
+
+
+def pin_to_cpu(cpu: Optional[int]) -> None:
+    """
+    Restrict the calling thread (the whole process in a pool worker process) to one CPU, where supported.
+
+    :param cpu: The CPU id; None leaves the affinity unchanged.
+    """
+
+    if cpu is not None and sched_setaffinity is not None:
+        sched_setaffinity(0, {cpu})
+
+
+def run_on_cpu(cpu: Optional[int], function: Callable[..., T], *args: Any) -> T:
+    """
+    Call a function on one CPU (see `pin_to_cpu`), e.g., a task group scheduled for the device of that CPU.
+
+    :param cpu: The CPU id; None runs the function wherever the operating system places it.
+    :param function: The function.
+    :param args: The arguments of the function.
+    :return: The result of the function.
+    """
+
+    pin_to_cpu(cpu)
+    return function(*args)
+
+
+def _speed_probe(cpu: Optional[int], iterations: int) -> float:
+    """
+    Time a fixed busy loop on one CPU; the probe task of `measure_cpu_speeds`.
+
+    :param cpu: The CPU id (see `pin_to_cpu`).
+    :param iterations: The number of loop iterations.
+    :return: The wall time of the loop in seconds.
+    """
+
+    pin_to_cpu(cpu)
+    start, accumulator = perf_counter(), 0
+    for i in range(iterations):
+        accumulator = (accumulator + i * i) % 1_000_003
+    return perf_counter() - start
+
+
+@lru_cache(maxsize=None)
+def measure_cpu_speeds(cpus: Tuple[int, ...], iterations: int = SPEED_PROBE_ITERATIONS) -> List[float]:
+    """
+    Measure the relative speeds of CPUs, e.g., performance and efficiency cores or cores shared with other load.
+
+    The same busy loop runs concurrently on every CPU, each in a pool worker process pinned to it,
+    so the measurement also reflects the load of the other processes of the machine.
+    The measurement takes a fraction of a second and is cached per process.
+
+    :param cpus: The CPU ids, e.g., a prefix of `usable_cpus`.
+    :param iterations: The number of loop iterations of the probe.
+    :return: The speed of every CPU relative to the fastest one (which gets 1), in the order of `cpus`.
+    """
+
+    assert_positive(len(cpus), "len(cpus)")
+    assert_positive(iterations, "iterations")
+
+    with ProcessPoolExecutor(max_workers=len(cpus)) as pool:
+        seconds = list(pool.map(_speed_probe, cpus, [iterations] * len(cpus)))
+    return [min(seconds) / duration for duration in seconds]
+
+
+@lru_cache(maxsize=None)
+def measure_node_speeds(nodes: Tuple[str, ...], iterations: int = SPEED_PROBE_ITERATIONS) -> List[float]:
+    """
+    Measure the relative speeds of node daemons (see `NodePool`) with the busy loop of `measure_cpu_speeds`.
+
+    :param nodes: The "host:port" addresses of the nodes.
+    :param iterations: The number of loop iterations of the probe.
+    :return: The speed of every node relative to the fastest one (which gets 1), in the order of `nodes`.
+    """
+
+    assert_positive(len(nodes), "len(nodes)")
+    assert_positive(iterations, "iterations")
+
+    with NodePool(nodes) as pool:
+        seconds = [future.result() for future in [pool.submit_to(slot, _speed_probe, None, iterations)
+                                                  for slot in range(len(nodes))]]
+    return [min(seconds) / duration for duration in seconds]
+
+
+def default_seconds_per_unit(coefficients: Optional[EmpiricCoefficients] = None) -> float:
+    """
+    Get the scale from empiric estimates to seconds before any task of the run has been timed.
+
+    :param coefficients: The empiric coefficients of the estimates; defaults to the calibration profile.
+    :return: `DEFAULT_SECONDS_PER_UNIT` for the default coefficients, 1 for calibrated ones.
+    """
+
+    return DEFAULT_SECONDS_PER_UNIT if (coefficients or load_coefficients()) == EmpiricCoefficients() else 1.
+
+
+@dataclass
+class ExecutionPlanner:
+    """
+    Cost model that decides how `ParallelExecutor` runs a batch of tasks.
+
+    The estimated task costs are converted to seconds and every candidate (sequential, and threads or processes
+    with 2 up to the allowed number of workers) gets an estimated wall time:
+    startup of the workers + max(work / effective workers, longest task) + round trips + payload transfer.
+    The fastest candidate wins; ties prefer fewer workers and the sequential run.
+    After each batch, `observe` recalibrates the cost-to-seconds scale from the measured durations.
+    """
+
+    seconds_per_unit: float = field(default_factory=default_seconds_per_unit)
+    overheads: Optional[ExecutionOverheads] = None  # measured on first use if None
+    max_workers: Optional[int] = None  # defaults to the available CPUs
+
+    def __post_init__(self) -> None:
+        """Validate the scale."""
+
+        assert_positive(self.seconds_per_unit, "seconds_per_unit")
+
+    def plan(self, costs: Sequence[float], num_threads: int, payload_bytes: Union[int, Callable[[], int]] = 0,
+             submissions_per_worker: int = 1) -> ExecutionPlan:
+        """
+        Choose the backend and the number of workers of a batch.
+
+        :param costs: The estimated cost of every task, in the units of `seconds_per_unit`.
+        :param num_threads: The configured upper bound of workers.
+        :param payload_bytes: The pickled size of one process submission, or a function computing it;
+                              the function is called only if a process pool could pay off.
+        :param submissions_per_worker: The number of task groups submitted per process worker.
+        :return: The plan.
+        """
+
+        assert_positive(num_threads, "num_threads")
+        for cost in costs:
+            assert_non_negative(cost, "cost")
+
+        overheads = self.overheads or measure_overheads()
+        seconds = [cost * self.seconds_per_unit for cost in costs]
+        total, longest, count = sum(seconds), max(seconds, default=.0), len(seconds)
+        limit = max(1, min(num_threads, count, self.max_workers or available_cpus()))
+
+        estimates = {"sequential": total}
+        candidates = {"sequential": (ExecutionBackend.SEQUENTIAL, 1)}
+        for workers in range(2, limit + 1):
+            effective = 1 + overheads.thread_speedup * (workers - 1)
+            estimates[f"thread x{workers}"] = (workers * overheads.thread_startup + max(total / effective, longest)
+                                               + count * overheads.thread_task / workers)
+            candidates[f"thread x{workers}"] = (ExecutionBackend.THREAD, workers)
+
+            process = workers * overheads.process_startup + max(total / workers, longest)
+            if process < total:
+                if callable(payload_bytes):
+                    payload_bytes = payload_bytes()
+                submissions = workers * submissions_per_worker
+                process += submissions * (overheads.process_task + payload_bytes * overheads.process_byte) / workers
+            estimates[f"process x{workers}"] = process
+            candidates[f"process x{workers}"] = (ExecutionBackend.PROCESS, workers)
+
+        best = min(estimates, key=lambda candidate: estimates[candidate])
+        backend, workers = candidates[best]
+        runner_up = min((candidate for candidate in estimates if candidates[candidate][0] != backend),
+                        key=lambda candidate: estimates[candidate], default=None)
+        reason = (f"{count} tasks, estimated work {total:.3g} s (longest {longest:.3g} s), up to {limit} workers: "
+                  f"{best} ({estimates[best]:.3g} s)")
+        if runner_up is not None:
+            reason += f" beats {runner_up} ({estimates[runner_up]:.3g} s)"
+        return ExecutionPlan(backend, workers, estimates, reason)
+
+    def observe(self, costs: Sequence[float], durations: Sequence[Optional[float]]) -> None:
+        """
+        Recalibrate the cost-to-seconds scale from measured task durations.
+
+        :param costs: The estimated cost of every task.
+        :param durations: The measured duration of every task in seconds, None where unknown.
+        """
+
+        ratios = [duration / cost for cost, duration in zip(costs, durations)
+                  if duration is not None and duration > 0 and cost > 0]
+        if ratios:
+            self.seconds_per_unit = median(ratios)
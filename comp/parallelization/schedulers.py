@@ -0,0 +1,230 @@
+from functools import partial
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import List, Optional, Sequence, Tuple, Union
+from warnings import warn
+
+from comp.models import SchedulerType
+from comp.parallelization.core import Device, Operation
+from comp.parallelization.heuristic import Scheduler, get_multi_device_heuristic_order, get_multi_device_order_A0
+
+# A subset of a Karmarkar–Karp partial partition: nothing, an operation, or the union of two subsets
+_Subset = Optional[Union[Operation, Tuple["_Subset", "_Subset"]]]
+
+
+def _to_devices(groups: List[List[Operation]], speeds: Optional[Sequence[float]] = None) -> List[Device]:
+    """
+    Create devices from groups of operations and set the operation times.
+
+    :param groups: The operations of every device.
+    :param speeds: The relative speed of every device; None for identical devices.
+    :return: The devices.
+    """
+
+    devices = [Device(group, speed) for group, speed in zip(groups, speeds or [1.] * len(groups))]
+    for device in devices:
+        device.update_operation_times()
+    return devices
+
+
+def _flatten(subset: _Subset) -> List[Operation]:
+    """
+    Collect the operations of a Karmarkar–Karp subset.
+
+    :param subset: The subset.
+    :return: Its operations.
+    """
+
+    operations, stack = list(), [subset]
+    while stack:
+        if isinstance(node := stack.pop(), Operation):
+            operations.append(node)
+        elif node is not None:
+            stack.extend(node)
+    return operations
+
+
+def get_multi_device_order_karmarkar_karp(threads: int, operations: List[Operation]) -> List[Device]:
+    """
+    Assign operations to devices with the Karmarkar–Karp largest differencing method.
+
+    Every operation starts as a partial partition into `threads` subsets (itself and empty ones).
+    The two partitions with the largest spread (largest minus smallest subset sum) are merged repeatedly,
+    joining the largest subset of one with the smallest subset of the other, until one partition remains.
+    Subsets are merged as trees in O(1), so a merge costs O(D log D) and the whole method O(T D log D).
+
+    :param threads: The number of threads (devices) to distribute the operations across.
+    :param operations: A list of Operation objects to be scheduled.
+    :return: A list of Device objects, each with its assigned operations and updated times.
+    """
+
+    if not operations:
+        return [Device() for _ in range(threads)]
+
+    tie = count()
+    partitions = [(-operation.duration, next(tie), [operation.duration] + [.0] * (threads - 1),
+                   [operation] + [None] * (threads - 1)) for operation in operations]
+    heapify(partitions)
+    while len(partitions) > 1:
+        _, _, first_sums, first_subsets = heappop(partitions)
+        _, _, second_sums, second_subsets = heappop(partitions)
+        merged = sorted(((first_sum + second_sum, (first_subset, second_subset))
+                         for first_sum, first_subset, second_sum, second_subset in zip(
+                first_sums, first_subsets, reversed(second_sums), reversed(second_subsets))),
+                        key=lambda subset: subset[0], reverse=True)
+        sums, subsets = [subset[0] for subset in merged], [subset[1] for subset in merged]
+        heappush(partitions, (sums[-1] - sums[0], next(tie), sums, subsets))
+
+    return _to_devices([_flatten(subset) for subset in partitions[0][3]])
+
+
+def _first_fit_decreasing(ordered: List[Operation], threads: int,
+                          capacity: float) -> Optional[List[List[Operation]]]:
+    """
+    Pack operations into devices of a given capacity with first-fit decreasing.
+
+    :param ordered: The operations, sorted by decreasing duration.
+    :param threads: The number of devices.
+    :param capacity: The capacity of every device.
+    :return: The operations of every device, or None if some operation fits into no device.
+    """
+
+    groups, loads = [list() for _ in range(threads)], [.0] * threads
+    for operation in ordered:
+        for d in range(threads):
+            if loads[d] + operation.duration <= capacity:
+                groups[d].append(operation)
+                loads[d] += operation.duration
+                break
+        else:
+            return None
+    return groups
+
+
+def get_multi_device_order_multifit(threads: int, operations: List[Operation], iterations: int = 10) -> List[Device]:
+    """
+    Assign operations to devices with the MULTIFIT algorithm.
+
+    Binary search for the smallest device capacity into which first-fit decreasing packs all operations,
+    between max(total / D, longest) and max(2 * total / D, longest), where packing always succeeds.
+    The makespan is at most 13/11 of the optimum, plus 2^-iterations of the initial interval.
+
+    :param threads: The number of threads (devices) to distribute the operations across.
+    :param operations: A list of Operation objects to be scheduled.
+    :param iterations: The number of binary search steps.
+    :return: A list of Device objects, each with its assigned operations and updated times.
+    """
+
+    if not operations:
+        return [Device() for _ in range(threads)]
+
+    ordered = sorted(operations, key=lambda op: op.duration, reverse=True)
+    total, longest = sum(op.duration for op in ordered), ordered[0].duration
+    low, high = max(total / threads, longest), max(2 * total / threads, longest)
+
+    if (best := _first_fit_decreasing(ordered, threads, high)) is None:
+        return get_multi_device_heuristic_order(threads, operations)
+    for _ in range(iterations):
+        if (packing := _first_fit_decreasing(ordered, threads, capacity := (low + high) / 2)) is None:
+            low = capacity
+        else:
+            high, best = capacity, packing
+
+    return _to_devices(best)
+
+
+def get_multi_device_order_exact(threads: int, operations: List[Operation], max_operations: int = 24,
+                                 max_nodes: int = 1_000_000, tolerance: float = 1e-9,
+                                 speeds: Optional[Sequence[float]] = None) -> List[Device]:
+    """
+    Assign operations to devices with a minimal makespan by branch-and-bound.
+
+    Operations are assigned in decreasing order of duration, starting from the A0 schedule as the incumbent.
+    A branch is cut once a device end time (load / speed) reaches the incumbent makespan, devices with equal loads
+    and speeds are tried only once, and the search stops as soon as the lower bound
+    max(total / total speed, longest / largest speed) is reached.
+    Instances with more than `max_operations` operations keep the A0 schedule,
+    and the search keeps the best schedule found within `max_nodes` nodes.
+
+    :param threads: The number of threads (devices) to distribute the operations across.
+    :param operations: A list of Operation objects to be scheduled.
+    :param max_operations: The largest number of operations searched.
+    :param max_nodes: The budget of search nodes.
+    :param tolerance: The tolerance of makespan comparisons.
+    :param speeds: The relative speed of every device; None for identical devices.
+    :return: A list of Device objects, each with its assigned operations and updated times.
+    """
+
+    incumbent = get_multi_device_order_A0(threads, list(operations), speeds=speeds)
+    if not operations or len(operations) > max_operations:
+        return incumbent
+
+    rates = [device.speed for device in incumbent]
+    ordered = sorted(operations, key=lambda op: op.duration, reverse=True)
+    lower_bound = max(sum(op.duration for op in ordered) / sum(rates), ordered[0].duration / max(rates))
+    best_makespan, best_assignment = max(device.end for device in incumbent), None
+    loads, assignment, nodes = [.0] * threads, [0] * len(ordered), 0
+
+    def branch(i: int) -> None:
+        nonlocal best_makespan, best_assignment, nodes
+        if i == len(ordered):
+            best_makespan = max(load / rate for load, rate in zip(loads, rates))
+            best_assignment = list(assignment)
+            return
+
+        nodes += 1
+        tried = set()
+        for d in range(threads):
+            if (loads[d], rates[d]) in tried or \
+                    (loads[d] + ordered[i].duration) / rates[d] >= best_makespan - tolerance:
+                continue
+            tried.add((loads[d], rates[d]))
+            loads[d] += ordered[i].duration
+            assignment[i] = d
+            branch(i + 1)
+            loads[d] -= ordered[i].duration
+            if best_makespan <= lower_bound + tolerance or nodes > max_nodes:
+                return
+
+    if best_makespan > lower_bound + tolerance:
+        branch(0)
+    if best_assignment is None:
+        return incumbent
+
+    groups = [list() for _ in range(threads)]
+    for operation, d in zip(ordered, best_assignment):
+        groups[d].append(operation)
+    return _to_devices(groups, speeds)
+
+
+def new_scheduler(scheduler_type: SchedulerType, speeds: Optional[Sequence[float]] = None) -> Scheduler:
+    """
+    Get the scheduling algorithm of a scheduler type.
+
+    :param scheduler_type: The scheduler type (see `SchedulerType`).
+    :param speeds: The relative speed of every device (uniform related machines); None for identical devices.
+                   The number of threads passed to the scheduler must match the number of speeds.
+                   Karmarkar–Karp and MULTIFIT assume identical devices, so they fall back to A0 with a warning.
+    :raises ValueError: If the scheduler type is unknown or not supported.
+    :return: A function (threads, operations) -> devices.
+    """
+
+    if speeds is not None and all(speed == 1. for speed in speeds):
+        speeds = None
+
+    if scheduler_type == SchedulerType.LPT:
+        return partial(get_multi_device_heuristic_order, speeds=speeds)
+    elif scheduler_type == SchedulerType.A0:
+        return partial(get_multi_device_order_A0, speeds=speeds)
+    elif scheduler_type == SchedulerType.EXACT:
+        return partial(get_multi_device_order_exact, speeds=speeds)
+    elif speeds is not None and scheduler_type in (SchedulerType.KARMARKAR_KARP, SchedulerType.MULTIFIT):
+        warn(f"Scheduler type {scheduler_type} does not support devices of different speeds, using A0 instead",
+             RuntimeWarning)
+        return partial(get_multi_device_order_A0, speeds=speeds)
+    elif scheduler_type == SchedulerType.KARMARKAR_KARP:
+        return get_multi_device_order_karmarkar_karp
+    elif scheduler_type == SchedulerType.MULTIFIT:
+        return get_multi_device_order_multifit
+    else:
+        raise ValueError(f"Unknown scheduler type: {scheduler_type}")
@@ -0,0 +1,265 @@
+from dataclasses import fields, is_dataclass, replace
+from multiprocessing.shared_memory import SharedMemory
+from sys import version_info
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from numpy import dtype as as_dtype, float64, ndarray, uint8
+
+T = TypeVar("T")
+
+# Alignment of the arrays in a segment, in bytes (a cache line)
+SEGMENT_ALIGNMENT = 64
+
+# Workers attach without registering at the resource tracker (Python 3.13+); the creating process owns the cleanup.
+# Before 3.13, pool workers share the tracker of their parent, where a repeated registration changes nothing
+_ATTACH_OPTIONS = {"track": False} if version_info >= (3, 13) else dict()
+
+# The segments created or attached by this process, by name, with their start address and size
+_segments: Dict[str, Tuple[SharedMemory, int, int]] = dict()
+_segments_lock = Lock()
+
+# A handle of an array in a segment: (segment name, offset, shape, dtype, writeable)
+Handle = Tuple[str, int, Tuple[int, ...], str, bool]
+
+
+def _register(segment: SharedMemory) -> None:
+    """
+    Make the arrays of a segment of this process picklable as handles; the caller holds the lock.
+
+    :param segment: The segment.
+    """
+
+    address = ndarray((segment.size,), uint8, buffer=segment.buf).ctypes.data
+    _segments[segment.name] = (segment, address, segment.size)
+
+
+def _handle(array: ndarray) -> Optional[Handle]:
+    """
+    Find the segment holding an array.
+
+    :param array: The array.
+    :return: The handle of the array, None if it is not a contiguous array inside a segment of this process.
+    """
+
+    if not array.flags.c_contiguous or array.nbytes == 0:
+        return None
+    address = array.ctypes.data
+    with _segments_lock:
+        for name, (_, start, size) in _segments.items():
+            if start <= address and address + array.nbytes <= start + size:
+                return name, address - start, array.shape, array.dtype.str, bool(array.flags.writeable)
+    return None
+
+
+def attach_array(name: str, offset: int, shape: Tuple[int, ...], dtype: str, writeable: bool) -> "SharedArray":
+    """
+    Get an array of a shared memory segment from its handle, attaching the segment on first use in this process.
+
+    Attached segments stay mapped until the process exits; only the creating `SharedArena` unlinks them.
+
+    :param name: The name of the segment.
+    :param offset: The offset of the array in the segment, in bytes.
+    :param shape: The shape of the array.
+    :param dtype: The dtype of the array.
+    :param writeable: Whether the array may be written, e.g., a result buffer.
+    :return: The array, a view of the segment without a copy.
+    """
+
+    with _segments_lock:
+        if name not in _segments:
+            _register(SharedMemory(name=name, **_ATTACH_OPTIONS))
+        segment = _segments[name][0]
+    array = ndarray(shape, as_dtype(dtype), buffer=segment.buf, offset=offset).view(SharedArray)
+    array.flags.writeable = writeable
+    return array
+
+
+class SharedArray(ndarray):
+    """
+    Array in a shared memory segment that is pickled as a handle (segment name, offset, shape, dtype).
+
+    Process workers receive a view of the same memory instead of a copy, so any object holding such arrays
+    (e.g., a `CenterData` shared by `SharedArena.share`) is pickled in a few bytes per array.
+    Arrays that left their segment (e.g., results of arithmetic) are pickled as regular copies.
+    """
+
+    def __reduce_ex__(self, protocol: Any) -> Tuple:
+        """
+        Reduce the array to its handle for pickling.
+
+        :param protocol: The pickle protocol.
+        :return: The reconstruction through `attach_array`, or that of a regular array outside of segments.
+        """
+
+        if (handle := _handle(self)) is None:
+            return self.view(ndarray).__reduce_ex__(protocol)
+        return attach_array, handle
+
+    def __reduce__(self) -> Tuple:
+        """
+        Reduce the array to its handle for pickling (see `__reduce_ex__`).
+
+        :return: The reconstruction of the array.
+        """
+
+        return self.__reduce_ex__(2)
+
+
+def _collect(value: Any, arrays: Dict[int, ndarray]) -> None:
+    """
+    Collect the arrays of a value, searching dataclasses, lists and tuples.
+
+    :param value: The value.
+    :param arrays: The arrays found so far by id, filled in place.
+    """
+
+    if isinstance(value, ndarray):
+        if value.dtype != object and value.nbytes:
+            arrays.setdefault(id(value), value)
+    elif is_dataclass(value) and not isinstance(value, type):
+        for field in fields(value):
+            _collect(getattr(value, field.name), arrays)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect(item, arrays)
+
+
+def _rebuild(value: T, copies: Dict[int, ndarray]) -> T:
+    """
+    Rebuild a value with the shared copies of its arrays (see `_collect`).
+
+    :param value: The value.
+    :param copies: The shared copy of every array by the id of the original.
+    :return: The value with shared arrays; frozen dataclasses are recreated with `dataclasses.replace`.
+    """
+
+    if isinstance(value, ndarray):
+        return copies.get(id(value), value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return replace(value, **{field.name: _rebuild(getattr(value, field.name), copies)
+                                 for field in fields(value) if field.init})
+    if isinstance(value, (list, tuple)):
+        return type(value)(_rebuild(item, copies) for item in value)
+    return value
+
+
+class SharedArena:
+    """
+    Owner of the shared memory segments of one run.
+
+    `share` copies all arrays of a value into one segment, once per run; `allocate` creates result buffers
+    that workers write into. `close` (or leaving the `with` block) unlinks all segments, also after failed or
+    crashed workers, since only this process owns them. If this process itself dies, the resource tracker
+    of `multiprocessing` unlinks the segments it registered.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an arena without segments."""
+
+        self.segments: List[SharedMemory] = list()
+
+    def __enter__(self) -> "SharedArena":
+        """
+        Enter the run.
+
+        :return: The arena.
+        """
+
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        """Leave the run and unlink the segments (see `close`)."""
+
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """The total size of the segments in bytes."""
+
+        return sum(segment.size for segment in self.segments)
+
+    def share(self, value: T) -> T:
+        """
+        Copy all arrays of a value into a new segment.
+
+        :param value: An array, or a dataclass, list or tuple holding arrays (e.g., `CenterData`).
+        :return: The value with every array replaced by a read-only `SharedArray` copy.
+        """
+
+        arrays, offsets, total = dict(), dict(), 0
+        _collect(value, arrays)
+        for key, array in arrays.items():
+            offsets[key], total = total, total + -(-array.nbytes // SEGMENT_ALIGNMENT) * SEGMENT_ALIGNMENT
+        if not arrays:
+            return value
+
+        buffer = self._create(total)
+        copies = dict()
+        for key, array in arrays.items():
+            copy = ndarray(array.shape, array.dtype, buffer=buffer, offset=offsets[key]).view(SharedArray)
+            copy[...] = array
+            copy.flags.writeable = False
+            copies[key] = copy
+        return _rebuild(value, copies)
+
+    def allocate(self, shape: Union[int, Sequence[int]], dtype: Any = float64) -> SharedArray:
+        """
+        Create a zero-filled writeable array in a new segment, e.g., a result buffer for workers.
+
+        :param shape: The shape of the array.
+        :param dtype: The dtype of the array.
+        :return: The array.
+        """
+
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        array = ndarray(shape, as_dtype(dtype), buffer=self._create(
+            max(1, int(as_dtype(dtype).itemsize * _count(shape))))).view(SharedArray)
+        array.fill(0)
+        return array
+
+    def close(self) -> None:
+        """
+        Unlink all segments.
+
+        The memory is released once no process maps it anymore; arrays of this process that are still referenced
+        keep their mapping until they are released.
+        """
+
+        for segment in self.segments:
+            with _segments_lock:
+                _segments.pop(segment.name, None)
+            try:
+                segment.close()
+            except BufferError:
+                pass  # arrays of this process still reference the segment; it is unmapped with them
+            segment.unlink()
+        self.segments = list()
+
+    def _create(self, size: int) -> memoryview:
+        """
+        Create and register a segment.
+
+        :param size: The size of the segment in bytes.
+        :return: The buffer of the segment.
+        """
+
+        segment = SharedMemory(create=True, size=max(1, size))
+        with _segments_lock:
+            _register(segment)
+        self.segments.append(segment)
+        return segment.buf
+
+
+def _count(shape: Tuple[int, ...]) -> int:
+    """
+    Get the number of entries of an array shape.
+
+    :param shape: The shape.
+    :return: The product of the dimensions.
+    """
+
+    count = 1
+    for dimension in shape:
+        count *= dimension
+    return count
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Optional
+
+from comp.utils import assert_positive
+
+DEFAULT_WORKER_CACHE_SIZE = 32
+
+
+class WorkerCache:
+    """
+    Bounded least-recently-used cache local to a worker process.
+
+    Tasks routed to the same worker (see the `affinity` of `ParallelExecutor.execute`) use it to hand built models
+    and loaded data from one phase to the next instead of rebuilding them.
+    Every process has its own `worker_cache` instance, shared by the threads of the process.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_WORKER_CACHE_SIZE) -> None:
+        """
+        Initialize an empty cache.
+
+        :param maxsize: The maximum number of entries; the least recently used entry is evicted beyond it.
+        """
+
+        assert_positive(maxsize, "maxsize")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """
+        Get the number of entries.
+
+        :return: The number of entries.
+        """
+
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get an entry and mark it as recently used.
+
+        :param key: The key of the entry.
+        :return: The entry, None if it is not cached.
+        """
+
+        with self._lock:
+            return self._lookup(key, remove=False)
+
+    def take(self, key: Hashable) -> Optional[Any]:
+        """
+        Remove an entry and return it, e.g., a model that is about to be modified.
+
+        :param key: The key of the entry.
+        :return: The entry, None if it is not cached.
+        """
+
+        with self._lock:
+            return self._lookup(key, remove=True)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Add or replace an entry, evicting the least recently used entries beyond `maxsize`.
+
+        :param key: The key of the entry.
+        :param value: The entry.
+        """
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key: Hashable, remove: bool) -> Optional[Any]:
+        """
+        Find an entry and count the hit or miss; the caller holds the lock.
+
+        :param key: The key of the entry.
+        :param remove: Whether to remove the entry instead of marking it as recently used.
+        :return: The entry, None if it is not cached.
+        """
+
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if remove:
+            return self._entries.pop(key)
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+
+# The cache of the current process (see `WorkerCache`)
+worker_cache = WorkerCache()
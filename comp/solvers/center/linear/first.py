@@ -1,5 +1,6 @@
 from dataclasses import replace
 from functools import partial
+from typing import Any, Callable, Dict, List, Optional
 
 from comp.models import CenterData, ElementType
 from comp.solvers.core import CenterSolver
@@ -15,18 +16,27 @@ def __init__(self, data: CenterData) -> None:
         """
         Initialize the CenterLinearFirst solver.
 
-        This involves initializing the base CenterSolver and pre-calculating
-        the optimal values (f_c_opt) for each element’s functional using
-        parallel execution if configured.
+        This involves initializing the base CenterSolver; the optimal values (f_c_opt) for each element’s
+        functional are calculated during `coordinate`, chained with the element’s solve (see `preliminary_tasks`).
 
         :param data: The CenterData object containing configuration and parameters for the center.
         """
 
         super().__init__(data)
 
-        self.f_c_opt = self.parallel_executor.execute([partial(execute_new_solver_from_data, replace(
-            element_data, coeffs_functional=data.coeffs_functional[e], config=replace(
-                element_data.config, type=ElementType.DECENTRALIZED))) for e, element_data in enumerate(data.elements)])
+        self.f_c_opt: List[Optional[float]] = [None] * len(data.elements)
+
+    def preliminary_tasks(self) -> Dict[str, List[Callable[[], Any]]]:
+        """
+        Get the tasks calculating the optimal value (f_c_opt) of each element’s functional, according to the center.
+
+        :return: The f_c_opt task of every element.
+        """
+
+        return {"f_c_opt": [partial(execute_new_solver_from_data, replace(
+            element_data, coeffs_functional=self.data.coeffs_functional[e], config=replace(
+                element_data.config, type=ElementType.DECENTRALIZED)), self.data.config.worker_affinity)
+            for e, element_data in enumerate(self.data.elements)]}
 
     def modify_constraints(self, element_index: int, element_solver: ElementSolver) -> None:
         """
@@ -38,8 +48,11 @@ def modify_constraints(self, element_index: int, element_solver: ElementSolver)
 
         :param element_index: The index of the element whose solver is being modified.
         :param element_solver: The ElementSolver instance for the specific element.
+        :raises RuntimeError: If f_c_opt_e is not known yet (see `preliminary_value`).
         """
 
+        f_c_opt = self.preliminary_value("f_c_opt", element_index)
+
         if not element_solver.setup_done:
             element_solver.setup()
 
@@ -47,5 +60,5 @@ def modify_constraints(self, element_index: int, element_solver: ElementSolver)
         element_solver.solver.Add(
             lp_sum(self.data.coeffs_functional[element_index][i] * element_solver.get_plan_component(i)
                    for i in range(element_solver.data.config.num_decision_variables))
-            == self.f_c_opt[element_index]
+            == f_c_opt
         )
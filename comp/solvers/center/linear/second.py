@@ -1,4 +1,5 @@
 from functools import partial
+from typing import Any, Callable, Dict, List, Optional
 
 from comp.models import CenterData
 from comp.solvers.core import CenterSolver
@@ -14,16 +15,25 @@ def __init__(self, data: CenterData) -> None:
         """
         Initialize the CenterLinearSecond solver.
 
-        Initializes the base CenterSolver and pre-calculates the optimal values (f_el_opt)
-        for each element’s own objective function using parallel execution if configured.
+        Initializes the base CenterSolver; the optimal values (f_el_opt) for each element’s own objective function
+        are calculated during `coordinate`, chained with the element’s concession (see `preliminary_tasks`).
 
         :param data: The CenterData object containing configuration and parameters for the center.
         """
 
         super().__init__(data)
 
-        self.f_el_opt = self.parallel_executor.execute([partial(execute_new_solver_from_data, element_data.copy())
-                                                        for element_data in data.elements])
+        self.f_el_opt: List[Optional[float]] = [None] * len(data.elements)
+
+    def preliminary_tasks(self) -> Dict[str, List[Callable[[], Any]]]:
+        """
+        Get the tasks calculating the optimal value (f_el_opt) of each element’s own objective function.
+
+        :return: The f_el_opt task of every element.
+        """
+
+        return {"f_el_opt": [partial(execute_new_solver_from_data, element_data, self.data.config.worker_affinity)
+                             for element_data in self.data.elements]}
 
     def modify_constraints(self, element_index: int, element_solver: ElementSolver) -> None:
         """
@@ -35,8 +45,11 @@ def modify_constraints(self, element_index: int, element_solver: ElementSolver)
 
         :param element_index: The index of the element whose solver is being modified.
         :param element_solver: The ElementSolver instance for the specific element.
+        :raises RuntimeError: If f_el_opt_e is not known yet (see `preliminary_value`).
         """
 
+        f_el_opt = self.preliminary_value("f_el_opt", element_index)
+
         if not element_solver.setup_done:
             element_solver.setup(set_objective=False)
 
@@ -44,7 +57,7 @@ def modify_constraints(self, element_index: int, element_solver: ElementSolver)
         element_solver.solver.Add(
             lp_sum(element_solver.data.coeffs_functional[i] * element_solver.get_plan_component(i)
                    for i in range(element_solver.data.config.num_decision_variables))
-            >= self.f_el_opt[element_index] * (1 - element_solver.data.delta)
+            >= f_el_opt * (1 - element_solver.data.delta)
         )
 
         element_objective = element_solver.solver.Objective()
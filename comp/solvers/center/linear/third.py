@@ -1,12 +1,18 @@
 from dataclasses import replace
+from concurrent.futures import Executor
 from functools import partial
-from typing import Dict, List, Optional, Any
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
-from comp.models import CenterData, ElementData, ElementSolution, ElementType
+from numpy import flatnonzero, full, isfinite, isnan, ndarray
+
+from comp.models import CenterData, ElementData, ElementSolution, ElementType, ExecutionStatus, WeightSweep
+from comp.parallelization import worker_cache
 from comp.solvers.core import CenterSolver
+from comp.solvers.core.center import overall_status
 from comp.solvers.core.element import ElementSolver
-from comp.solvers.factories import new_element_solver, execute_new_solver_from_data
-from comp.utils import stringify, tab_out, calculate_element_own_quality
+from comp.solvers.factories import (execute_new_solver_from_data, keep_element_solver, new_element_solver,
+                                    take_element_solver)
+from comp.utils import stringify, tab_out
 
 
 class CenterLinearThird(CenterSolver):
@@ -21,21 +27,20 @@ def __init__(self, data: CenterData) -> None:
         with a combined goal (center’s objective + w * element’s objective).
         It then selects the `w` for each element that maximizes the element’s own objective function.
 
-        Initializes attributes to store solutions for all `w` values and the chosen solution
-        for each element.
+        Preallocates the dense sweep storage (`WeightSweep`) for all `w` values and
+        initializes the chosen solution for each element.
+        The reference optima (f_c_opt, f_el_opt) are calculated during `coordinate` (see `preliminary_tasks`).
 
         :param data: The CenterData object containing configuration and parameters for the center.
         """
 
         super().__init__(data)
 
-        self.f_c_opt = self.parallel_executor.execute([partial(execute_new_solver_from_data, replace(
-            element_data, coeffs_functional=data.coeffs_functional[e], config=replace(
-                element_data.config, type=ElementType.DECENTRALIZED))) for e, element_data in enumerate(data.elements)])
-        self.f_el_opt = self.parallel_executor.execute([partial(execute_new_solver_from_data, element_data.copy())
-                                                        for element_data in data.elements])
-        self.all_element_solutions: List[Dict[float, ElementSolution]] = [dict() for _ in data.elements]
+        self.f_c_opt: List[Optional[float]] = [None] * len(data.elements)
+        self.f_el_opt: List[Optional[float]] = [None] * len(data.elements)
+        self.sweep = WeightSweep.allocate(data.elements, data.config.sweep_plans_top_k)
         self.chosen_element_solutions_info = [(.0, ElementSolution()) for _ in data.elements]
+        self.chosen_indices = full(len(data.elements), -1, dtype=int)
 
     def _modify_element_objective_with_w(self, e: int, element_solver: ElementSolver, w_scalar: float) -> None:
         """
@@ -105,7 +110,25 @@ def modify_constraints(self, e: int, element_solver: ElementSolver) -> None:
 
         pass
 
-    def _solve_element_for_specific_w(self, e: int, element_data_copy: ElementData, w_scalar: float) -> ElementSolution:
+    def preliminary_tasks(self) -> Dict[str, List[Callable[[], Any]]]:
+        """
+        Get the tasks calculating the reference optima of each element reported next to the sweep:
+        the center’s (f_c_opt) and the element’s own (f_el_opt).
+
+        :return: The f_c_opt and the f_el_opt task of every element.
+        """
+
+        return {
+            "f_c_opt": [partial(execute_new_solver_from_data, replace(
+                element_data, coeffs_functional=self.data.coeffs_functional[e], config=replace(
+                    element_data.config, type=ElementType.DECENTRALIZED)), self.data.config.worker_affinity)
+                for e, element_data in enumerate(self.data.elements)],
+            "f_el_opt": [partial(execute_new_solver_from_data, element_data, self.data.config.worker_affinity)
+                         for element_data in self.data.elements],
+        }
+
+    def _solve_element_for_specific_w(self, e: int, element_data: ElementData, w_scalar: float,
+                                      reuse_model: bool = False) -> ElementSolution:
         """
         Create and solve an element’s optimization problem for a specific weight `w_scalar`.
 
@@ -113,92 +136,214 @@ def _solve_element_for_specific_w(self, e: int, element_data_copy: ElementData,
         `_modify_element_objective_with_w`, and then it is solved.
 
         :param e: The index of the element.
-        :param element_data_copy: A copy of the ElementData for the element.
-                                  A copy is used to avoid side effects if the data is modified.
+        :param element_data: The (read-only, shared) ElementData for the element.
         :param w_scalar: The weight coefficient (w_e) to apply.
+        :param reuse_model: If True, the model is taken from and kept in the worker cache
+                            (see `take_element_solver`), since only the objective changes between the `w` values.
         :return: The ElementSolution obtained by solving the element’s problem with the given `w_scalar`.
         """
 
-        element_solver = new_element_solver(element_data_copy)
+        element_solver = take_element_solver(element_data) if reuse_model else new_element_solver(element_data)
         self._modify_element_objective_with_w(e, element_solver, w_scalar)
-        return element_solver.solve()
+        solution = element_solver.solve()
+        if reuse_model:
+            keep_element_solver(element_solver)
+        return solution
+
+    def solve_element(self, element_index: int, w: float = 1.) -> ElementSolution:
+        """
+        Solve the problem of one element for a single weight `w`, in the calling process, e.g., to time it.
+
+        :param element_index: The index of the element.
+        :param w: The weight coefficient (w_e) of the element’s own objective.
+        :return: The solution of the element for `w`.
+        """
+
+        return self._solve_element_for_specific_w(element_index, self.data.elements[element_index], w)
 
-    def coordinate(self, tolerance: float = 1e-9) -> None:
+    def _sweep_tasks(self) -> Tuple[List[Tuple[int, int]], List[Callable[[], ElementSolution]]]:
+        """
+        Build one task per (element, w) pair of the sweep.
+
+        All tasks of an element share the same read-only ElementData instance, so the memory held
+        by the task list does not grow with the size of the w grid beyond the task objects themselves.
+
+        :return: A tuple of the (element index, w index) identifiers and the corresponding tasks.
+        """
+
+        task_identifiers, tasks = list(), list()
+        for e, element_data in enumerate(self.data.elements):
+            for k in range(self.sweep.num_w[e]):
+                task_identifiers.append((e, k))
+                tasks.append(partial(self._solve_element_for_specific_w, e, element_data, float(self.sweep.w[e, k]),
+                                     self.data.config.worker_affinity))
+        return task_identifiers, tasks
+
+    def _coordinate_elements(self, plan_buffers: List[Optional[ndarray]], tolerance: float,
+                             progress: Callable[[int, int], None]) -> Iterator[Tuple[int, ElementSolution]]:
         """
         Coordinate the optimization process for all elements using the weighted balance strategy.
 
-        If not already set up, this method performs the following steps:
-        1. For each element and for each weight `w` specified in `element_data.w`:
+        `CenterSolver.coordinate_stream` calls it once, within the `shared_transport` of the data;
+        it performs the following steps:
+        1. For each element and for each distinct weight `w` in `self.sweep` (ascending):
            A. Creates a task to solve the element’s subproblem with that `w`.
            B. The subproblem’s objective is Max (d_e^T * y_e + w * c_e^T * y_plan_component).
-        2. Execute these tasks, potentially in parallel.
-        3. Stores all solutions (for each `w`) in `self.all_element_solutions`.
+        2. Execute these tasks together with the `preliminary_tasks`, potentially in parallel
+           (with `config.worker_affinity`, all tasks of an element on one worker, sharing its model),
+           report every completed task to `progress`, and record the total sweep time of every element
+           in the runtime history (see `CenterSolver.record_runtimes`).
+        3. Stores the objective and the element’s own quality functional (c_e^T * y_plan_component)
+           of every solution in the dense `self.sweep` arrays as soon as it arrives,
+           holding its plan only while it may still be kept (see `WeightSweep.plan_candidates`).
         4. For each element:
-           A. Iterates through its solutions obtained for different `w` values.
-           B. Select the `w` and corresponding solution that maximizes the element’s
-              own quality functional (c_e^T * y_plan_component), calculated by
-              `calculate_element_own_quality`.
+           A. Select the `w` that maximizes the element’s own quality functional (see `WeightSweep.best_indices`).
+           B. Stores the full plans of the chosen `w` and of the best `config.sweep_plans_top_k` others
+              (all plans if it is None); only the summaries are kept for the rest.
            C. Stores best selected `w` and solution in `self.chosen_element_solutions_info`.
            D. Appends the chosen `ElementSolution` to `self.element_solutions` (used by base class).
-        5. It marks the setup as done.
 
+        :param plan_buffers: Unused; the sweep keeps the plans of several weights per element as lists.
         :param tolerance: The tolerance for comparing floating-point numbers.
+        :param progress: Called with the number of completed and of all tasks after every task.
+        :return: An iterator of the index and the chosen solution of every element; the chosen solution
+                 of an element is only known once all its weights are solved, so they follow the whole sweep.
         """
 
-        if self.setup_done:
-            return
+        task_identifiers, tasks = self._sweep_tasks()
+
+        # No sweep task depends on the reference optima, so all of them run as one batch without a barrier
+        preliminary, num_elements = self.preliminary_tasks(), len(self.data.elements)
+        reference_tasks = [task for name in preliminary for task in preliminary[name]]
+        costs = list(self.costs) * len(preliminary) + [self.costs[e] for e, _ in task_identifiers]
+        affinity = list(range(num_elements)) * len(preliminary) + [e for e, _ in task_identifiers] \
+            if self.data.config.worker_affinity else None
+        memory = self.memory * len(preliminary) + [self.memory[e] for e, _ in task_identifiers]
+        if self.data.config.speculation_factor is None:
+            results = self.parallel_executor.execute_stream(reference_tasks + tasks, costs, affinity, memory)
+        else:
+            results = enumerate(self.parallel_executor.execute(reference_tasks + tasks, costs, affinity=affinity,
+                                                               memory=memory))
+        for name in preliminary:
+            setattr(self, name, [None] * num_elements)
+        kept, timed_out = [dict() for _ in range(num_elements)], set()
+        for done, (i, solution) in enumerate(results, 1):
+            self._record_result(list(preliminary), task_identifiers, i, solution, kept, timed_out, tolerance)
+            progress(done, len(reference_tasks) + len(tasks))
+        self._record_statuses(task_identifiers, timed_out)
+        self._choose_plans(task_identifiers, kept, tolerance)
+        yield from enumerate(self.element_solutions)
+
+    async def _coordinate_elements_async(self, plan_buffers: List[Optional[ndarray]], tolerance: float,
+                                         pool: Optional[Executor]) -> AsyncIterator[Tuple[int, ElementSolution]]:
+        """
+        Run the sweep like `_coordinate_elements`, without blocking the event loop (see `coordinate_async`).
 
-        tasks, task_identifiers = list(), list()
+        The chosen solution of every element is only known once all its weights are solved,
+        so the solutions are yielded after the whole sweep.
 
-        for e, element_data in enumerate(self.data.elements):
-            if element_data.w is None or len(element_data.w) == 0:
-                self.all_element_solutions[e] = dict()
-                continue
+        :param plan_buffers: Unused (see `_coordinate_elements`).
+        :param tolerance: The tolerance for comparing floating-point numbers.
+        :param pool: The shared pool of the tasks, None for a pool of their own.
+        :return: An asynchronous iterator of the index and the chosen solution of every element.
+        """
 
-            for w_val_np in element_data.w:
-                task_identifiers.append((e, w_scalar := float(w_val_np)))
-                tasks.append(partial(self._solve_element_for_specific_w, e, element_data.copy(), w_scalar))
+        task_identifiers, tasks = self._sweep_tasks()
+        preliminary, num_elements = self.preliminary_tasks(), len(self.data.elements)
+        reference_tasks = [task for name in preliminary for task in preliminary[name]]
+        for name in preliminary:
+            setattr(self, name, [None] * num_elements)
+        kept, timed_out = [dict() for _ in range(num_elements)], set()
+        async for i, solution in self.parallel_executor.execute_async(
+                reference_tasks + tasks, list(self.costs) * len(preliminary)
+                + [self.costs[e] for e, _ in task_identifiers], pool=pool):
+            self._record_result(list(preliminary), task_identifiers, i, solution, kept, timed_out, tolerance)
+        self._record_statuses(task_identifiers, timed_out)
+        self._choose_plans(task_identifiers, kept, tolerance)
+        for e, solution in enumerate(self.element_solutions):
+            yield e, solution
+
+    def _record_result(self, names: List[str], task_identifiers: List[Tuple[int, int]], i: int, solution: Any,
+                       kept: List[Dict[int, ElementSolution]], timed_out: Set[int], tolerance: float) -> None:
+        """
+        Store one result of the sweep as soon as it arrives (step 3 of `_coordinate_elements`).
 
-        for (e, w_scalar), solution in zip(task_identifiers, self.parallel_executor.execute(tasks)):
-            if solution is not None:
-                self.all_element_solutions[e][w_scalar] = solution
+        A preliminary value goes to its attribute; a sweep solution is summarized in `self.sweep`,
+        and its plan is held in `kept` only while `WeightSweep.plan_candidates` may still keep it.
 
-        for e in range(len(self.data.elements)):
-            best_w_for_element: Optional[float] = None
-            max_element_qf_e: float = float("-inf")
-            current_best_solution_tuple: ElementSolution = ElementSolution()
+        :param names: The names of the preliminary values (see `preliminary_tasks`).
+        :param task_identifiers: The (element index, w index) of every sweep task.
+        :param i: The index of the task, counting the preliminary tasks first.
+        :param solution: The result of the task, None if it failed.
+        :param kept: The candidate solutions of every element by w index; updated in place.
+        :param timed_out: The indices of the tasks whose solve timed out; updated in place.
+        :param tolerance: The tolerance for comparing floating-point numbers.
+        """
 
-            if not self.all_element_solutions[e]:
-                self.chosen_element_solutions_info[e] = (.0, ElementSolution())
-                self.element_solutions.append(ElementSolution())
-                continue
+        num_elements = len(self.data.elements)
+        if i < (num_references := len(names) * num_elements):
+            getattr(self, names[i // num_elements])[i % num_elements] = solution
+            return
+        if solution is None:
+            return
 
-            for w_val in sorted(self.all_element_solutions[e].keys()):
-                sol_info_tuple = self.all_element_solutions[e][w_val]
+        e, k = task_identifiers[i - num_references]
+        if solution.timed_out:
+            timed_out.add(i)
+        self.sweep.record(e, k, solution, self.data.elements[e])
+        kept[e][k] = solution
+        kept[e] = {c: kept[e][c] for c in self.sweep.plan_candidates(e, tolerance)}
 
-                if sol_info_tuple is None or not sol_info_tuple.plan:
-                    continue
+    def _record_statuses(self, task_identifiers: List[Tuple[int, int]], timed_out: Set[int]) -> None:
+        """
+        Store the outcome of every element of the sweep in `self.element_statuses`.
 
-                element_qf_e = calculate_element_own_quality(
-                    self.data.elements[e].coeffs_functional,
-                    self.data.elements[e].config.type,
-                    sol_info_tuple.plan.get("y_e", list()),
-                    sol_info_tuple.plan.get("y_star_e", list())
-                )
+        An element is COMPLETED once its reference optima and all its weights are solved,
+        and otherwise takes the most severe status of its unfinished tasks and timed out solves (see `overall_status`).
 
-                if (element_qf_e - max_element_qf_e) > tolerance:
-                    max_element_qf_e = element_qf_e
-                    best_w_for_element = w_val
-                    current_best_solution_tuple = sol_info_tuple
+        :param task_identifiers: The (element index, w index) of every sweep task.
+        :param timed_out: The indices of the tasks whose solve timed out, counting the preliminary tasks first.
+        """
 
-            if best_w_for_element is not None:
-                self.chosen_element_solutions_info[e] = (best_w_for_element, current_best_solution_tuple)
-                self.element_solutions.append(current_best_solution_tuple)
+        num_elements, statuses = len(self.data.elements), self.parallel_executor.statuses
+        num_references = len(statuses) - len(task_identifiers)
+        self.element_statuses = [ExecutionStatus.COMPLETED] * num_elements
+        for i, status in enumerate(statuses):
+            e = i % num_elements if i < num_references else task_identifiers[i - num_references][0]
+            if status == ExecutionStatus.COMPLETED and i in timed_out:
+                status = ExecutionStatus.TIMED_OUT
+            self.element_statuses[e] = overall_status((self.element_statuses[e], status))
+
+    def _choose_plans(self, task_identifiers: List[Tuple[int, int]], kept: List[Dict[int, ElementSolution]],
+                      tolerance: float) -> None:
+        """
+        Choose the `w` of every element once the sweep is recorded (step 4 of `_coordinate_elements`).
+
+        :param task_identifiers: The (element index, w index) of every sweep task.
+        :param kept: The candidate solutions of every element by w index (see `_record_result`); emptied in place.
+        :param tolerance: The tolerance for comparing floating-point numbers.
+        """
+
+        num_elements, durations = len(self.data.elements), self.parallel_executor.durations
+        worker_cache.clear()
+
+        element_durations = [None] * num_elements
+        for (e, _), duration in zip(task_identifiers, durations[len(durations) - len(task_identifiers):]):
+            element_durations[e] = (element_durations[e] or .0) + duration
+        self.record_runtimes(element_durations)
+
+        self.chosen_indices = self.sweep.best_indices(tolerance)
+        for e, selected in enumerate(self.sweep.select_plans(self.chosen_indices)):
+            for k in selected:
+                self.sweep.store_plan(e, k, kept[e][k])
+        kept.clear()
+
+        for e, k in enumerate(self.chosen_indices):
+            if k >= 0:
+                self.chosen_element_solutions_info[e] = (float(self.sweep.w[e, k]), self.sweep.get_solution(e, k))
             else:
                 self.chosen_element_solutions_info[e] = (.0, ElementSolution())
-                self.element_solutions.append(ElementSolution())
-
-        self.setup_done = True
+            self.element_solutions.append(self.chosen_element_solutions_info[e][1])
 
     def print_results(self, print_details: bool = True, tolerance: float = 1e-9) -> None:
         """
@@ -231,20 +376,17 @@ def print_results(self, print_details: bool = True, tolerance: float = 1e-9) ->
             print(f"\nElement {stringify(element_data.config.id)} (Type: {element_data.config.type}):")
             print(f"\nElement Optimal (f_el_opt): {stringify(self.f_el_opt[e])}")
             print(f"Center Optimal (f_c_opt): {stringify(self.f_c_opt[e])}")
-            if not self.all_element_solutions[e]:
+            if not (solved := ~isnan(self.sweep.objectives[e])).any():
                 print(f"No solutions found for any w value for element {element_data.config.id}.")
                 continue
 
             results_table_data = list()
-            for w_val in sorted(self.all_element_solutions[e].keys()):
-                sol_info = self.all_element_solutions[e][w_val]
+            for k in flatnonzero(solved):
+                w_val = float(self.sweep.w[e, k])
                 elem_func_str, center_contr_str = "N/A", "N/A"
-                obj_str = stringify(combined_obj) if (combined_obj := sol_info.objective) != float("-inf") else "N/A"
-                if sol_info.plan.get("y_e"):
-                    elem_func = calculate_element_own_quality(
-                        element_data.coeffs_functional, element_data.config.type,
-                        sol_info.plan.get("y_e", list()), sol_info.plan.get("y_star_e", list())
-                    )
+                obj_str = stringify(combined_obj) if (combined_obj := float(
+                    self.sweep.objectives[e, k])) != float("-inf") else "N/A"
+                if isfinite(elem_func := float(self.sweep.element_qf[e, k])):
                     elem_func_str, center_contr_str, obj_str = map(
                         stringify, (elem_func, combined_obj - w_val * elem_func, combined_obj))
                 results_table_data.append([stringify(w_val), elem_func_str, center_contr_str, obj_str,
@@ -258,11 +400,8 @@ def print_results(self, print_details: bool = True, tolerance: float = 1e-9) ->
                 print(f"Chosen w: {stringify(chosen_w)}")
                 print(f"Chosen Plan: {stringify(chosen_solution_info.plan)}")
                 if chosen_solution_info.objective != float("-inf"):
-                    chosen_elem_func = calculate_element_own_quality(
-                        element_data.coeffs_functional, element_data.config.type,
-                        chosen_solution_info.plan.get("y_e", list()), chosen_solution_info.plan.get("y_star_e", list())
-                    )
-                    chosen_center_contrib = chosen_solution_info.objective - chosen_w * chosen_elem_func
+                    chosen_elem_func = float(self.sweep.element_qf[e, self.chosen_indices[e]])
+                    chosen_center_contrib = float(self.sweep.center_qf[e, self.chosen_indices[e]])
                     print(f"Chosen Element Functional (c^T y_plan): {stringify(chosen_elem_func)}")
                     print(f"Chosen Center Contribution (d^T y_e): {stringify(chosen_center_contrib)}")
                     print(f"Chosen Combined Objective: {stringify(chosen_solution_info.objective)}")
@@ -290,7 +429,8 @@ def get_results_dict(self, tolerance: float = 1e-9) -> Dict[str, Any]:
                 - center_qf: The center’s contribution to the objective.
                 - combined_objective: The combined objective value.
                 - is_chosen: A boolean indicating if this solution was chosen.
-                - solution_plan: The plan associated with this solution.
+                - solution_plan: The plan associated with this solution, or None if it was not kept
+                  (see `CenterConfig.sweep_plans_top_k`).
             - chosen_solution_details: A dictionary containing details of the chosen solution, including:
                 - chosen_w: The chosen weight (w) value.
                 - plan: The chosen plan.
@@ -312,31 +452,21 @@ def get_results_dict(self, tolerance: float = 1e-9) -> Dict[str, Any]:
             chosen_w, chosen_solution_info = self.chosen_element_solutions_info[e]
 
             all_w_solutions_payload = dict()
-            if self.all_element_solutions[e]:
-                for w, sol_info in self.all_element_solutions[e].items():
-                    elem_qf, obj_s = float("-inf"), sol_info.objective if sol_info else float("-inf")
-                    if sol_info.plan.get("y_e"):
-                        elem_qf = calculate_element_own_quality(
-                            element_data.coeffs_functional, element_data.config.type,
-                            sol_info.plan.get("y_e", list()), sol_info.plan.get("y_star_e", list())
-                        )
-                    all_w_solutions_payload[w] = {
-                        "element_qf": elem_qf,
-                        "center_qf": obj_s - w * elem_qf,
-                        "combined_objective": obj_s,
-                        "is_chosen": abs(w - chosen_w) < tolerance if chosen_w is not None else False,
-                        "solution_plan": sol_info.plan if sol_info else None,
-                    }
+            center_qf = self.sweep.center_qf[e]
+            for k in flatnonzero(~isnan(self.sweep.objectives[e])):
+                w = float(self.sweep.w[e, k])
+                all_w_solutions_payload[w] = {
+                    "element_qf": float(self.sweep.element_qf[e, k]),
+                    "center_qf": float(center_qf[k]),
+                    "combined_objective": float(self.sweep.objectives[e, k]),
+                    "is_chosen": abs(w - chosen_w) < tolerance if chosen_w is not None else False,
+                    "solution_plan": self.sweep.get_plan(e, k),
+                }
 
             chosen_w_payload = None
             if chosen_solution_info and chosen_solution_info.plan:
-                chosen_element_qf = calculate_element_own_quality(
-                    element_data.coeffs_functional, element_data.config.type,
-                    chosen_solution_info.plan.get("y_e", list()), chosen_solution_info.plan.get("y_star_e", list())
-                )
-                chosen_center_qf = float("-inf")
-                if chosen_solution_info.plan.get("y_e"):
-                    chosen_center_qf = chosen_solution_info.objective - chosen_w * chosen_element_qf
+                chosen_element_qf = float(self.sweep.element_qf[e, self.chosen_indices[e]])
+                chosen_center_qf = float(self.sweep.center_qf[e, self.chosen_indices[e]])
                 chosen_w_payload = {
                     "chosen_w": chosen_w,
                     "plan": chosen_solution_info.plan,
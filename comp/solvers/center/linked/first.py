@@ -1,14 +1,16 @@
-from functools import partial
-from typing import Dict, List, Optional, Any
+from asyncio import to_thread
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Any, AsyncIterator, Iterator
 from typing import Tuple
 
+from numpy import isnan
 from ortools.linear_solver.pywraplp import Solver, Variable
 
-from comp.models import CenterData, ElementType
+from comp.models import CenterData, ElementType, ExecutionStatus, iter_rows
 from comp.models import ElementSolution
 from comp.solvers.core import CenterSolver
 from comp.solvers.core.element import ElementSolver
-from comp.utils import lp_sum, stringify, tab_out, calculate_element_own_quality
+from comp.utils import lp_sum, stringify, tab_out
 
 
 class CenterLinkedFirst(CenterSolver):
@@ -20,6 +22,8 @@ def __init__(self, data: CenterData) -> None:
 
         Sets up the base solver, creates an OR-Tools GLOP solver instance for the linked problem,
         and initializes variables for decision variables (y, y_star) and allocated resources (b).
+        The coupled problem is the only task, so it is solved within the smaller of
+        `config.run_time_limit` and `config.task_time_limit`.
 
         :param data: The CenterData object containing configuration for the center problem.
         """
@@ -29,6 +33,10 @@ def __init__(self, data: CenterData) -> None:
         self.solver = Solver.CreateSolver("GLOP")
         self.solved: bool = False
         self.status: int = -1
+        limits = [limit for limit in (data.config.run_time_limit, data.config.task_time_limit) if limit is not None]
+        self.time_limit: Optional[float] = min(limits) if limits else None
+        if self.time_limit is not None:
+            self.solver.SetTimeLimit(max(1, round(self.time_limit * 1000)))  # 0 ms would mean no limit
         self.solution: Optional[ElementSolution] = None
         self.y: List[List[Variable]] = [list() for _ in range(self.data.config.num_elements)]
         self.y_star: List[List[Variable]] = [list() for _ in range(self.data.config.num_elements)]
@@ -46,37 +54,92 @@ def modify_constraints(self, element_index: int, element_solver: ElementSolver)
 
         pass
 
-    def coordinate(self, tolerance: float = 1e-9) -> None:
+    def coordinate(self, tolerance: float = 1e-9, progress: Optional[Callable[[int, int], None]] = None) -> None:
         """
         Coordinate the optimization for the linked problem.
 
         This involves setting up and solving the single, coupled optimization problem.
-        After solving, it populates `self.element_solutions` based on the global solution.
+        After solving, it populates `self.element_solutions` based on the global solution,
+        computing the elements’ own quality functionals at once over the packed data,
+        and writes them to `config.results_stream_path` if it is set (see `results_stream`).
 
         :param tolerance: The tolerance for comparing floating-point numbers (not directly used in this method).
+        Without a solution, `self.run_status` is CANCELLED after `cancel`, or TIMED_OUT at the time limit.
+
+        :param tolerance: The tolerance for comparing floating-point numbers (not directly used in this method).
+        :param progress: Called with (1, 1) once the coupled problem, the only task, is solved.
         """
 
         self.setup()
         self.solve()
-
-        self.element_solutions = self.parallel_executor.execute(
-            [partial(
-                lambda e, data: ElementSolution(
-                    objective=calculate_element_own_quality(
-                        data.coeffs_functional, data.config.type,
-                        y_e := self.solution.plan.get("y")[e] if self.solution.plan.get("y") else list(),
-                        y_star_e := self.solution.plan.get("y_star")[e] if self.solution.plan.get("y_star") else None
-                    ),
-                    plan={
-                        "y_e": y_e,
-                        "y_star_e": y_star_e,
-                        "b_e": self.solution.plan.get("b")[e] if self.solution.plan.get("b") else list()
-                    }
-                ),
-                e, element_data
+        if self.solution.plan:
+            self.run_status = ExecutionStatus.COMPLETED
+        elif self.parallel_executor.token.cancelled:
+            self.run_status = ExecutionStatus.CANCELLED
+        elif self.status == Solver.NOT_SOLVED and self.time_limit is not None:
+            self.run_status = ExecutionStatus.TIMED_OUT
+        else:
+            self.run_status = ExecutionStatus.COMPLETED  # infeasible
+        self.element_statuses = [self.run_status] * self.data.config.num_elements
+
+        y, y_star, b = (self.solution.plan.get(key) or [list() for _ in self.data.elements]
+                        for key in ("y", "y_star", "b"))
+        element_qf = self.packed.element_quality(self.packed.pack_plans(y), self.packed.pack_plans(y_star))
+
+        self.element_solutions = [
+            ElementSolution(
+                objective=float(element_qf[e]) if y[e] else float("-inf"),
+                plan={
+                    "y_e": y[e],
+                    "y_star_e": y_star[e],
+                    "b_e": b[e],
+                }
             )
-                for e, element_data in enumerate(self.data.elements)]
-        )
+            for e in range(self.data.config.num_elements)
+        ]
+        with self.results_stream() as write:
+            for e, solution in enumerate(self.element_solutions):
+                write(e, solution)
+        if progress is not None:
+            progress(1, 1)
+
+    def coordinate_stream(self, tolerance: float = 1e-9, progress: Optional[Callable[[int, int], None]] = None
+                          ) -> Iterator[Tuple[int, ElementSolution]]:
+        """
+        Coordinate the linked problem like `coordinate`, yielding the solutions of all elements once it is solved.
+
+        :param tolerance: The tolerance for comparing floating-point numbers (not directly used in this method).
+        :param progress: Called once the coupled problem is solved (see `coordinate`).
+        :return: An iterator of the index and the solution of every element.
+        """
+
+        if self.solution is None:
+            self.coordinate(tolerance, progress)
+        yield from enumerate(self.element_solutions)
+
+    def cancel(self) -> None:
+        """Stop the running coordination, interrupting the solve of the coupled problem (see `coordinate`)."""
+
+        super().cancel()
+        self.solver.InterruptSolve()
+
+    async def coordinate_async(self, pool: Optional[Executor] = None,
+                               tolerance: float = 1e-9) -> AsyncIterator[Tuple[int, ElementSolution]]:
+        """
+        Coordinate the linked problem like `coordinate`, on a thread of the event loop’s default executor.
+
+        The coupled problem is a single solve, so the solutions of all elements are yielded once it is done,
+        and cancelling the consuming task does not stop the solve.
+
+        :param pool: Unused; the coupled problem is not split into tasks.
+        :param tolerance: The tolerance for comparing floating-point numbers (not directly used in this method).
+        :return: An asynchronous iterator of the index and the solution of every element.
+        """
+
+        if self.solution is None:
+            await to_thread(self.coordinate, tolerance)
+        for e, solution in enumerate(self.element_solutions):
+            yield e, solution
 
     def setup_constraints(self) -> None:
         """
@@ -95,11 +158,10 @@ def setup_constraints(self) -> None:
 
         for e, (element) in enumerate(self.data.elements):
             if element.config.type == ElementType.DECENTRALIZED:
-                # Resource constraints: A_e * y_e <= b_e
-                for i in range(element.config.num_constraints):
+                # Resource constraints: A_e * y_e <= b_e (non-zero terms only)
+                for i, (columns, values) in enumerate(iter_rows(element.aggregated_plan_costs)):
                     self.solver.Add(
-                        lp_sum(element.aggregated_plan_costs[i][j] * self.y[e][j]
-                               for j in range(element.config.num_decision_variables))
+                        lp_sum(float(value) * self.y[e][j] for j, value in zip(columns, values))
                         <= self.b[e][i]
                     )
 
@@ -119,11 +181,10 @@ def setup_constraints(self) -> None:
                     >= self.data.f[e]
                 )
             else:
-                # Resource constraints: A_e * (y_e + y_star_e) <= b_e
-                for i in range(element.config.num_constraints):
+                # Resource constraints: A_e * (y_e + y_star_e) <= b_e (non-zero terms only)
+                for i, (columns, values) in enumerate(iter_rows(element.aggregated_plan_costs)):
                     self.solver.Add(
-                        lp_sum(element.aggregated_plan_costs[i][j] * (self.y[e][j] + self.y_star[e][j])
-                               for j in range(element.config.num_decision_variables))
+                        lp_sum(float(value) * (self.y[e][j] + self.y_star[e][j]) for j, value in zip(columns, values))
                         <= self.b[e][i]
                     )
 
@@ -220,7 +281,7 @@ def solve(self) -> ElementSolution:
         If the problem has not been set up, it raises a RuntimeError.
         If not already solved, it calls the OR-Tools solver.
         If an optimal solution is found, it stores and returns the objective value and solution variables.
-        Otherwise, it returns an ElementSolution with default (no solution) values.
+        Otherwise, or after `cancel`, it returns an ElementSolution with default (no solution) values.
 
         :raises RuntimeError: If `setup()` has not been called first.
         :return: An ElementSolution object containing the objective value and a dictionary of solution variables
@@ -232,7 +293,8 @@ def solve(self) -> ElementSolution:
 
         if not self.solved:
             self.solved = True
-            self.status = self.solver.Solve()
+            if not self.parallel_executor.token.cancelled:  # an interruption before the solve would be lost
+                self.status = self.solver.Solve()
             if self.status in (Solver.OPTIMAL, Solver.FEASIBLE):
                 self.solution = ElementSolution(self.solver.Objective().Value(), {
                     "y": [[v.solution_value() for v in y_e] for y_e in self.y],
@@ -255,8 +317,9 @@ def quality_functional(self) -> Tuple[str, float]:
                  and the total sum as a float.
         """
 
-        sums = [sum(d * y for d, y in zip(self.data.coeffs_functional[e], sol))
-                for e, sol in enumerate(self.solution.plan.get("y")) if sol is not None]
+        y = self.solution.plan.get("y") or [list() for _ in self.data.elements]
+        sums = self.packed.center_quality(self.packed.pack_plans(y))
+        sums = sums[~isnan(sums)].tolist()
         return stringify(sums), sum(sums)
 
     def print_results(self, print_details: bool = True, tolerance: float = 1e-9) -> None:
@@ -1,20 +1,89 @@
 from abc import abstractmethod
+from concurrent.futures import Executor
+from contextlib import contextmanager, nullcontext
+from dataclasses import replace
 from functools import partial
-from typing import Tuple, List, Callable, Dict, Any
-
-from comp.models import CenterData, ElementData, ElementSolution
-from comp.parallelization import ParallelExecutor, get_order
+from json import dumps
+from time import perf_counter
+from typing import Tuple, List, Callable, Dict, Any, AsyncIterator, Iterator, Optional, Sequence
+
+from numpy import isnan, ndarray
+
+from comp.models import CenterConfig, CenterData, ElementData, ElementSolution, ExecutionStatus, PackedCenterData
+from comp.parallelization import (ExecutionPlanner, ParallelExecutor, RuntimeHistory, SharedArena, allot_threads,
+                                  blend_durations, get_order, new_scheduler, worker_cache)
+from comp.parallelization.planner import (default_seconds_per_unit, measure_cpu_speeds, measure_node_speeds,
+                                          usable_cpus)
+from comp.parallelization.core import effective_problem_sizes, estimate_durations, estimate_memory
 from comp.solvers.core.element import ElementSolver
-from comp.solvers.factories import new_element_solver
-from comp.utils import (assert_non_negative, assert_positive, assert_valid_dimensions, get_lp_problem_sizes,
-                        stringify, tab_out, save_to_json as global_save_json_util)
+from comp.solvers.factories import new_element_solver, take_element_solver
+from comp.utils import (assert_non_negative, assert_positive, assert_valid_dimensions, json_serializer, stringify,
+                        tab_out, save_to_json as global_save_json_util)
 from .base import BaseSolver
 
+# GLOP configuration of the speculative copies of straggling element tasks: the dual instead of the primal simplex,
+# which often avoids the degenerate pivoting that stalls the original run
+BACKUP_SOLVER_PARAMETERS = "use_dual_simplex: true"
+
+# Plan vectors of an element in the shared result buffer (y_e and y_star_e, see `write_plan`)
+PLAN_BUFFER_ROWS = 2
+
+
+def write_plan(solution: ElementSolution, buffer: ndarray) -> ElementSolution:
+    """
+    Move the plan vectors of a solution into a shared result buffer.
+
+    :param solution: The solution of an element.
+    :param buffer: The (`PLAN_BUFFER_ROWS`, number of variables) block of the element in the result buffer.
+    :return: The solution whose plan vectors are rows of the buffer, which are pickled as handles (see `SharedArray`);
+             vectors that do not fit stay lists.
+    """
+
+    plan = dict(solution.plan)
+    for row, (key, values) in enumerate(solution.plan.items()):
+        if row < len(buffer) and len(values) == buffer.shape[1]:
+            buffer[row] = values
+            plan[key] = buffer[row]
+    return replace(solution, plan=plan)
+
+
+def read_plan(solution: Optional[ElementSolution]) -> Optional[ElementSolution]:
+    """
+    Copy the plan vectors of a solution out of the shared result buffer (see `write_plan`).
+
+    :param solution: The solution of an element, None for a failed task.
+    :return: The solution with list plan vectors.
+    """
+
+    if solution is None or not any(isinstance(values, ndarray) for values in solution.plan.values()):
+        return solution
+    return replace(solution, plan={key: values.tolist() if isinstance(values, ndarray) else values
+                                   for key, values in solution.plan.items()})
+
+
+def overall_status(statuses: Sequence[ExecutionStatus]) -> ExecutionStatus:
+    """
+    Get the outcome of a run from the outcomes of its elements.
+
+    :param statuses: The status of every element.
+    :return: CANCELLED if any element was cancelled, otherwise TIMED_OUT if any timed out,
+             otherwise FAILED if any failed, otherwise COMPLETED.
+    """
+
+    for status in (ExecutionStatus.CANCELLED, ExecutionStatus.TIMED_OUT, ExecutionStatus.FAILED):
+        if status in statuses:
+            return status
+    return ExecutionStatus.COMPLETED
+
 
 def execute_solution_from_callable(
         element_index: int,
         element_data: ElementData,
         modify_constraints: Callable[[int, ElementSolver], None],
+        solver_parameters: Optional[str] = None,
+        reuse_model: bool = False,
+        threads: int = 1,
+        plan_buffer: Optional[ndarray] = None,
 ) -> ElementSolution:
     """
     Create, configure, and solve an element solver, then return its solution.
@@ -27,12 +96,76 @@ def execute_solution_from_callable(
     :param element_data: The ElementData for the specific element.
     :param modify_constraints: A callable that takes the element index and the
                                ElementSolver instance to apply specific constraints or objective modifications.
+    :param solver_parameters: GLOP parameters in protobuf text format (e.g., `BACKUP_SOLVER_PARAMETERS`),
+                              None for the defaults.
+    :param reuse_model: If True, the model built by an earlier task of the element on this worker is reused
+                        (see `take_element_solver`); it is not kept, since `modify_constraints` may add constraints.
+                        A multi-threaded solve always builds a new model, as the cached ones are single-threaded.
+    :param threads: The number of threads of the element solver (see `ElementSolver`).
+    :param plan_buffer: The block of the element in the shared result buffer that receives the plan vectors
+                        (see `write_plan`), None to return them as lists.
     :return: A tuple containing the objective value (float) and a dictionary
              representing the solution variables (e.g., {"y_e": [values]}).
     """
 
-    modify_constraints(element_index, element_solver := new_element_solver(element_data))
-    return element_solver.solve()
+    element_solver = take_element_solver(element_data) if reuse_model and threads == 1 \
+        else new_element_solver(element_data, threads)
+    modify_constraints(element_index, element_solver)
+    if solver_parameters is not None:
+        element_solver.solver.SetSolverSpecificParametersAsString(solver_parameters)
+    solution = element_solver.solve()
+    return solution if plan_buffer is None else write_plan(solution, plan_buffer)
+
+
+def resolve_worker_speeds(
+        config: CenterConfig) -> Tuple[Optional[List[float]], Optional[List[int]], Optional[List[str]]]:
+    """
+    Get the speeds, the CPUs and the nodes of the threads of a center, fastest first.
+
+    Thread t runs on the t-th node of `config.worker_nodes` if set (the DISTRIBUTED backend), otherwise on the t-th CPU
+    of `usable_cpus` if there are enough of them to give every thread its own CPU.
+    Its speed is `config.worker_speeds[t]`, or measured on its node or CPU with `config.measure_worker_speeds`
+    (see `measure_node_speeds` and `measure_cpu_speeds`), so `get_order` balances the tasks across the nodes.
+
+    :param config: The center configuration.
+    :return: The speeds (None for identical threads), the CPUs (None if the threads are not pinned)
+             and the node addresses (None without nodes).
+    """
+
+    nodes = list(config.worker_nodes)[:config.num_threads] if config.worker_nodes is not None else None
+    if config.worker_speeds is None and not config.measure_worker_speeds:
+        return None, None, nodes
+
+    cpus: Optional[List[int]] = usable_cpus()[:config.num_threads] if nodes is None else None
+    if cpus is not None and len(cpus) < config.num_threads:
+        cpus = None
+    if config.measure_worker_speeds:
+        speeds = measure_node_speeds(tuple(nodes)) if nodes is not None \
+            else measure_cpu_speeds(tuple(cpus)) if cpus is not None else None
+    else:
+        speeds = list(config.worker_speeds)
+        assert len(speeds) == config.num_threads, f"Expected {config.num_threads} worker speeds, got {len(speeds)}"
+    if speeds is None:
+        return None, None, nodes
+
+    ranking = sorted(range(len(speeds)), key=lambda t: speeds[t], reverse=True)
+    return ([speeds[t] for t in ranking], [cpus[t] for t in ranking] if cpus is not None else None,
+            [nodes[t] for t in ranking] if nodes is not None else None)
+
+
+def apply_task_time_limit(data: CenterData) -> CenterData:
+    """
+    Give every element without a time limit of its own the `config.task_time_limit` of the center.
+
+    :param data: The center data.
+    :return: The data with the element time limits set (see `ElementConfig.time_limit`), or `data` without a limit.
+    """
+
+    if data.config.task_time_limit is None:
+        return data
+    return replace(data, elements=[element if element.config.time_limit is not None else replace(
+        element, config=replace(element.config, time_limit=data.config.task_time_limit))
+        for element in data.elements])
 
 
 class CenterSolver(BaseSolver[CenterData]):
@@ -42,21 +175,56 @@ def __init__(self, data: CenterData) -> None:
         """
         Initialize the CenterSolver.
 
-        Sets up the base solver, initializes lists for element solutions and solvers,
-        determines the parallelization order for elements, and creates a ParallelExecutor instance.
+        Packs the data (see `PackedCenterData`) and estimates the duration of every element task,
+        from the effective size of its strategy-specific problem (see `effective_problem_sizes`)
+        or from its durations in previous runs (see `RuntimeHistory`), and its peak memory (see `estimate_memory`).
+        The tasks are scheduled on the threads (see `get_order` and `resolve_worker_speeds`),
+        where huge tasks may take several threads (see `allot_threads`), and run by a `ParallelExecutor`.
+        The scheduling and execution options are the fields of `CenterConfig`.
 
         :param data: The CenterData object containing configuration for the center problem.
         """
 
+        data = apply_task_time_limit(data)
+        self.packed = PackedCenterData.from_center_data(data)
+
         super().__init__(data)
 
         self.element_solutions: List[ElementSolution] = list()
         self.element_solvers: List[ElementSolver] = list()
-        self.order = get_order(get_lp_problem_sizes(data.elements), data.config.num_threads)
+        self.run_status: Optional[ExecutionStatus] = None  # outcome of the coordination (see `coordinate`)
+        self.element_statuses: List[ExecutionStatus] = list()  # outcome of every element
+        self.runtime_history: Optional[RuntimeHistory] = RuntimeHistory.load(
+            data.config.runtime_history_path) if data.config.runtime_history_path else None
+        observed = [self.runtime_history.estimate(RuntimeHistory.key(data.config.type.name, element_data))
+                    for element_data in data.elements] if self.runtime_history is not None else None
+        sizes = effective_problem_sizes(self.packed, data.config.type)
+        self.worker_speeds, self.worker_cpus, self.worker_nodes = resolve_worker_speeds(data.config)
+        self.order = get_order(sizes, data.config.num_threads, observed=observed,
+                               scheduler=new_scheduler(data.config.scheduler, self.worker_speeds))
+        self.costs = estimate_durations(sizes) if observed is None else blend_durations(
+            estimate_durations(sizes), observed)
+        self.memory = estimate_memory(sizes)
+        self.allotment: Optional[List[int]] = allot_threads(
+            self.costs, data.config.num_threads, data.config.max_element_threads) \
+            if data.config.max_element_threads > 1 else None
         self.parallel_executor = ParallelExecutor(
             min_threshold=data.config.min_parallelisation_threshold,
             num_threads=data.config.num_threads,
             order=self.order,
+            mode=data.config.execution_mode,
+            costs=self.costs,
+            speculation_factor=data.config.speculation_factor,
+            planner=ExecutionPlanner(1. if observed is not None and any(o is not None for o in observed)
+                                     else default_seconds_per_unit()),
+            memory=self.memory,
+            memory_budget=data.config.memory_budget,
+            speeds=self.worker_speeds,
+            cpus=self.worker_cpus,
+            nodes=self.worker_nodes,
+            backend=data.config.execution_backend,
+            max_retries=data.config.max_task_retries,
+            isolate_crashes=data.config.isolate_crashed_tasks,
         )
 
     @abstractmethod
@@ -79,17 +247,67 @@ def quality_functional(self) -> Tuple[str, float]:
 
         This is typically the sum of (d_e^T * y_e) over all elements, where d_e are
         the center’s coefficients for element e, and y_e is element e’s plan.
+        The sums are computed at once over the packed data (see `PackedCenterData.center_quality`).
         Returns both a string representation of individual sums and the total sum.
 
-        :return: A tuple containing a string representation of the sums for each element
+        :return: A tuple containing a string representation of the sums for each element with a plan
                  and the total sum as a float.
         """
 
-        sums = [sum(d * y for d, y in zip(self.data.coeffs_functional[e], sol.plan.get("y_e")))
-                for e, sol in enumerate(self.element_solutions) if sol is not None]
+        sums = self.packed.center_quality(self.packed.pack_plans(
+            [sol.plan.get("y_e") if sol is not None else None for sol in self.element_solutions]))
+        sums = sums[~isnan(sums)].tolist()
         return stringify(sums), sum(sums)
 
-    def coordinate(self, tolerance: float = 1e-9) -> None:
+    def preliminary_tasks(self) -> Dict[str, List[Callable[[], Any]]]:
+        """
+        Get the per-element tasks computing the values that `modify_constraints` depends on.
+
+        :return: The task of every element by the name of the attribute that holds their results
+                 (e.g., "f_el_opt"); empty by default.
+        """
+
+        return dict()
+
+    def preliminary_value(self, name: str, element_index: int) -> Any:
+        """
+        Get a preliminary value of an element that `modify_constraints` depends on (see `preliminary_tasks`).
+
+        :param name: The name of the attribute holding the values, e.g., "f_el_opt".
+        :param element_index: The index of the element.
+        :raises RuntimeError: If the value is not known, i.e., neither `coordinate`
+                              nor `compute_preliminary_values` ran.
+        :return: The preliminary value of the element.
+        """
+
+        if (value := getattr(self, name)[element_index]) is None:
+            raise RuntimeError(f"The {name} value of element {element_index} is not known. "
+                               f"Run coordinate() or compute_preliminary_values() before modify_constraints().")
+        return value
+
+    def compute_preliminary_values(self) -> None:
+        """
+        Run the `preliminary_tasks` one after another in the calling process and store their values,
+        so single elements can be solved without `coordinate` (see `solve_element`).
+        """
+
+        for name, tasks in self.preliminary_tasks().items():
+            setattr(self, name, [task() for task in tasks])
+
+    def solve_element(self, element_index: int) -> ElementSolution:
+        """
+        Solve the problem of one element as `coordinate` does, in the calling process, e.g., to time it.
+
+        :param element_index: The index of the element.
+        :raises RuntimeError: If the preliminary values of the element are not known (see `compute_preliminary_values`).
+        :return: The solution of the element.
+        """
+
+        return execute_solution_from_callable(
+            element_index, self.data.elements[element_index], self.modify_constraints,
+            threads=self.allotment[element_index] if self.allotment is not None else 1)
+
+    def coordinate(self, tolerance: float = 1e-9, progress: Optional[Callable[[int, int], None]] = None) -> None:
         """
         Coordinate the optimization process for all elements.
 
@@ -97,18 +315,288 @@ def coordinate(self, tolerance: float = 1e-9) -> None:
         element, potentially in parallel.
         It uses the `execute_solution_from_callable` function, passing `self.modify_constraints
         ` to tailor each element’s problem.
-        The results are stored in `self.element_solutions`.
+        The `preliminary_tasks` of the strategy and the element tasks form per-element chains
+        (see `ParallelExecutor.execute_graph`): element e is solved as soon as its own preliminary values are known.
+        Speculative copies of straggling tasks (see `config.speculation_factor`) use `BACKUP_SOLVER_PARAMETERS`;
+        they need independent tasks, so with speculation the phases run one after another instead.
+        With `config.worker_affinity`, all tasks of an element run on the same worker and reuse its model.
+        The element tasks run with the threads of `self.allotment`, the preliminary tasks with one thread.
+        With `config.shared_memory_transport`, they write their plans into a shared buffer (see `shared_transport`).
+        The results are stored in `self.element_solutions`, and with `config.results_stream_path` also written
+        to disk one by one as the elements are solved (see `results_stream`).
+        Once `config.run_time_limit` has passed, or after `cancel`, the unfinished tasks are stopped
+        and the coordination ends with the solutions found so far. `self.run_status` and `self.element_statuses`
+        tell whether it completed, and which elements timed out (also at `config.task_time_limit`), were cancelled,
+        or failed as their workers kept dying (see `config.max_task_retries`).
+
+        :param tolerance: The tolerance for comparing floating-point numbers.
+        :param progress: Called with the number of completed tasks and the number of all tasks
+                         (preliminary and element tasks) after every task, e.g., to drive a progress bar.
+        """
+
+        for _ in self.coordinate_stream(tolerance, progress):
+            pass
+
+    def coordinate_stream(self, tolerance: float = 1e-9, progress: Optional[Callable[[int, int], None]] = None
+                          ) -> Iterator[Tuple[int, ElementSolution]]:
+        """
+        Coordinate the elements like `coordinate`, yielding the solution of every element as soon as it is solved.
+
+        The tasks run through `ParallelExecutor.execute_graph_stream` (`execute_stream` without preliminary tasks),
+        so the results arrive per task, also within the groups of the static schedule;
+        only with speculation the element tasks report together once the batch is done.
+        `self.element_solutions` is complete once the iteration ends;
+        closing the iterator early cancels the tasks not started yet and leaves the center uncoordinated.
+
+        :param tolerance: The tolerance for comparing floating-point numbers.
+        :param progress: Called after every task (see `coordinate`).
+        :return: An iterator of the index and the solution of every element, in the order of completion;
+                 all stored solutions at once if the center is already coordinated.
         """
 
         if self.setup_done:
+            yield from enumerate(self.element_solutions)
             return
 
-        self.element_solutions = self.parallel_executor.execute(
-            [partial(execute_solution_from_callable, e, element_data, self.modify_constraints)
-             for e, element_data in enumerate(self.data.elements)])
-
+        limit = self.data.config.run_time_limit
+        self.parallel_executor.deadline = None if limit is None else perf_counter() + limit
+        with self.shared_transport() as plan_buffers, self.results_stream() as write:
+            for e, solution in self._coordinate_elements(plan_buffers or [None] * len(self.data.elements), tolerance,
+                                                         progress or (lambda done, total: None)):
+                write(e, solution)
+                yield e, solution
+        self.run_status = overall_status(self.element_statuses)
         self.setup_done = True
 
+    def cancel(self) -> None:
+        """
+        Stop the running coordination, e.g., from the thread of a GUI.
+
+        The tasks not started yet are cancelled and process workers are terminated at once
+        (see `ParallelExecutor.cancel`); the coordination ends with the solutions found so far
+        and the status CANCELLED. Cancellation is final, a new coordination needs a new solver.
+        """
+
+        self.parallel_executor.cancel()
+
+    async def coordinate_async(self, pool: Optional[Executor] = None,
+                               tolerance: float = 1e-9) -> AsyncIterator[Tuple[int, ElementSolution]]:
+        """
+        Coordinate the elements like `coordinate`, without blocking the event loop.
+
+        The preliminary tasks and then the element tasks run through `ParallelExecutor.execute_async`,
+        on `pool` if given, so many concurrent coordinations can share one pool, or on a pool of their own.
+        The solution of every element is yielded as soon as its task completes, and `self.element_solutions`
+        is complete once the iteration ends. Cancelling the consuming task cancels the element tasks not started yet;
+        the center then stays uncoordinated. The element tasks run single-threaded, and the shared memory transport
+        (see `shared_transport`) is only used with a pool of their own, whose workers exit with the run.
+
+        :param pool: The pool of the tasks, with `config.num_threads` workers; None for a pool of their own.
+        :param tolerance: The tolerance for comparing floating-point numbers.
+        :return: An asynchronous iterator of the index and the solution of every element, in the order of completion;
+                 all stored solutions at once if the center is already coordinated.
+        """
+
+        if not self.setup_done:
+            limit = self.data.config.run_time_limit
+            self.parallel_executor.deadline = None if limit is None else perf_counter() + limit
+            with self.shared_transport() if pool is None else nullcontext() as plan_buffers:
+                async for e, solution in self._coordinate_elements_async(
+                        plan_buffers or [None] * len(self.data.elements), tolerance, pool):
+                    yield e, solution
+            self.run_status = overall_status(self.element_statuses)
+            self.setup_done = True
+            return
+        for e, solution in enumerate(self.element_solutions):
+            yield e, solution
+
+    @contextmanager
+    def shared_transport(self) -> Iterator[Optional[List[ndarray]]]:
+        """
+        Hand the data to process workers through shared memory while the context is active,
+        if `config.shared_memory_transport` is set.
+
+        All arrays of `self.data` and `self.packed` are copied once into a `SharedArena`, so the tasks
+        (which reference this solver) are pickled with handles instead of the arrays,
+        and every element gets a block of a shared result buffer for its plan vectors (see `write_plan`).
+        The segments are unlinked when the context exits, also after failed or crashed workers.
+
+        :return: The plan buffer block of every element, None without the transport.
+        """
+
+        if not self.data.config.shared_memory_transport:
+            yield None
+            return
+
+        data, packed, rows = self.data, self.packed, PLAN_BUFFER_ROWS
+        with SharedArena() as arena:
+            try:
+                self.data, self.packed = arena.share(data), arena.share(packed)
+                offsets = packed.var_offsets.tolist()
+                buffer = arena.allocate(rows * offsets[-1])
+                yield [buffer[rows * start:rows * end].reshape(rows, end - start)
+                       for start, end in zip(offsets, offsets[1:])]
+            finally:
+                self.data, self.packed = data, packed
+                worker_cache.clear()
+
+    @contextmanager
+    def results_stream(self) -> Iterator[Callable[[int, ElementSolution], None]]:
+        """
+        Write the solutions of the elements to `config.results_stream_path` while the context is active, if it is set.
+
+        Every solution is written as one line of JSON (`{"element": e, "solution": ...}`) and flushed at once,
+        so the solutions found so far survive a stopped or failed run; every coordination replaces the file.
+
+        :return: A function writing the solution of an element, which does nothing without the path.
+        """
+
+        if (path := self.data.config.results_stream_path) is None:
+            yield lambda element_index, solution: None
+            return
+
+        with open(path, "w") as file:
+            def write(element_index: int, solution: ElementSolution) -> None:
+                """Append the solution of an element to the file."""
+
+                file.write(dumps({"element": element_index, "solution": solution}, default=json_serializer) + "\n")
+                file.flush()
+
+            yield write
+
+    def _coordinate_elements(self, plan_buffers: List[Optional[ndarray]], tolerance: float,
+                             progress: Callable[[int, int], None]) -> Iterator[Tuple[int, ElementSolution]]:
+        """
+        Run the preliminary and the element tasks (see `coordinate_stream`).
+
+        :param plan_buffers: The block of the shared result buffer of every element, None for list plans.
+        :param tolerance: The tolerance for comparing floating-point numbers.
+        :param progress: Called with the number of completed and of all tasks after every task.
+        :return: An iterator of the index and the solution of every element, in the order of completion.
+        """
+
+        preliminary, num_elements = self.preliminary_tasks(), len(self.data.elements)
+        reuse_model = self.data.config.worker_affinity
+        affinity = list(range(num_elements)) if reuse_model else None
+        done, total = 0, (len(preliminary) + 1) * num_elements
+        self.element_solutions = [ElementSolution() for _ in self.data.elements]
+        if preliminary and self.data.config.speculation_factor is None:
+            names = list(preliminary)
+            tasks = [task for name in names for task in preliminary[name]]
+            for name in names:
+                setattr(self, name, [None] * num_elements)
+            for i, result in self.parallel_executor.execute_graph_stream(
+                    tasks + [partial(self._solve_chained_element, names, e, element_data, plan_buffers[e])
+                             for e, element_data in enumerate(self.data.elements)],
+                    [list() for _ in tasks] + [[n * num_elements + e for n in range(len(names))]
+                                               for e in range(num_elements)],
+                    list(self.costs) * (len(names) + 1), None if affinity is None else affinity * (len(names) + 1),
+                    self.memory * (len(names) + 1),
+                    None if self.allotment is None else [1] * len(tasks) + self.allotment):
+                progress(done := done + 1, total)
+                if i < len(tasks):
+                    getattr(self, names[i // num_elements])[i % num_elements] = result
+                else:
+                    self.element_solutions[(e := i - len(tasks))] = read_plan(result)
+                    yield e, self.element_solutions[e]
+        else:
+            for name, tasks in preliminary.items():
+                setattr(self, name, self.parallel_executor.execute(tasks, affinity=affinity))
+                progress(done := done + len(tasks), total)
+            tasks = [partial(execute_solution_from_callable, e, element_data, self.modify_constraints, None,
+                             reuse_model, self.allotment[e] if self.allotment is not None else 1, plan_buffers[e])
+                     for e, element_data in enumerate(self.data.elements)]
+            if self.data.config.speculation_factor is None:
+                results = self.parallel_executor.execute_stream(tasks, affinity=affinity, allotment=self.allotment)
+            else:
+                results = enumerate(self.parallel_executor.execute(
+                    tasks, backups=[partial(execute_solution_from_callable, e, element_data, self.modify_constraints,
+                                            BACKUP_SOLVER_PARAMETERS, plan_buffer=plan_buffers[e])
+                                    for e, element_data in enumerate(self.data.elements)],
+                    affinity=affinity, allotment=self.allotment))
+            for e, solution in results:
+                self.element_solutions[e] = read_plan(solution)
+                progress(done := done + 1, total)
+                yield e, self.element_solutions[e]
+        self.element_statuses = self._element_statuses(self.parallel_executor.statuses[-num_elements:])
+        self.record_runtimes(self.parallel_executor.durations[-num_elements:])
+        worker_cache.clear()
+
+    def _element_statuses(self, task_statuses: Sequence[ExecutionStatus]) -> List[ExecutionStatus]:
+        """
+        Get the outcome of every element from the outcome of its task and its solution.
+
+        :param task_statuses: The status of the task of every element (see `ParallelExecutor.statuses`).
+        :return: The status of every element: TIMED_OUT also for a completed task whose solve timed out.
+        """
+
+        return [ExecutionStatus.TIMED_OUT if status == ExecutionStatus.COMPLETED and solution is not None
+                and solution.timed_out else status for status, solution in zip(task_statuses, self.element_solutions)]
+
+    async def _coordinate_elements_async(self, plan_buffers: List[Optional[ndarray]], tolerance: float,
+                                         pool: Optional[Executor]) -> AsyncIterator[Tuple[int, ElementSolution]]:
+        """
+        Run the preliminary and the element tasks without blocking the event loop (see `coordinate_async`).
+
+        :param plan_buffers: The block of the shared result buffer of every element, None for list plans.
+        :param tolerance: The tolerance for comparing floating-point numbers.
+        :param pool: The shared pool of the tasks, None for a pool of their own.
+        :return: An asynchronous iterator of the index and the solution of every element, in the order of completion.
+        """
+
+        for name, tasks in self.preliminary_tasks().items():
+            values = [None] * len(tasks)
+            async for i, value in self.parallel_executor.execute_async(tasks, pool=pool):
+                values[i] = value
+            setattr(self, name, values)
+
+        self.element_solutions = [ElementSolution() for _ in self.data.elements]
+        async for e, solution in self.parallel_executor.execute_async(
+                [partial(execute_solution_from_callable, e, element_data, self.modify_constraints,
+                         plan_buffer=plan_buffers[e]) for e, element_data in enumerate(self.data.elements)],
+                pool=pool):
+            self.element_solutions[e] = read_plan(solution)
+            yield e, self.element_solutions[e]
+        self.element_statuses = self._element_statuses(self.parallel_executor.statuses)
+        self.record_runtimes(self.parallel_executor.durations)
+        worker_cache.clear()
+
+    def _solve_chained_element(self, names: List[str], element_index: int, element_data: ElementData,
+                               plan_buffer: Optional[ndarray], *values: Any) -> ElementSolution:
+        """
+        Solve an element once its preliminary values are known (the last task of its chain in `coordinate`).
+
+        :param names: The names of the attributes of the preliminary values (see `preliminary_tasks`).
+        :param element_index: The index of the element.
+        :param element_data: The ElementData for the element.
+        :param plan_buffer: The block of the element in the shared result buffer, None for list plans.
+        :param values: The preliminary value of the element for every name.
+        :return: The solution of the element (see `execute_solution_from_callable`).
+        """
+
+        for name, value in zip(names, values):
+            getattr(self, name)[element_index] = value
+        return execute_solution_from_callable(
+            element_index, element_data, self.modify_constraints, reuse_model=self.data.config.worker_affinity,
+            threads=self.allotment[element_index] if self.allotment is not None else 1, plan_buffer=plan_buffer)
+
+    def record_runtimes(self, durations: Sequence[Optional[float]]) -> None:
+        """
+        Record the measured duration of every element task in the runtime history and save it.
+
+        Does nothing if `config.runtime_history_path` is not set.
+
+        :param durations: The duration of every element in seconds, None where it was not measured.
+        """
+
+        if self.runtime_history is None:
+            return
+
+        for element_data, duration in zip(self.data.elements, durations):
+            if duration is not None:
+                self.runtime_history.record(RuntimeHistory.key(self.data.config.type.name, element_data), duration)
+        self.runtime_history.save(self.data.config.runtime_history_path)
+
     def print_results(self, print_details: bool = True, tolerance: float = 1e-9) -> None:
         """
         Print the comprehensive results of the center’s optimization problem.
@@ -132,7 +620,12 @@ def print_results(self, print_details: bool = True, tolerance: float = 1e-9) ->
             ("Center Functional Coefficients", stringify(self.data.coeffs_functional)),
             ("Center Min Parallelization Threshold", stringify(self.data.config.min_parallelisation_threshold)),
             ("Center Number of Threads", stringify(self.data.config.num_threads)),
+            ("Center Worker Speeds", stringify(self.worker_speeds)),
+            ("Center Worker Nodes", stringify(self.worker_nodes)),
+            ("Center Element Threads", stringify(self.allotment)),
             ("Center Parallelization Order", stringify(self.order)),
+            ("Center Execution Plan", str(self.parallel_executor.plan)),
+            ("Center Coordination Status", stringify(self.run_status)),
         ]
 
         if (self.data.global_resource_constraints is not None
@@ -154,7 +647,8 @@ def validate_input(self) -> None:
         Validate the input data for the center optimization problem.
 
         Checks dimensions of `coeffs_functional` and `elements` against `num_elements`.
-        Ensures `num_elements` is positive and `id` is non-negative.
+        Ensures `num_elements` is positive and `id` is non-negative, and that every thread has a node if nodes are set.
+        Validates all elements at once over the packed data (see `PackedCenterData.validate`).
         """
 
         assert_valid_dimensions(
@@ -174,10 +668,29 @@ def validate_input(self) -> None:
             self.data.config.num_threads,
             "data.config.num_threads"
         )
+        if self.data.config.min_parallelisation_threshold is not None:
+            assert_positive(
+                self.data.config.min_parallelisation_threshold,
+                "data.config.min_parallelisation_threshold"
+            )
         assert_positive(
-            self.data.config.min_parallelisation_threshold,
-            "data.config.min_parallelisation_threshold"
+            self.data.config.max_element_threads,
+            "data.config.max_element_threads"
         )
+        assert_non_negative(
+            self.data.config.max_task_retries,
+            "data.config.max_task_retries"
+        )
+        for name in ("task_time_limit", "run_time_limit"):
+            if getattr(self.data.config, name) is not None:
+                assert_positive(
+                    getattr(self.data.config, name),
+                    f"data.config.{name}"
+                )
+        if self.data.config.worker_nodes is not None:
+            assert len(self.data.config.worker_nodes) >= self.data.config.num_threads, \
+                f"Expected a node for each of the {self.data.config.num_threads} threads"
+        self.packed.validate()
 
         if self.data.global_resource_constraints is not None and self.data.f is not None:
             assert_valid_dimensions(
@@ -223,6 +736,8 @@ def get_results_dict(self) -> Dict[str, Any]:
             "center_type": self.data.config.type.name,
             "num_elements": self.data.config.num_elements,
             "parallelization_order": self.order,
+            "run_status": None if self.run_status is None else self.run_status.name,
+            "element_statuses": [status.name for status in self.element_statuses],
             "element_results": list(map(lambda solver: solver.get_results_dict(), self.element_solvers)),
             "center_quality_functional_summary_str": center_qf_str,
             "center_quality_functional_total": center_qf_val,
@@ -1,7 +1,7 @@
 from abc import abstractmethod
 from typing import Dict, Optional, List, Any
 
-from ortools.linear_solver.pywraplp import Solver, Variable
+from ortools.linear_solver.pywraplp import MPSolverParameters, Solver, Variable
 
 from comp.models import ElementData, ElementSolution
 from comp.utils import (
@@ -13,26 +13,39 @@
 )
 from .base import BaseSolver
 
+# OR-Tools backend of elements solved with several threads: the first-order PDLP method parallelizes its
+# matrix-vector products, while the GLOP simplex is single-threaded (PDLP meets its tolerances, not exact optimality)
+MULTI_THREADED_BACKEND = "PDLP"
+
 
 class ElementSolver(BaseSolver[ElementData]):
     """Base class for all element’s solvers."""
 
-    def __init__(self, data: ElementData) -> None:
+    def __init__(self, data: ElementData, threads: int = 1) -> None:
         """
         Initialize the ElementSolver.
 
-        Sets up the base solver, creates an OR-Tools GLOP solver instance,
+        Sets up the base solver, creates an OR-Tools GLOP solver instance
+        (or a `MULTI_THREADED_BACKEND` instance with several threads) limited to `config.time_limit`,
         and initializes solution-related attributes.
 
         :param data: The ElementData object containing configuration for this element.
+        :param threads: The number of threads of the solver.
         """
 
         super().__init__(data)
 
-        self.solver = Solver.CreateSolver("GLOP")
+        assert_positive(threads, "threads")
+        self.solver = Solver.CreateSolver("GLOP" if threads == 1 else MULTI_THREADED_BACKEND)
+        if threads > 1:
+            self.solver.SetNumThreads(threads)
+        if data.config.time_limit is not None:
+            self.solver.SetTimeLimit(max(1, round(data.config.time_limit * 1000)))  # 0 ms would mean no limit
         self.solved: bool = False
         self.status: int = -1
         self.solution: Optional[ElementSolution] = None
+        self.model_built: bool = False  # variables and constraints are in the model (see `reuse`)
+        self.reused: bool = False  # the model was solved before, so its basis must not be reused (see `reuse`)
 
         self.y_e: List[Variable] = list()
 
@@ -121,7 +134,7 @@ def setup(self, set_variables: bool = True, set_constraints: bool = True, set_ob
 
         This orchestrates the setup process by optionally calling `setup_variables`,
         `setup_constraints`, and `setup_objective`.
-        It ensures setup is done only once.
+        It ensures setup is done only once; a reused model (see `reuse`) only gets its objective.
 
         :param set_variables: If True, call `setup_variables`.
         :param set_constraints: If True, call `setup_constraints`.
@@ -131,15 +144,33 @@ def setup(self, set_variables: bool = True, set_constraints: bool = True, set_ob
         if self.setup_done:
             return
 
-        if set_variables:
+        if set_variables and not self.model_built:
             self.setup_variables()
-        if set_constraints:
+        if set_constraints and not self.model_built:
             self.setup_constraints()
         if set_objective:
             self.setup_objective()
 
+        self.model_built = self.model_built or (set_variables and set_constraints)
         self.setup_done = True
 
+    def reuse(self, data: ElementData) -> None:
+        """
+        Prepare a built model for another solve with data of the same constraints (see `take_element_solver`).
+
+        The variables and constraints are kept, while the objective and the solution are cleared,
+        so the next `setup` only sets the objective.
+        The next solve does not start from the previous basis (incrementality off),
+        so it finds the same solution as a freshly built model.
+
+        :param data: The element data, which may differ from the current data in the functional coefficients only.
+        """
+
+        self.data = data
+        self.solver.Objective().Clear()
+        self.solved, self.status, self.solution = False, -1, None
+        self.setup_done, self.reused = False, True
+
     def solve(self) -> ElementSolution:
         """
         Solve the optimization problem for the element.
@@ -147,7 +178,8 @@ def solve(self) -> ElementSolution:
         If the problem has not been set up, it raises a RuntimeError.
         If not already solved, it calls the OR-Tools solver.
         If an optimal solution is found, it stores and returns the objective value and solution variables.
-        Otherwise, it returns infinity and an empty dictionary.
+        Otherwise, it returns infinity and an empty dictionary, marked `timed_out` if the solve stopped
+        at `config.time_limit`.
 
         :raises RuntimeError: If `setup()` has not been called first.
         :return: A tuple containing the objective value (float, or float("-inf") if no solution)
@@ -159,11 +191,15 @@ def solve(self) -> ElementSolution:
 
         if not self.solved:
             self.solved = True
-            self.status = self.solver.Solve()
+            parameters = MPSolverParameters()
+            if self.reused:
+                parameters.SetIntegerParam(MPSolverParameters.INCREMENTALITY, MPSolverParameters.INCREMENTALITY_OFF)
+            self.status = self.solver.Solve(parameters)
             if self.status in (Solver.OPTIMAL, Solver.FEASIBLE):
                 self.solution = ElementSolution(self.solver.Objective().Value(), self.get_plan())
             else:
-                self.solution = ElementSolution()
+                self.solution = ElementSolution(timed_out=self.status == Solver.NOT_SOLVED
+                                                and self.data.config.time_limit is not None)
 
         return self.solution
 
@@ -250,6 +286,11 @@ def validate_input(self) -> None:
             self.data.config.id,
             "data.config.id"
         )
+        if self.data.config.time_limit is not None:
+            assert_positive(
+                self.data.config.time_limit,
+                "data.config.time_limit"
+            )
         assert_positive(
             self.data.config.num_decision_variables,
             "data.config.num_decision_variables"
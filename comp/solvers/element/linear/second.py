@@ -2,24 +2,25 @@
 
 from ortools.linear_solver.pywraplp import Variable
 
-from comp.models import ElementData
+from comp.models import ElementData, iter_rows
 from comp.solvers.core.element import ElementSolver
-from comp.utils import stringify, tab_out
+from comp.utils import lp_sum, stringify, tab_out
 
 
 class ElementLinearSecond(ElementSolver):
     """Solver for element-level optimization problems. 2’nd linear model."""
 
-    def __init__(self, data: ElementData) -> None:
+    def __init__(self, data: ElementData, threads: int = 1) -> None:
         """
         Initialize the ElementLinearSecond solver.
 
         Calls the constructor of the base ElementSolver.
 
         :param data: The ElementData object for this element.
+        :param threads: The number of threads of the solver (see `ElementSolver`).
         """
 
-        super().__init__(data)
+        super().__init__(data, threads)
 
         self.y_star_e: List[Variable] = list()
 
@@ -46,11 +47,10 @@ def setup_constraints(self) -> None:
         Adds combined recourse bound constraints: y_e + y_star_e <= b_e_2.
         """
 
-        # Resource constraints: A_e * (y_e + y_star_e) <= b_e
-        for i in range(self.data.config.num_constraints):
+        # Resource constraints: A_e * (y_e + y_star_e) <= b_e (non-zero terms only)
+        for i, (columns, values) in enumerate(iter_rows(self.data.aggregated_plan_costs)):
             self.solver.Add(
-                sum(self.data.aggregated_plan_costs[i][j] * (self.y_e[j] + self.y_star_e[j])
-                    for j in range(self.data.config.num_decision_variables))
+                lp_sum(float(value) * (self.y_e[j] + self.y_star_e[j]) for j, value in zip(columns, values))
                 <= self.data.resource_constraints[0][i]
             )
 
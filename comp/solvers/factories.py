@@ -1,9 +1,14 @@
-from comp.models import ElementData, ElementType
+from hashlib import blake2b
+from typing import Tuple
+
+from comp.models import ElementData, ElementType, SparseMatrix
+from comp.parallelization import element_fingerprint
+from comp.parallelization.worker_cache import worker_cache
 from comp.solvers.core.element import ElementSolver
 from comp.solvers.element import ElementLinearFirst, ElementLinearSecond
 
 
-def new_element_solver(data: ElementData) -> ElementSolver:
+def new_element_solver(data: ElementData, threads: int = 1) -> ElementSolver:
     """
     Create a specific element solver instance based on the element type in data.
 
@@ -12,19 +17,65 @@ def new_element_solver(data: ElementData) -> ElementSolver:
     ElementLinearSecond).
 
     :param data: The ElementData object containing the configuration, including the element type.
+    :param threads: The number of threads of the solver (see `ElementSolver`).
     :raises ValueError: If the `data.config.type` is unknown or not supported.
     :return: An instance of a concrete ElementSolver subclass.
     """
 
     if data.config.type == ElementType.DECENTRALIZED:
-        return ElementLinearFirst(data)
+        return ElementLinearFirst(data, threads)
     elif data.config.type == ElementType.NEGOTIATED:
-        return ElementLinearSecond(data)
+        return ElementLinearSecond(data, threads)
     else:
         raise ValueError(f"Unknown element type for factory: {data.config.type}")
 
 
-def execute_new_solver_from_data(element_data: ElementData) -> float:
+def element_model_key(data: ElementData) -> Tuple[str, str]:
+    """
+    Get the key of the built model of an element in the worker cache.
+
+    Besides the element fingerprint, the key holds a digest of the constraint data, which is built into the model,
+    unlike the functional coefficients, which only enter the objective.
+
+    :param data: The element data.
+    :return: The fingerprint (see `element_fingerprint`) and the hex digest of the constraint data.
+    """
+
+    digest = blake2b(digest_size=16)
+    matrix = data.aggregated_plan_costs
+    for values in (*data.resource_constraints, *((matrix.indptr, matrix.indices, matrix.data)
+                                                 if isinstance(matrix, SparseMatrix) else (matrix,))):
+        digest.update(b"-" if values is None else values.tobytes())
+    return element_fingerprint(data), digest.hexdigest()
+
+
+def take_element_solver(data: ElementData) -> ElementSolver:
+    """
+    Take the built model of an element from the worker cache (see `ElementSolver.reuse`) or create a new solver.
+
+    The model leaves the cache; return it with `keep_element_solver` if its constraints stay unchanged.
+
+    :param data: The element data.
+    :return: The element solver, not set up if it is new.
+    """
+
+    if (solver := worker_cache.take(element_model_key(data))) is None:
+        return new_element_solver(data)
+    solver.reuse(data)
+    return solver
+
+
+def keep_element_solver(solver: ElementSolver) -> None:
+    """
+    Put the built model of a solved element into the worker cache for the next task of the element.
+
+    :param solver: The element solver, whose constraints must be the ones built from its data.
+    """
+
+    worker_cache.put(element_model_key(solver.data), solver)
+
+
+def execute_new_solver_from_data(element_data: ElementData, reuse_model: bool = False) -> float:
     """
     Create an element solver from data, solve it, and return its objective value.
 
@@ -33,9 +84,14 @@ def execute_new_solver_from_data(element_data: ElementData) -> float:
     primary objective value from the solution.
 
     :param element_data: The ElementData object for the element to be solved.
+    :param reuse_model: If True, the model is taken from and kept in the worker cache
+                        (see `take_element_solver`), so later tasks of the element on this worker skip building it.
     :return: The objective value (float) of the solved element problem.
     """
 
-    solver = new_element_solver(element_data)
+    solver = take_element_solver(element_data) if reuse_model else new_element_solver(element_data)
     solver.setup()
-    return solver.solve().objective
+    objective = solver.solve().objective
+    if reuse_model:
+        keep_element_solver(solver)
+    return objective
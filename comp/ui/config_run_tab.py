@@ -80,8 +80,9 @@ def init_ui(self):
         threshold_layout = QHBoxLayout()
         threshold_label = QLabel("Мін. поріг паралелізації:")
         self.threshold_spinbox = QSpinBox()
-        self.threshold_spinbox.setMinimum(1)
+        self.threshold_spinbox.setMinimum(0)
         self.threshold_spinbox.setMaximum(1000)
+        self.threshold_spinbox.setSpecialValueText("Авто")  # 0: the cost-aware planner decides
         threshold_layout.addWidget(threshold_label)
         threshold_layout.addWidget(self.threshold_spinbox)
         threshold_layout.addStretch()
@@ -133,7 +134,7 @@ def update_config_display(self, center_data: CenterData):
         self.center_data = center_data
         if center_data:
             self.threads_spinbox.setValue(center_data.config.num_threads or 1)
-            self.threshold_spinbox.setValue(center_data.config.min_parallelisation_threshold or 1)
+            self.threshold_spinbox.setValue(center_data.config.min_parallelisation_threshold or 0)
 
             index = self.type_combobox.findData(center_data.config.type)
             if index >= 0:
@@ -230,7 +231,7 @@ def request_calculation(self):
         updated_config = replace(
             self.center_data.config,
             num_threads=self.threads_spinbox.value(),
-            min_parallelisation_threshold=self.threshold_spinbox.value(),
+            min_parallelisation_threshold=self.threshold_spinbox.value() or None,
             type=self.type_combobox.currentData()
         )
         modified_center_data = replace(self.center_data, config=updated_config)
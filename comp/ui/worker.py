@@ -6,13 +6,16 @@
 from comp.models import CenterData
 from comp.solvers import new_center_solver
 
+# Share of the progress bar, in percent, that the tasks of `coordinate` fill one by one
+COORDINATION_PROGRESS = (10, 90)
+
 
 class SolverWorker(QObject):
     """
     QObject worker for background solver calculations.
 
     Emits `finished`, `error`, and `progress` signals.
-    Supports a `stop()` method for attempted early termination.
+    Supports a `stop()` method for early termination, which also cancels a running coordination.
     """
 
     finished = pyqtSignal(object, str, dict, str)
@@ -31,16 +34,18 @@ def __init__(self, center_data: CenterData):
         self.center_data = center_data
         self.solver = None
         self._is_running = True
+        self._percent = -1  # last emitted progress
 
     def run(self):
         """
         Executes the solver process: init, coordinate, get results.
 
-        Checks `_is_running` for early termination. Emits `finished` or `error`.
+        Checks `_is_running` for early termination. Emits `finished` or `error`,
+        and `progress` as the tasks of the coordination complete.
         """
 
         try:
-            self.progress.emit(10)  # type: ignore
+            self._report(0)
             if not self._is_running: return
 
             if not self.center_data:
@@ -49,22 +54,22 @@ def run(self):
 
             if not self._is_running: return
             self.solver = new_center_solver(self.center_data)
-            self.progress.emit(30)  # type: ignore
+            self._report(COORDINATION_PROGRESS[0])
 
             if not self._is_running: return
-            self.solver.coordinate()
-            self.progress.emit(70)  # type: ignore
+            self.solver.coordinate(progress=self._report_coordination)
+            self._report(COORDINATION_PROGRESS[1])
 
             if not self._is_running: return
             f = StringIO()
             with redirect_stdout(f):
                 self.solver.print_results()
             results_text = f.getvalue()
-            self.progress.emit(90)  # type: ignore
+            self._report(95)
 
             if not self._is_running: return
             results_dict = self.solver.get_results_dict()
-            self.progress.emit(100)  # type: ignore
+            self._report(100)
             if self._is_running:
                 self.finished.emit(self.solver, results_text, results_dict,  # type: ignore
                                    "Розрахунок завершено успішно.")
@@ -75,6 +80,30 @@ def run(self):
             self._is_running = False
 
     def stop(self):
-        """Signals the worker to stop by setting `_is_running` to False."""
+        """Signals the worker to stop by setting `_is_running` to False and cancels the solver, if created."""
 
         self._is_running = False
+        if self.solver is not None:
+            self.solver.cancel()
+
+    def _report(self, percent: int) -> None:
+        """
+        Emits `progress` if the percentage changed.
+
+        :param percent: The progress in percent.
+        """
+
+        if percent != self._percent:
+            self._percent = percent
+            self.progress.emit(percent)  # type: ignore
+
+    def _report_coordination(self, done: int, total: int) -> None:
+        """
+        Reports the completed tasks of the coordination within `COORDINATION_PROGRESS`.
+
+        :param done: The number of completed tasks.
+        :param total: The number of all tasks.
+        """
+
+        start, end = COORDINATION_PROGRESS
+        self._report(start + (end - start) * done // max(total, 1))
@@ -37,8 +37,10 @@ def assert_valid_dimensions(arrays: List[Any],
 
     Each array in the `arrays` list is compared against the corresponding shape tuple
     in the `expected_dims` list.
+    Objects exposing a `shape` attribute (numpy arrays, sparse matrices) are checked by that shape,
+    so sparse matrices are never densified.
 
-    :param arrays: A list of array-like objects (e.g., numpy arrays, lists of lists).
+    :param arrays: A list of array-like objects (e.g., numpy arrays, sparse matrices, lists of lists).
     :param expected_dims: A list of tuples, where each tuple represents the expected
                           shape for the corresponding array in `arrays`.
     :param names: A list of names for the arrays, used in error messages.
@@ -46,8 +48,8 @@ def assert_valid_dimensions(arrays: List[Any],
     """
 
     for arr, dim, name in zip(arrays, expected_dims, names):
-        assert array(arr, dtype="object").shape == dim, (f"Array {name} has invalid dimensions."
-                                                         f" Expected {dim}, got {array(arr, dtype="object").shape}")
+        shape = tuple(arr.shape) if hasattr(arr, "shape") else array(arr, dtype="object").shape
+        assert shape == dim, f"Array {name} has invalid dimensions. Expected {dim}, got {shape}"
 
 
 def assert_bounds(value: T, bounds: Tuple[T, T], name: str = "") -> None:
@@ -13,6 +13,7 @@
 from tabulate import tabulate
 
 from comp.models.element import ElementData, ElementType
+from comp.models.sparse import SparseMatrix
 
 
 def tab_out(subscription: str, data: Sequence[Sequence[str]], headers: List[str] = ("Parameter", "Value")) -> None:
@@ -54,7 +55,7 @@ def stringify(tensor: Any, indent: int = 4, precision: int = 2) -> str:
 
     def convert_ndarrays(obj: Any) -> Any:
         """
-        Recursively convert numpy arrays within a nested structure to Python lists.
+        Recursively convert numpy arrays (and sparse matrices, densified) within a nested structure to Python lists.
 
         Other list/tuple structures are preserved.
         Non-collection items are returned as is.
@@ -65,6 +66,8 @@ def convert_ndarrays(obj: Any) -> Any:
 
         if isinstance(obj, ndarray):
             return obj.tolist()
+        elif isinstance(obj, SparseMatrix):
+            return obj.to_dense().tolist()
         elif isinstance(obj, (list, tuple)):
             return type(obj)(convert_ndarrays(item) for item in obj)
         return obj
@@ -179,18 +182,22 @@ def lp_sum(variables: Iterable[T_lp_sum | Variable]) -> T_lp_sum:
     return result
 
 
-def get_lp_problem_sizes(data: List[ElementData]) -> List[Tuple[int, int]]:
+def get_lp_problem_sizes(data: List[ElementData], include_nnz: bool = False) -> List[Tuple[int, ...]]:
     """
     Extract the linear programming problem sizes (constraints, variables) for a list of elements.
 
     For each ElementData object in the input list, this function retrieves the number
-    of constraints and decision variables from its configuration.
+    of constraints and decision variables from its configuration,
+    and optionally the number of non-zero entries of its aggregated plan costs.
 
     :param data: A list of ElementData objects.
-    :return: A list of tuples, where each tuple (num_constraints, num_decision_variables)
+    :param include_nnz: If True, append the nnz of A_e to every tuple.
+    :return: A list of tuples, where each tuple (num_constraints, num_decision_variables[, nnz])
              corresponds to an element in the input list.
     """
 
+    if include_nnz:
+        return [(d.config.num_constraints, d.config.num_decision_variables, d.nnz) for d in data]
     return [(d.config.num_constraints, d.config.num_decision_variables) for d in data]
 
 
@@ -0,0 +1,117 @@
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Callable, List
+
+from numpy import random
+from tabulate import tabulate
+
+from comp.parallelization.core import Device, Operation
+from comp.parallelization.heuristic import get_multi_device_heuristic_order, get_multi_device_order_A0
+
+
+def reference_order(threads: int, operations: List[Operation]) -> List[Device]:
+    """
+    The quadratic reference scheduler: LPT with a linear scan for the least loaded device,
+    refined by exhaustive 1-1 swaps between the most lagged and the advanced devices.
+
+    It re-sums the device loads on every query, like the original scheduler core did,
+    and serves as the quality baseline on small instances.
+
+    :param threads: The number of devices.
+    :param operations: The operations to schedule.
+    :return: The devices with their assigned operations.
+    """
+
+    devices = [list() for _ in range(threads)]
+    for operation in sorted(operations, key=lambda op: op.duration, reverse=True):
+        min(devices, key=lambda device: sum(op.duration for op in device)).append(operation)
+
+    average_deadline = sum(op.duration for op in operations) / threads
+    while True:
+        ends = [sum(op.duration for op in device) for device in devices]
+        lagged = max(range(threads), key=lambda d: ends[d])
+        gap, swapped = ends[lagged] - average_deadline, False
+        for advanced in sorted((d for d in range(threads) if ends[d] < average_deadline), key=lambda d: ends[d]):
+            for i, x in enumerate(devices[lagged]):
+                for j, y in enumerate(devices[advanced]):
+                    if 0 < x.duration - y.duration <= gap:
+                        devices[lagged][i], devices[advanced][j] = y, x
+                        swapped = True
+                        break
+                if swapped:
+                    break
+            if swapped:
+                break
+        if not swapped:
+            break
+
+    return [Device(device) for device in devices]
+
+
+def makespan_ratio(devices: List[Device], operations: List[Operation]) -> float:
+    """
+    The makespan of a schedule relative to the lower bound max(total / devices, longest operation).
+
+    :param devices: The scheduled devices.
+    :param operations: The scheduled operations.
+    :return: The ratio; 1 is optimal.
+    """
+
+    lower_bound = max(sum(op.duration for op in operations) / len(devices), max(op.duration for op in operations))
+    return max(device.end for device in devices) / lower_bound
+
+
+def measure(scheduler: Callable[[int, List[Operation]], List[Device]], threads: int, durations: List[float]):
+    """
+    Run a scheduler on fresh operations.
+
+    :param scheduler: The scheduler.
+    :param threads: The number of devices.
+    :param durations: The operation durations.
+    :return: A tuple of the scheduling time in seconds and the makespan ratio.
+    """
+
+    operations = [Operation(duration, index) for index, duration in enumerate(durations)]
+    start = perf_counter()
+    devices = scheduler(threads, operations)
+    return perf_counter() - start, makespan_ratio(devices, operations)
+
+
+def main(max_operations: int = 100_000, max_reference_operations: int = 2_000, seed: int = 1810) -> None:
+    """
+    Benchmark the scheduler core for growing numbers of operations and devices.
+
+    Durations are log-normal, like the empiric estimates of mixed problem sizes.
+    The reference scheduler only runs on the small instances, where it finishes in reasonable time.
+
+    :param max_operations: The largest number of operations.
+    :param max_reference_operations: The largest number of operations scheduled by the reference.
+    :param seed: The random seed of the durations.
+    """
+
+    rng, rows = random.default_rng(seed), list()
+    operation_counts = [count for count in (100, 1_000, 10_000, 100_000) if count <= max_operations]
+    for count in operation_counts:
+        for threads in (4, 32, 128):
+            durations = rng.lognormal(0., 1.5, count).tolist()
+            lpt_time, lpt_ratio = measure(get_multi_device_heuristic_order, threads, durations)
+            a0_time, a0_ratio = measure(get_multi_device_order_A0, threads, durations)
+            reference_time, reference_ratio = measure(reference_order, threads, durations) \
+                if count <= max_reference_operations else (None, None)
+            rows.append((count, threads, lpt_time, lpt_ratio, a0_time, a0_ratio, reference_time, reference_ratio))
+
+    print(tabulate(rows, headers=("Operations", "Devices", "LPT, s", "LPT ratio", "A0, s", "A0 ratio",
+                                  "Reference, s", "Reference ratio"), floatfmt=".6f", missingval="-"))
+
+
+if __name__ == "__main__":
+    """Benchmark the scheduling time and the makespan quality of the scheduler core."""
+
+    parser = ArgumentParser(description="Benchmark the scheduler core up to 10^5 operations and 128 devices.")
+    parser.add_argument("--max-operations", type=int, default=100_000, help="largest number of operations")
+    parser.add_argument("--max-reference-operations", type=int, default=2_000,
+                        help="largest number of operations scheduled by the quadratic reference")
+    parser.add_argument("--seed", type=int, default=1810, help="random seed of the durations")
+    arguments = parser.parse_args()
+
+    main(arguments.max_operations, arguments.max_reference_operations, arguments.seed)
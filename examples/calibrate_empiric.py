@@ -0,0 +1,140 @@
+from argparse import ArgumentParser
+from itertools import product
+from time import perf_counter
+from typing import List, Optional, Sequence, Tuple
+
+from numpy import array, geomspace, log, median, ndarray, random, unique
+from tabulate import tabulate
+
+from comp.models import CenterData, CenterType, PackedCenterData
+from comp.parallelization import get_order
+from comp.parallelization.core import (EmpiricCoefficients, effective_problem_sizes, estimate_durations, fit_empiric,
+                                       get_profile_path, save_coefficients)
+from comp.solvers.factories import execute_new_solver_from_data
+from examples.data import DataGenerator
+
+
+def generate_center(num_decision_variables: List[int], num_constraints: List[int], seed: int) -> CenterData:
+    """
+    Generate a center whose element problems can be solved on their own.
+
+    RESOURCE_ALLOCATION_COMPROMISE centers have no local resource limits b_e, so seeds drawing this type are skipped.
+
+    :param num_decision_variables: The number of decision variables of every element.
+    :param num_constraints: The number of constraints of every element.
+    :param seed: The first seed to try.
+    :return: The generated center data.
+    """
+
+    while (data := DataGenerator(len(num_decision_variables), num_decision_variables, num_constraints,
+                                 seed=seed).generate_center_data()).config.type == \
+            CenterType.RESOURCE_ALLOCATION_COMPROMISE:
+        seed += 1
+    return data
+
+
+def time_elements(data: CenterData, repeats: int) -> ndarray:
+    """
+    Time GLOP on the plain problem of every element.
+
+    :param data: The center whose elements are timed.
+    :param repeats: The number of solves per element; the minimum time is kept.
+    :return: The solve time of every element, in seconds.
+    """
+
+    times = list()
+    for element_data in data.elements:
+        samples = list()
+        for _ in range(repeats):
+            start = perf_counter()
+            execute_new_solver_from_data(element_data)
+            samples.append(perf_counter() - start)
+        times.append(min(samples))
+    return array(times)
+
+
+def log_rmse(sizes: Sequence[Tuple[int, ...]], times: ndarray, coefficients: EmpiricCoefficients) -> float:
+    """
+    Root-mean-square error of the empiric estimates in log space, after the best constant rescaling.
+
+    :param sizes: The problem sizes.
+    :param times: The measured times.
+    :param coefficients: The coefficients to evaluate.
+    :return: The error; 0.1 means estimates are typically off by about 10%.
+    """
+
+    residuals = log(array(estimate_durations(list(sizes), coefficients))) - log(times)
+    return float(((residuals - median(residuals)) ** 2).mean() ** .5)
+
+
+def makespan(order: List[List[int]], times: ndarray) -> float:
+    """
+    The measured makespan of a schedule: the largest total solve time over all threads.
+
+    :param order: The task indices assigned to every thread.
+    :param times: The measured time of every task.
+    :return: The makespan, in seconds.
+    """
+
+    return max(float(times[group].sum()) if group else 0. for group in order)
+
+
+def calibrate(grid_points: int = 6, max_size: int = 160, repeats: int = 3, threads: int = 4,
+              seed: int = 1810, output: Optional[str] = None) -> EmpiricCoefficients:
+    """
+    Calibrate the empiric coefficients on this machine and save them as the profile loaded by `empiric`.
+
+    The fit uses the effective (rows, columns, nnz) of the element problems (see `effective_problem_sizes`),
+    the sizes the center solvers feed into the scheduler.
+    The makespan is evaluated on a separate random workload.
+
+    :param grid_points: The number of (geometrically spaced) values of m and n in the calibration grid.
+    :param max_size: The largest m and n of the grid.
+    :param repeats: The number of solves per problem; the minimum time is kept.
+    :param threads: The number of threads of the evaluated schedules.
+    :param seed: The random seed of the generated problems.
+    :param output: The profile path; defaults to `get_profile_path()`.
+    :return: The fitted coefficients.
+    """
+
+    grid = unique(geomspace(2, max_size, grid_points).astype(int)).tolist()
+    m, n = map(list, zip(*product(grid, grid)))
+    calibration = generate_center(n, m, seed)
+    sizes = effective_problem_sizes(PackedCenterData.from_center_data(calibration))
+    times = time_elements(calibration, repeats)
+
+    default, (fitted, _) = EmpiricCoefficients(), fit_empiric(sizes, times)
+
+    workload_sizes = random.default_rng(seed).integers(2, max_size, (2, 8 * threads)).tolist()
+    workload = generate_center(workload_sizes[0], workload_sizes[1], seed + 1)
+    workload_problem_sizes = effective_problem_sizes(PackedCenterData.from_center_data(workload))
+    workload_times = time_elements(workload, repeats)
+
+    spans = [makespan(get_order(workload_problem_sizes, threads, coefficients), workload_times)
+             for coefficients in (default, fitted)]
+
+    print(tabulate([("default", log_rmse(sizes, times, default), spans[0]),
+                    ("calibrated", log_rmse(sizes, times, fitted), spans[1])],
+                   headers=("Coefficients", "Fit RMSE (log)", f"Makespan, s ({threads} threads)"), floatfmt=".4f"))
+    print(f"Lower bound of the makespan: {workload_times.sum() / threads:.4f} s; "
+          f"improvement: {(1 - spans[1] / spans[0]) * 100:.1f}%")
+
+    save_coefficients(fitted, output)
+    print(f"Calibrated coefficients saved to {output or get_profile_path()}: {fitted}")
+    return fitted
+
+
+if __name__ == "__main__":
+    """Calibrate the empiric formula on the host machine."""
+
+    parser = ArgumentParser(description="Fit the empiric cost formula to GLOP timings of this machine.")
+    parser.add_argument("--grid-points", type=int, default=6, help="values of m and n in the calibration grid")
+    parser.add_argument("--max-size", type=int, default=160, help="largest m and n of the grid")
+    parser.add_argument("--repeats", type=int, default=3, help="solves per problem (the minimum time is kept)")
+    parser.add_argument("--threads", type=int, default=4, help="threads of the evaluated schedules")
+    parser.add_argument("--seed", type=int, default=1810, help="random seed of the generated problems")
+    parser.add_argument("--output", default=None, help="profile path (default: $COMP_EMPIRIC_PROFILE or ~/.comp)")
+    arguments = parser.parse_args()
+
+    calibrate(arguments.grid_points, arguments.max_size, arguments.repeats, arguments.threads, arguments.seed,
+              arguments.output)
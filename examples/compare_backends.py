@@ -0,0 +1,108 @@
+from argparse import ArgumentParser
+from dataclasses import replace
+from platform import python_implementation, python_version
+from statistics import median
+from time import perf_counter
+from typing import List, Sequence, Tuple
+
+from numpy import random
+from tabulate import tabulate
+
+from comp.models import CenterData, CenterType, ExecutionBackend
+from comp.parallelization import LocalNodes
+from comp.parallelization.planner import gil_enabled
+from comp.solvers import new_center_solver
+from examples.data import DataGenerator
+
+
+def generate_center(num_elements: int, min_size: int, max_size: int, seed: int) -> CenterData:
+    """
+    Generate a center whose elements have random sizes.
+
+    :param num_elements: The number of elements.
+    :param min_size: The smallest number of constraints and variables of an element.
+    :param max_size: The largest number of constraints and variables of an element.
+    :param seed: The random seed.
+    :return: The center data.
+    """
+
+    sizes = random.default_rng(seed).integers(min_size, max_size, (2, num_elements)).tolist()
+    data = DataGenerator(num_elements, sizes[0], sizes[1], seed=seed).generate_center_data()
+    return replace(data, elements=[replace(element, delta=.5) for element in data.elements])
+
+
+def time_backend(data: CenterData, center_type: CenterType, backend: ExecutionBackend, threads: int,
+                 repeats: int, nodes: List[str]) -> Tuple[float, float, str]:
+    """
+    Coordinate a center on one backend.
+
+    :param data: The center data.
+    :param center_type: The coordination strategy.
+    :param backend: The execution backend.
+    :param threads: The number of workers.
+    :param repeats: The number of timed runs.
+    :param nodes: The addresses of the node daemons of the DISTRIBUTED backend.
+    :return: The median wall time of the coordination in seconds, the quality functional
+             and the backend that actually ran (sub-interpreters fall back to processes where unsupported).
+    """
+
+    seconds, quality, executed = list(), .0, backend.name
+    for _ in range(repeats):
+        solver = new_center_solver(replace(data, config=replace(
+            data.config, type=center_type, num_threads=threads, execution_backend=backend, worker_nodes=nodes)))
+        start = perf_counter()
+        solver.coordinate()
+        seconds.append(perf_counter() - start)
+        quality = solver.quality_functional()[1]
+        executed = solver.parallel_executor.plan.backend.name
+    return median(seconds), quality, executed
+
+
+def main(num_elements: int, min_size: int, max_size: int, threads: int, center_types: Sequence[CenterType],
+         repeats: int, seed: int) -> None:
+    """
+    Report the coordination time of every execution backend, on the interpreter running this script.
+
+    Run the script with a regular and a free-threaded interpreter to compare the thread backend with and without
+    the GIL, and with Python 3.14+ for sub-interpreters; the quality functional shows that all backends
+    find the same solutions. The DISTRIBUTED backend runs on local node daemons, one per worker (see `LocalNodes`).
+
+    :param num_elements: The number of elements of the generated center.
+    :param min_size: The smallest number of constraints and variables of an element.
+    :param max_size: The largest number of constraints and variables of an element.
+    :param threads: The number of workers.
+    :param center_types: The coordination strategies.
+    :param repeats: The number of timed runs per backend.
+    :param seed: The random seed.
+    """
+
+    data = generate_center(num_elements, min_size, max_size, seed)
+    rows: List[Tuple] = list()
+    with LocalNodes(threads) as nodes:
+        for center_type in center_types:
+            for backend in ExecutionBackend:
+                seconds, quality, executed = time_backend(data, center_type, backend, threads, repeats, nodes.addresses)
+                rows.append((center_type.name, backend.name, executed, seconds, quality))
+
+    print(f"{python_implementation()} {python_version()}, GIL {'enabled' if gil_enabled() else 'disabled'}, "
+          f"{num_elements} elements, {threads} workers")
+    print(tabulate(rows, headers=("Strategy", "Backend", "Ran on", "Wall time, s", "Quality functional"),
+                   floatfmt=".3f"))
+
+
+if __name__ == "__main__":
+    """Compare the sequential, thread, process, sub-interpreter and distributed backends of the parallel executor."""
+
+    parser = ArgumentParser(description="Compare the coordination time of the execution backends.")
+    parser.add_argument("--elements", type=int, default=32, help="number of elements of the generated center")
+    parser.add_argument("--min-size", type=int, default=10, help="smallest element size")
+    parser.add_argument("--max-size", type=int, default=150, help="largest element size")
+    parser.add_argument("--threads", type=int, default=4, help="number of workers")
+    parser.add_argument("--types", nargs="+", default=["GUARANTEED_CONCESSION", "STRICT_PRIORITY"],
+                        choices=[center_type.name for center_type in CenterType], help="coordination strategies")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per backend")
+    parser.add_argument("--seed", type=int, default=1810, help="random seed")
+    arguments = parser.parse_args()
+
+    main(arguments.elements, arguments.min_size, arguments.max_size, arguments.threads,
+         [CenterType[name] for name in arguments.types], arguments.repeats, arguments.seed)
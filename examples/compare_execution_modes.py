@@ -0,0 +1,124 @@
+from argparse import ArgumentParser
+from dataclasses import replace
+from functools import partial
+from time import sleep
+from typing import List, Optional, Sequence, Tuple
+
+from numpy import random
+from tabulate import tabulate
+
+from comp.models import CenterType, ExecutionMode
+from comp.parallelization import ExecutionReport, ParallelExecutor, get_order
+from comp.solvers import new_center_solver
+from examples.data import DataGenerator
+
+
+def report_row(workload: str, report: ExecutionReport) -> Tuple:
+    """
+    Summarize an execution report as a table row.
+
+    :param workload: The name of the workload.
+    :param report: The report of the executor.
+    :return: The workload, the mode, the makespan, the total idle time, the largest idle time of a worker
+             and the speculative copies launched (and won).
+    """
+
+    return (workload, report.mode.name, report.makespan, report.total_idle,
+            max(report.idle.values(), default=report.makespan),
+            f"{report.speculative_launches} ({report.speculative_wins})")
+
+
+def mispredicted_sleeps(num_tasks: int, threads: int, noise: float, seed: int,
+                        speculation_factor: Optional[float] = None) -> List[ExecutionReport]:
+    """
+    Run sleeping tasks whose durations deviate from their estimates, statically and dynamically.
+
+    Speculative copies of a task sleep for its estimated duration, as a rerun without the bad luck would.
+
+    :param num_tasks: The number of tasks.
+    :param threads: The number of workers.
+    :param noise: The standard deviation of the log-normal factor between the true and the estimated durations.
+    :param seed: The random seed.
+    :param speculation_factor: The speculation factor of the executor (see `ParallelExecutor`).
+    :return: The report of every mode.
+    """
+
+    rng = random.default_rng(seed)
+    estimates = rng.uniform(.02, .2, num_tasks)
+    durations = estimates * rng.lognormal(0., noise, num_tasks)
+    order = get_order([(1, 1)] * num_tasks, threads, observed=estimates.tolist())
+
+    reports = list()
+    for mode in ExecutionMode:
+        executor = ParallelExecutor(order, 1, threads, mode=mode, costs=estimates.tolist(),
+                                    speculation_factor=speculation_factor)
+        executor.execute([partial(sleep, float(duration)) for duration in durations],
+                         backups=[partial(sleep, float(estimate)) for estimate in estimates])
+        reports.append(executor.report)
+    return reports
+
+
+def center_runs(num_elements: int, threads: int, seed: int) -> List[ExecutionReport]:
+    """
+    Coordinate a generated GUARANTEED_CONCESSION center statically and dynamically.
+
+    :param num_elements: The number of elements.
+    :param threads: The number of workers.
+    :param seed: The random seed of the center.
+    :return: The report of the coordination of every mode.
+    """
+
+    sizes = random.default_rng(seed).integers(10, 150, (2, num_elements)).tolist()
+    data = DataGenerator(num_elements, sizes[0], sizes[1], seed=seed).generate_center_data()
+    data = replace(data, elements=[replace(element, delta=.5) for element in data.elements])
+
+    reports = list()
+    for mode in ExecutionMode:
+        solver = new_center_solver(replace(data, config=replace(
+            data.config, type=CenterType.GUARANTEED_CONCESSION, num_threads=threads,
+            min_parallelisation_threshold=1, execution_mode=mode)))
+        solver.coordinate()
+        reports.append(solver.parallel_executor.report)
+    return reports
+
+
+def main(num_tasks: int, num_elements: int, threads: int, noises: Sequence[float], seed: int,
+         speculation_factor: float) -> None:
+    """
+    Report the makespan and the worker idle times of the static and the dynamic execution mode,
+    without and with speculative re-execution of stragglers.
+
+    :param num_tasks: The number of sleeping tasks.
+    :param num_elements: The number of elements of the generated center.
+    :param threads: The number of workers.
+    :param noises: The misprediction levels of the sleeping tasks.
+    :param seed: The random seed.
+    :param speculation_factor: The speculation factor of the speculative runs.
+    """
+
+    rows = list()
+    for noise in noises:
+        for factor in (None, speculation_factor):
+            rows += [report_row(f"sleeps, noise {noise}" + (", speculative" if factor else ""), report)
+                     for report in mispredicted_sleeps(num_tasks, threads, noise, seed, factor)]
+    rows += [report_row(f"center, {num_elements} elements", report)
+             for report in center_runs(num_elements, threads, seed)]
+
+    print(tabulate(rows, headers=("Workload", "Mode", "Makespan, s", "Total idle, s", "Max worker idle, s",
+                                  "Backups (won)"), floatfmt=".3f"))
+
+
+if __name__ == "__main__":
+    """Compare the static and the dynamic execution mode of the parallel executor."""
+
+    parser = ArgumentParser(description="Compare the makespan and idle time of static and dynamic execution.")
+    parser.add_argument("--tasks", type=int, default=48, help="number of sleeping tasks")
+    parser.add_argument("--elements", type=int, default=32, help="number of elements of the generated center")
+    parser.add_argument("--threads", type=int, default=4, help="number of workers")
+    parser.add_argument("--noise", type=float, nargs="+", default=[.0, .5, 1.], help="misprediction levels")
+    parser.add_argument("--seed", type=int, default=1810, help="random seed")
+    parser.add_argument("--speculation-factor", type=float, default=3., help="speculation factor of the runs")
+    arguments = parser.parse_args()
+
+    main(arguments.tasks, arguments.elements, arguments.threads, arguments.noise, arguments.seed,
+         arguments.speculation_factor)
@@ -0,0 +1,120 @@
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Callable, Dict, List, Sequence
+
+from numpy import ndarray, random
+from tabulate import tabulate
+
+from comp.io import load_center_data_from_json
+from comp.models import CenterData, PackedCenterData, SchedulerType
+from comp.parallelization import new_scheduler
+from comp.parallelization.core import Operation, effective_problem_sizes, empiric_batch
+from examples.data import DataGenerator
+
+# Synthetic duration distributions: (generator, number of tasks) -> durations
+DISTRIBUTIONS: Dict[str, Callable[[random.Generator, int], ndarray]] = {
+    "uniform": lambda rng, count: rng.uniform(1., 10., count),
+    "exponential": lambda rng, count: rng.exponential(1., count),
+    "log-normal": lambda rng, count: rng.lognormal(0., 1.5, count),
+    "bimodal": lambda rng, count: rng.choice((1., 20.), count, p=(.9, .1)) * rng.uniform(.8, 1.2, count),
+}
+
+
+def profile_durations(data: CenterData) -> ndarray:
+    """
+    Get the scheduled durations of the element tasks of a center, as estimated by the center solver.
+
+    :param data: The center data.
+    :return: The empiric estimate of every element task, from the effective sizes of its problem.
+    """
+
+    return empiric_batch(effective_problem_sizes(PackedCenterData.from_center_data(data), data.config.type))
+
+
+def makespan_ratio(durations: ndarray, threads: int, scheduler_type: SchedulerType) -> List[float]:
+    """
+    Schedule durations and compare the makespan with the lower bound max(total / threads, longest).
+
+    :param durations: The task durations.
+    :param threads: The number of threads.
+    :param scheduler_type: The scheduler.
+    :return: A list of the makespan ratio (1 is optimal) and the scheduling time in seconds.
+    """
+
+    operations = [Operation(float(duration), i) for i, duration in enumerate(durations)]
+    start = perf_counter()
+    devices = new_scheduler(scheduler_type)(threads, operations)
+    elapsed = perf_counter() - start
+    return [max(device.end for device in devices) / max(durations.sum() / threads, durations.max()), elapsed]
+
+
+def compare(workloads: Dict[str, Sequence[ndarray]], threads: Sequence[int],
+            scheduler_types: Sequence[SchedulerType]) -> None:
+    """
+    Print the mean makespan ratio and scheduling time of every scheduler per workload and thread count.
+
+    :param workloads: The duration samples of every workload.
+    :param threads: The thread counts.
+    :param scheduler_types: The compared schedulers.
+    """
+
+    rows = list()
+    for name, samples in workloads.items():
+        for thread_count in threads:
+            row = [name, len(samples[0]), thread_count]
+            for scheduler_type in scheduler_types:
+                results = [makespan_ratio(durations, thread_count, scheduler_type) for durations in samples]
+                row += [sum(result[0] for result in results) / len(results),
+                        sum(result[1] for result in results) / len(results)]
+            rows.append(row)
+
+    headers = ["Workload", "Tasks", "Threads"]
+    for scheduler_type in scheduler_types:
+        headers += [f"{scheduler_type.name} ratio", f"{scheduler_type.name}, s"]
+    print(tabulate(rows, headers=headers, floatfmt=".4f"))
+
+
+def main(task_counts: Sequence[int], threads: Sequence[int], samples: int, seed: int,
+         data_filepaths: Sequence[str], scheduler_types: Sequence[SchedulerType]) -> None:
+    """
+    Benchmark the schedulers on synthetic distributions and on the element profiles of centers.
+
+    :param task_counts: The numbers of tasks of the synthetic workloads.
+    :param threads: The thread counts.
+    :param samples: The number of random instances per workload.
+    :param seed: The random seed.
+    :param data_filepaths: Center JSON files whose element profiles are scheduled; random centers if empty.
+    :param scheduler_types: The compared schedulers.
+    """
+
+    rng = random.default_rng(seed)
+    workloads = {f"{name} ({count})": [generate(rng, count) for _ in range(samples)]
+                 for count in task_counts for name, generate in DISTRIBUTIONS.items()}
+
+    if data_filepaths:
+        for filepath in data_filepaths:
+            workloads[filepath] = [profile_durations(load_center_data_from_json(filepath))]
+    else:
+        for count in task_counts:
+            sizes = [rng.integers(2, 120, (2, count)).tolist() for _ in range(samples)]
+            workloads[f"center profile ({count})"] = [profile_durations(DataGenerator(
+                count, n, m, seed=seed + s).generate_center_data()) for s, (n, m) in enumerate(sizes)]
+
+    compare(workloads, threads, scheduler_types)
+
+
+if __name__ == "__main__":
+    """Compare the makespan quality and the running time of the scheduling algorithms."""
+
+    parser = ArgumentParser(description="Compare the scheduling algorithms selectable by CenterConfig.scheduler.")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[12, 100, 1000], help="task counts")
+    parser.add_argument("--threads", type=int, nargs="+", default=[4, 16], help="thread counts")
+    parser.add_argument("--samples", type=int, default=3, help="random instances per workload")
+    parser.add_argument("--seed", type=int, default=1810, help="random seed")
+    parser.add_argument("--data", nargs="*", default=list(), help="center JSON files to take element profiles from")
+    parser.add_argument("--schedulers", nargs="+", default=[scheduler_type.name for scheduler_type in SchedulerType],
+                        choices=[scheduler_type.name for scheduler_type in SchedulerType], help="compared schedulers")
+    arguments = parser.parse_args()
+
+    main(arguments.tasks, arguments.threads, arguments.samples, arguments.seed, arguments.data,
+         [SchedulerType[name] for name in arguments.schedulers])
@@ -106,7 +106,7 @@ def generate_center_data(self) -> CenterData:
         return CenterData(
             config=CenterConfig(
                 id=0,
-                min_parallelisation_threshold=cpu_count() or None,
+                min_parallelisation_threshold=None,
                 num_threads=cpu_count() or 1,
                 type=center_type,
                 num_elements=self.num_elements
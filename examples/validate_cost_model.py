@@ -0,0 +1,85 @@
+from dataclasses import replace
+from time import perf_counter
+from typing import List, Tuple
+
+from numpy import argsort, array, corrcoef, exp, log, mean, median, ndarray, random
+from tabulate import tabulate
+
+from comp.models import CenterType, PackedCenterData
+from comp.parallelization.core import effective_problem_sizes, estimate_durations
+from comp.solvers import new_center_solver
+from examples.data import DataGenerator
+
+
+def measure_solve_times(center_type: CenterType, num_elements: int, seed: int,
+                        repeats: int = 3) -> Tuple[PackedCenterData, ndarray]:
+    """
+    Measure the sequential solve time of every element problem of a random center.
+
+    Element sizes are drawn at random so that the shapes (tall, wide, square) vary widely.
+    The preliminary values of the strategy (e.g., f_el_opt) are computed first and are not timed.
+    WEIGHTED_BALANCE elements are timed for a single w = 1.
+
+    :param center_type: The coordination strategy whose element problems are timed.
+    :param num_elements: The number of elements of the random center.
+    :param seed: The random seed of the element sizes and the generated center.
+    :param repeats: The number of solves per element; the minimum time is kept.
+    :return: The packed center data and the measured time of every element, in seconds.
+    """
+
+    sizes = random.default_rng(seed).integers(5, 150, (2, num_elements)).tolist()
+    data = DataGenerator(num_elements, sizes[0], sizes[1], seed=seed).generate_center_data()
+    data = replace(data, config=replace(data.config, type=center_type, num_threads=1),
+                   elements=[replace(element, delta=.5) for element in data.elements])
+    solver = new_center_solver(data)
+    solver.compute_preliminary_values()
+
+    times = list()
+    for e in range(num_elements):
+        samples = list()
+        for _ in range(repeats):
+            start = perf_counter()
+            solver.solve_element(e)
+            samples.append(perf_counter() - start)
+        times.append(min(samples))
+
+    return solver.packed, array(times)
+
+
+def prediction_errors(predicted: List[float], measured: ndarray) -> Tuple[float, float, float]:
+    """
+    Compare relative duration estimates with measured times.
+
+    The estimates are in arbitrary units, so they are first scaled by the median ratio to the measurements.
+
+    :param predicted: The estimated durations.
+    :param measured: The measured durations.
+    :return: The mean absolute percentage error, the mean absolute log error and the Spearman rank correlation.
+    """
+
+    log_ratio = log(measured) - log(predicted := array(predicted))
+    scaled = predicted * exp(median(log_ratio))
+    rank_correlation = corrcoef(argsort(argsort(predicted)), argsort(argsort(measured)))[0, 1]
+    return (float(mean(abs(scaled - measured) / measured)), float(mean(abs(log_ratio - median(log_ratio)))),
+            float(rank_correlation))
+
+
+def main() -> None:
+    """Report the prediction error of the raw (m, n) model and of the effective size model."""
+
+    rows = list()
+    for center_type in (CenterType.STRICT_PRIORITY, CenterType.GUARANTEED_CONCESSION,
+                        CenterType.WEIGHTED_BALANCE):
+        packed, measured = measure_solve_times(center_type, num_elements=24, seed=3)
+        for name, sizes in (("raw (m, n)", packed.problem_sizes()),
+                            ("effective", effective_problem_sizes(packed, center_type))):
+            rows.append((center_type.name, name, *prediction_errors(estimate_durations(sizes), measured)))
+
+    print(tabulate(rows, headers=("Center Type", "Cost Model", "MAPE", "Mean |log error|", "Spearman"),
+                   floatfmt=".3f"))
+
+
+if __name__ == "__main__":
+    """Validate the scheduling cost model against measured solve times."""
+
+    main()
@@ -1,16 +1,42 @@
+from asyncio import CancelledError, create_task, gather, run, sleep as sleep_async
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import replace, dataclass
 from enum import Enum, auto
+from functools import partial
+from json import loads
+from multiprocessing import active_children
+from multiprocessing.shared_memory import SharedMemory
+from operator import add, mul
+from pickle import dumps
 from unittest import TestCase, main
 
-from numpy import array, int64, testing
-
-from comp.models import ElementData, ElementConfig, ElementType, CenterData, CenterType
-from comp.parallelization.heuristic import get_order
+from os import _exit, getpid, path
+from tempfile import TemporaryDirectory
+from threading import Timer
+from time import perf_counter, sleep
+from tracemalloc import start as trace_start, stop as trace_stop, get_traced_memory
+
+from numpy import append, arange, array, int64, testing, shares_memory, ones, isnan, random, allclose
+
+from comp.io import load_center_data_from_json
+from comp.models import (ElementData, ElementConfig, ElementType, CenterData, CenterType, ExecutionMode,
+                         ExecutionStatus, PackedCenterData, SchedulerType, SparseMatrix, WeightSweep)
+from comp.parallelization.core import (EmpiricCoefficients, effective_problem_sizes, empiric, empiric_batch,
+                                       fit_empiric, load_coefficients, save_coefficients)
+from comp.parallelization import (ExecutionBackend, ExecutionPlanner, LocalNodes, ParallelExecutor, RuntimeHistory,
+                                  WorkerCache, blend_durations, new_scheduler)
+from comp.parallelization.planner import ExecutionOverheads, interpreters_supported, measure_cpu_speeds, usable_cpus
+from comp.parallelization.core import Operation
+from comp.parallelization.parallel_executor import bind_task_group, group_by_affinity, make_chunks
+from comp.parallelization.moldable import allot_threads, moldable_duration, simulate_makespan
+from comp.parallelization.shared import SharedArena
+from comp.parallelization.heuristic import get_order, get_multi_device_heuristic_order, get_multi_device_order_A0
 from comp.solvers import new_center_solver, CenterLinearFirst, CenterLinearSecond, CenterLinearThird, CenterLinkedFirst
 from comp.solvers.element import ElementLinearFirst, ElementLinearSecond
-from comp.solvers.factories import new_element_solver
+from comp.solvers.factories import keep_element_solver, new_element_solver, take_element_solver
 from comp.utils import (assert_positive, assert_non_negative, assert_bounds, assert_valid_dimensions, stringify, lp_sum,
-                        get_lp_problem_sizes, json_serializer)
+                        get_lp_problem_sizes, json_serializer, save_to_json)
 from examples import DataGenerator
 
 
@@ -165,6 +191,91 @@ def test_element_data_copy(self) -> None:
         testing.assert_array_equal(orig.resource_constraints[0], copied.resource_constraints[0])
         self.assertEqual(orig.delta, copied.delta)
 
+    def test_element_data_arrays_are_read_only_views(self) -> None:
+        """Test ElementData freezes its arrays without copying or freezing the caller’s arrays."""
+
+        costs = array([[2.0, 1.0]])
+        data = ElementData(
+            config=ElementConfig(id=1, type=ElementType.DECENTRALIZED, num_constraints=1, num_decision_variables=2),
+            coeffs_functional=array([1.0, 2.0]),
+            resource_constraints=(None, array([1.0, 1.0]), array([100.0, 100.0])),
+            aggregated_plan_costs=costs,
+        )
+
+        self.assertTrue(costs.flags.writeable)
+        self.assertFalse(data.aggregated_plan_costs.flags.writeable)
+        self.assertTrue(shares_memory(costs, data.aggregated_plan_costs))
+        self.assertIsNone(data.resource_constraints[0])
+        with self.assertRaises(ValueError):
+            data.coeffs_functional[0] = 5.0
+
+
+    def test_packed_center_data_round_trip_and_metrics(self) -> None:
+        """Test PackedCenterData converts both ways and matches per-element loop metrics."""
+
+        data = DataGenerator(3, [3, 1, 2], [2, 3, 1], seed=4).generate_center_data()
+        packed = PackedCenterData.from_center_data(data)
+        unpacked = packed.to_center_data()
+
+        for original, restored in zip(data.elements, unpacked.elements):
+            self.assertEqual(original.config, restored.config)
+            testing.assert_array_equal(original.aggregated_plan_costs, restored.aggregated_plan_costs)
+            testing.assert_array_equal(original.resource_constraints[2], restored.resource_constraints[2])
+            self.assertEqual(original.w is None, restored.w is None)
+        self.assertEqual(packed.problem_sizes(), get_lp_problem_sizes(data.elements))
+
+        plans = [[1., 2., 3.], list(), [4., 5.]]
+        center_quality = packed.center_quality(packed.pack_plans(plans))
+        self.assertEqual(center_quality[0], sum(d * y for d, y in zip(data.coeffs_functional[0], plans[0])))
+        self.assertTrue(isnan(center_quality[1]))
+
+        usage = packed.resource_usage(packed.pack_plans([[1., 1., 1.], [2.], [1., 0.]]))
+        testing.assert_array_almost_equal(usage[packed.con_offsets[1]:packed.con_offsets[2]],
+                                          data.elements[1].aggregated_plan_costs @ [2.])
+        packed.validate()
+
+        b, lower, upper = data.elements[0].resource_constraints
+        for resource_constraints in ((append(b, 1.), lower, upper), (b, lower[:-1], upper)):
+            element = replace(data.elements[0], resource_constraints=resource_constraints)
+            with self.assertRaises(AssertionError):
+                PackedCenterData.from_center_data(replace(data, elements=[element, *data.elements[1:]]))
+
+    def test_sparse_costs_json_and_packed_round_trip(self) -> None:
+        """Test sparse A_e survive saving to JSON and packing without densification."""
+
+        data = DataGenerator(2, [3, 2], [2, 2], seed=4).generate_center_data()
+        sparse = SparseMatrix.from_coo((2, 3), [1, 0], [2, 0], [5., 3.])
+        data = replace(data, elements=[replace(data.elements[0], aggregated_plan_costs=sparse), data.elements[1]])
+
+        with TemporaryDirectory() as directory:
+            save_to_json(data, filepath := path.join(directory, "sparse.json"))
+            loaded = load_center_data_from_json(filepath)
+
+        self.assertIsInstance(loaded.elements[0].aggregated_plan_costs, SparseMatrix)
+        testing.assert_array_equal(loaded.elements[0].aggregated_plan_costs.to_dense(), [[3., 0., 0.], [0., 0., 5.]])
+        self.assertEqual(get_lp_problem_sizes(loaded.elements, include_nnz=True)[0], (2, 3, 2))
+
+        packed = PackedCenterData.from_center_data(loaded)
+        self.assertEqual(packed.nnz.tolist(), [2, loaded.elements[1].nnz])
+        self.assertIsInstance(packed.to_center_data().elements[0].aggregated_plan_costs, SparseMatrix)
+        self.assertNotIsInstance(packed.to_center_data().elements[1].aggregated_plan_costs, SparseMatrix)
+
+    def test_sparse_matrix_validates_structure_and_sums_duplicates(self) -> None:
+        """Test SparseMatrix raises ValueError for malformed CSR and COO input and sums duplicate entries."""
+
+        for indptr, indices in (([0, 2], [0, 1]), ([1, 1, 2], [0, 1]), ([0, 2, 1], [0, 1]), ([0, 1, 1], [0, 1]),
+                                ([0, 1, 2], [0, 3]), ([0, 1, 2], [-1, 0])):
+            with self.assertRaises(ValueError):
+                SparseMatrix((2, 3), indptr, indices, [1., 2.])
+
+        for row in ([0, 2], [-1, 0]):
+            with self.assertRaises(ValueError):
+                SparseMatrix.from_coo((2, 3), row, [0, 1], [1., 2.])
+        self.assertEqual(SparseMatrix((2, 3), [0, 1, 2], [0, 2], [1., 2.]).nnz, 2)
+
+        duplicates = SparseMatrix.from_coo((2, 3), [1, 0, 1], [2, 0, 2], [5., 3., 4.])
+        testing.assert_array_equal(duplicates.to_dense(), [[3., 0., 0.], [0., 0., 9.]])
+
 
 class TestGenerator(TestCase):
     """Tests for the data generator."""
@@ -203,6 +314,430 @@ def test_get_order_simple(self) -> None:
             if 1 in group:
                 self.assertLessEqual(len(group), len(sizes) - len(group) + 1)
 
+    def test_a0_permutations_move_operations(self) -> None:
+        """Test the A0 refinement swaps operations between devices and terminates balanced."""
+
+        devices = get_multi_device_order_A0(2, [Operation(float(duration), i) for i, duration in enumerate(
+            (5, 4, 3, 3, 3))])
+
+        self.assertEqual([device.end for device in devices], [9., 9.])
+        self.assertEqual(sorted(operation.original_index for device in devices for operation in device.operations),
+                         [0, 1, 2, 3, 4])
+
+    def test_scheduler_core_keeps_loads_and_lpt_quality(self) -> None:
+        """Test the incremental device loads and that A0 never schedules worse than LPT on many operations."""
+
+        durations = random.default_rng(0).lognormal(0., 1., 3000).tolist()
+        lpt = get_multi_device_heuristic_order(16, [Operation(d, i) for i, d in enumerate(durations)])
+        a0 = get_multi_device_order_A0(16, [Operation(d, i) for i, d in enumerate(durations)])
+
+        for devices in (lpt, a0):
+            for device in devices:
+                self.assertAlmostEqual(device.end, sum(operation.duration for operation in device.operations))
+        self.assertLessEqual(max(device.end for device in a0), max(device.end for device in lpt) + 1e-9)
+        self.assertEqual(sorted(operation.original_index for device in a0 for operation in device.operations),
+                         list(range(len(durations))))
+        self.assertTrue(allclose(empiric_batch([(3, 4), (5, 1, 2)]), [empiric((3, 4)), empiric((5, 1, 2))]))
+
+    def test_schedulers_partition_operations(self) -> None:
+        """Test every scheduler assigns each operation once and the exact one finds the optimal makespan."""
+
+        durations = (3., 3., 2., 2., 2.)
+        for scheduler_type in SchedulerType:
+            devices = new_scheduler(scheduler_type)(2, [Operation(d, i) for i, d in enumerate(durations)])
+            self.assertEqual(sorted(op.original_index for device in devices for op in device.operations),
+                             [0, 1, 2, 3, 4], scheduler_type.name)
+            if scheduler_type == SchedulerType.EXACT:
+                self.assertEqual(max(device.end for device in devices), 6.)
+            elif scheduler_type == SchedulerType.LPT:
+                self.assertEqual(max(device.end for device in devices), 7.)
+
+        self.assertEqual(len(get_order([(3, 4)] * 5, 2, scheduler=new_scheduler(SchedulerType.KARMARKAR_KARP))), 2)
+
+    def test_schedulers_balance_devices_of_different_speeds(self) -> None:
+        """Test the schedulers balance the end times of faster and slower devices and pinned groups run."""
+
+        lpt = get_multi_device_heuristic_order(2, [Operation(d, i) for i, d in enumerate((4., 2., 2., 2., 2.))],
+                                               speeds=[2., 1.])
+        self.assertEqual([device.end for device in lpt], [4., 4.])
+        self.assertEqual(lpt[0].operations[-1].end_time_on_device, 4.)
+
+        durations = (3., 3., 2., 2., 2.)
+        a0 = new_scheduler(SchedulerType.A0, [2., 1.])(2, [Operation(d, i) for i, d in enumerate(durations)])
+        exact = new_scheduler(SchedulerType.EXACT, [2., 1.])(2, [Operation(d, i) for i, d in enumerate(durations)])
+        for devices in (a0, exact):
+            for device in devices:
+                self.assertAlmostEqual(device.end, sum(op.duration for op in device.operations) / device.speed)
+        self.assertEqual(max(device.end for device in exact), 4.)
+        self.assertLessEqual(max(device.end for device in a0), 5.)
+        with self.assertWarns(RuntimeWarning):
+            multifit = new_scheduler(SchedulerType.MULTIFIT, [2., 1.])
+        multifit = multifit(2, [Operation(d, i) for i, d in enumerate(durations)])
+        self.assertEqual([device.end for device in multifit], [device.end for device in a0])
+
+        cpu = usable_cpus()[0]
+        self.assertEqual(measure_cpu_speeds((cpu,), 1000), [1.])
+        executor = ParallelExecutor([[0, 2], [1]], 1, 2, speeds=[2., 1.], cpus=[cpu, cpu])
+        self.assertEqual(executor.execute([partial(mul, i, 2) for i in range(3)]), [0, 2, 4])
+
+    def test_moldable_allotment_shortens_makespan(self) -> None:
+        """Test a huge task gets several threads, the small ones share the rest and the executor reserves them."""
+
+        durations = [12.] + [1.] * 6
+        allotment = allot_threads(durations, 4)
+        self.assertGreater(allotment[0], 1)
+        self.assertEqual(allotment[1:], [1] * 6)
+        self.assertLess(simulate_makespan([moldable_duration(d, k) for d, k in zip(durations, allotment)],
+                                          allotment, 4), simulate_makespan(durations, [1] * 7, 4))
+        self.assertEqual(allot_threads(durations, 4, max_threads=1), [1] * 7)
+        self.assertEqual(simulate_makespan([2., 1., 1.], [2, 1, 1], 2), 3.)
+
+        executor = ParallelExecutor([[0, 1, 2]], 1, 2)
+        self.assertEqual(executor.execute([partial(mul, i, 2) for i in range(3)], allotment=[2, 1, 1]), [0, 2, 4])
+        self.assertEqual(executor.execute_graph([partial(mul, 3, 2), partial(add, 1)], [[], [0]], allotment=[2, 1]),
+                         [6, 7])
+
+    def test_requested_thread_backend_shares_memory(self) -> None:
+        """Test a requested thread backend runs unpicklable tasks on shared data and a center solves the same."""
+
+        shared = array([1., 2., 3.])
+        executor = ParallelExecutor([[0, 1, 2]], 1, 2)
+        self.assertEqual(executor.execute([lambda i=i: shared[i] * 2 for i in range(3)],
+                                          backend=ExecutionBackend.THREAD), [2., 4., 6.])
+        self.assertEqual(executor.plan.backend, ExecutionBackend.THREAD)
+        self.assertEqual(executor.execute_graph([lambda: shared, lambda values: values.sum()], [[], [0]],
+                                                backend=ExecutionBackend.THREAD), [shared, 6.])
+
+        data = DataGenerator(3, [3, 2, 4], [2, 1, 3], seed=3).generate_center_data()
+        data = replace(data, config=replace(data.config, type=CenterType.GUARANTEED_CONCESSION, num_threads=2),
+                       elements=[replace(element, delta=.5) for element in data.elements])
+        qualities = list()
+        for backend in (ExecutionBackend.SEQUENTIAL, ExecutionBackend.THREAD):
+            solver = new_center_solver(replace(data, config=replace(data.config, execution_backend=backend)))
+            solver.coordinate()
+            qualities.append(solver.quality_functional()[1])
+        self.assertAlmostEqual(qualities[0], qualities[1])
+
+    def test_shared_memory_transport_survives_worker_crash(self) -> None:
+        """Test shared arrays reach process workers as handles, are unlinked after a crash, and solve the same."""
+
+        with SharedArena() as arena:
+            values = arena.share(arange(100.))
+            self.assertLess(len(dumps(values)), 200)
+            with ProcessPoolExecutor(1) as pool:
+                self.assertEqual(pool.submit(sum, values).result(), 4950.)
+                with self.assertRaises(BrokenProcessPool):
+                    pool.submit(_exit, 1).result()
+            name = arena.segments[0].name
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=name)
+
+        data = DataGenerator(3, [3, 2, 4], [2, 1, 3], seed=3).generate_center_data()
+        data = replace(data, config=replace(data.config, type=CenterType.GUARANTEED_CONCESSION, num_threads=2,
+                                            execution_backend=ExecutionBackend.PROCESS),
+                       elements=[replace(element, delta=.5) for element in data.elements])
+        solutions = list()
+        for transport in (False, True):
+            solver = new_center_solver(replace(data, config=replace(data.config, shared_memory_transport=transport)))
+            solver.coordinate()
+            solutions.append(solver.element_solutions)
+        self.assertEqual(solutions[0], solutions[1])
+
+    def test_distributed_backend_runs_on_local_nodes(self) -> None:
+        """Test the static groups run on the nodes they were scheduled for and a center solves the same."""
+
+        data = DataGenerator(3, [3, 2, 4], [2, 1, 3], seed=3).generate_center_data()
+        data = replace(data, config=replace(data.config, type=CenterType.GUARANTEED_CONCESSION, num_threads=2),
+                       elements=[replace(element, delta=.5) for element in data.elements])
+        with LocalNodes(2) as nodes:
+            executor = ParallelExecutor([[0, 2], [1]], 1, 2, backend=ExecutionBackend.DISTRIBUTED,
+                                        nodes=nodes.addresses)
+            self.assertEqual(executor.execute([getpid] * 3), [nodes.processes[t].pid for t in (0, 1, 0)])
+            self.assertEqual(executor.execute_graph([partial(sum, ones(1000)), partial(add, 1)], [[], [0]]),
+                             [1000., 1001.])
+
+            solutions = list()
+            for backend in (ExecutionBackend.SEQUENTIAL, ExecutionBackend.DISTRIBUTED):
+                solver = new_center_solver(replace(data, config=replace(
+                    data.config, execution_backend=backend, worker_nodes=nodes.addresses)))
+                solver.coordinate()
+                solutions.append(solver.element_solutions)
+            self.assertEqual(solutions[0], solutions[1])
+
+    def test_async_execution_streams_shares_pool_and_cancels(self) -> None:
+        """Test async execution yields longest first, shares a pool between centers and stops pending tasks."""
+
+        data = DataGenerator(3, [3, 2, 4], [2, 1, 3], seed=3).generate_center_data()
+        data = replace(data, config=replace(data.config, type=CenterType.GUARANTEED_CONCESSION, num_threads=2),
+                       elements=[replace(element, delta=.5) for element in data.elements])
+        expected = new_center_solver(data)
+        expected.coordinate()
+        started = list()
+
+        def record(index: int) -> None:
+            started.append(index)
+            sleep(.05)
+
+        async def collect(iterator) -> list:
+            return [i async for i, _ in iterator]
+
+        async def scenario() -> None:
+            executor = ParallelExecutor([[0]], 10, 2)
+            self.assertEqual([i async for i, _ in executor.execute_async([partial(abs, -i) for i in range(5)],
+                                                                         [1., 5., 2., 4., 3.])], [1, 3, 4, 2, 0])
+            with ThreadPoolExecutor(2) as pool:
+                solvers = [new_center_solver(data) for _ in range(2)]
+                orders = await gather(*[collect(solver.coordinate_async(pool)) for solver in solvers])
+                self.assertEqual([sorted(order) for order in orders], [[0, 1, 2]] * 2)
+                self.assertEqual([solver.element_solutions for solver in solvers], [expected.element_solutions] * 2)
+
+                consumer = create_task(collect(executor.execute_async(
+                    [partial(record, i) for i in range(20)], pool=pool)))
+                await sleep_async(.12)
+                consumer.cancel()
+                with self.assertRaises(CancelledError):
+                    await consumer
+
+        run(scenario())
+        self.assertLess(len(started), 20)
+
+    def test_streaming_execution_reports_every_task_and_writes_results(self) -> None:
+        """Test streamed results arrive per task within static groups and drive progress and the results file."""
+
+        executor = ParallelExecutor([[0, 2], [1]], 1, 2, backend=ExecutionBackend.THREAD)
+        self.assertEqual([i for i, _ in executor.execute_stream([partial(sleep, .3), partial(sleep, .1),
+                                                                 partial(sleep, .01)])], [1, 0, 2])
+        self.assertTrue(all(duration is not None for duration in executor.durations))
+
+        data = DataGenerator(3, [3, 2, 4], [2, 1, 3], seed=3).generate_center_data()
+        with TemporaryDirectory() as directory:
+            data = replace(data, config=replace(data.config, type=CenterType.GUARANTEED_CONCESSION, num_threads=1,
+                                                results_stream_path=path.join(directory, "results.jsonl")),
+                           elements=[replace(element, delta=.5) for element in data.elements])
+            solver, reports = new_center_solver(data), list()
+            solver.coordinate(progress=lambda done, total: reports.append((done, total)))
+            with open(data.config.results_stream_path) as file:
+                lines = [loads(line) for line in file]
+
+        self.assertEqual(reports, [(done, 6) for done in range(1, 7)])
+        self.assertEqual(sorted(line["element"] for line in lines), [0, 1, 2])
+        for line in lines:
+            self.assertEqual(line["solution"]["objective"], solver.element_solutions[line["element"]].objective)
+        self.assertEqual(list(solver.coordinate_stream()), list(enumerate(solver.element_solutions)))
+
+    def test_cancellation_and_time_limits_stop_runs_with_partial_results(self) -> None:
+        """Test cancellation and deadlines stop process workers at once, keeping the completed results with a status."""
+
+        tasks = [partial(mul, 2, 3), partial(sleep, 30.), partial(sleep, 30.)]
+        cancelled = ParallelExecutor([[0, 1], [2]], 1, 2, backend=ExecutionBackend.PROCESS)
+        Timer(1., cancelled.cancel).start()
+        start = perf_counter()
+        self.assertEqual(dict(cancelled.execute_stream(tasks)), {0: 6})
+        self.assertLess(perf_counter() - start, 10.)
+        self.assertEqual(cancelled.statuses, [ExecutionStatus.COMPLETED] + [ExecutionStatus.CANCELLED] * 2)
+        self.assertEqual(active_children(), [])
+
+        timed_out = ParallelExecutor([[0], [1, 2]], 1, 2, backend=ExecutionBackend.PROCESS)
+        timed_out.deadline = perf_counter() + 1.
+        self.assertEqual(timed_out.execute(tasks), [6, None, None])
+        self.assertLess(perf_counter() - start, 20.)
+        self.assertEqual(timed_out.statuses, [ExecutionStatus.COMPLETED] + [ExecutionStatus.TIMED_OUT] * 2)
+        self.assertEqual(timed_out.status, ExecutionStatus.TIMED_OUT)
+        self.assertEqual(active_children(), [])
+
+        async def collect_until_deadline() -> dict:
+            executor = ParallelExecutor([[0]], 1, 2, backend=ExecutionBackend.PROCESS)
+            executor.deadline = perf_counter() + 1.
+            return dict([result async for result in executor.execute_async(tasks, [3., 1., 2.])])
+
+        self.assertEqual(run(collect_until_deadline()), {0: 6})
+        self.assertLess(perf_counter() - start, 30.)
+        self.assertEqual(active_children(), [])
+
+        data = DataGenerator(3, [3, 2, 4], [2, 1, 3], seed=3).generate_center_data()
+        data = replace(data, config=replace(data.config, type=CenterType.GUARANTEED_CONCESSION, num_threads=1),
+                       elements=[replace(element, delta=.5) for element in data.elements])
+        solver = new_center_solver(data)
+        solver.cancel()
+        solver.coordinate()
+        self.assertEqual(solver.run_status, ExecutionStatus.CANCELLED)
+        self.assertEqual(solver.get_results_dict()["element_statuses"], ["CANCELLED"] * 3)
+
+        data = DataGenerator(2, [100, 100], [100, 100], seed=3).generate_center_data()
+        solver = new_center_solver(replace(data, config=replace(
+            data.config, type=CenterType.GUARANTEED_CONCESSION, num_threads=1, task_time_limit=1e-3),
+            elements=[replace(element, delta=.5) for element in data.elements]))
+        solver.coordinate()
+        self.assertEqual(solver.run_status, ExecutionStatus.TIMED_OUT)
+        self.assertTrue(all(solution.timed_out for solution in solver.element_solutions))
+
+    def test_crashed_workers_are_respawned_and_their_tasks_retried(self) -> None:
+        """Test a task crashing its worker fails alone after its retries while every other result is kept."""
+
+        tasks = [partial(mul, 2, 0), partial(mul, 2, 1), partial(_exit, 1), partial(mul, 2, 3)]
+        executor = ParallelExecutor([[0, 1], [2, 3]], 1, 2, backend=ExecutionBackend.PROCESS, max_retries=1,
+                                    isolate_crashes=True)
+        self.assertEqual(executor.execute(tasks), [0, 2, None, 6])
+        self.assertEqual(executor.statuses, [ExecutionStatus.COMPLETED] * 2 + [ExecutionStatus.FAILED]
+                         + [ExecutionStatus.COMPLETED])
+        self.assertEqual(executor.status, ExecutionStatus.FAILED)
+        self.assertGreaterEqual(executor.report.restarts, 1)
+
+        self.assertEqual(dict(executor.execute_stream(tasks)), {0: 0, 1: 2, 2: None, 3: 6})
+        self.assertEqual(executor.statuses[2], ExecutionStatus.FAILED)
+        self.assertEqual(executor.statuses.count(ExecutionStatus.COMPLETED), 3)
+
+    def test_interpreter_backend_runs_or_falls_back(self) -> None:
+        """Test sub-interpreters run the tasks where supported and processes otherwise."""
+
+        executor = ParallelExecutor([[0, 1, 2]], 1, 2, backend=ExecutionBackend.INTERPRETER)
+        self.assertEqual(executor.execute([partial(mul, i, 2) for i in range(3)]), [0, 2, 4])
+        self.assertEqual(executor.plan.backend, ExecutionBackend.INTERPRETER if interpreters_supported()
+                         else ExecutionBackend.PROCESS)
+        self.assertEqual(executor.execute_graph([partial(mul, 3, 2), partial(add, 1)], [[], [0]]), [6, 7])
+
+    def test_dynamic_execution_chunks_longest_first(self) -> None:
+        """Test dynamic chunks are cost-bounded and longest-first and that every task runs with a report."""
+
+        self.assertEqual(make_chunks([1., 4., 1., 2., 1., 1.], 2, 2), [[1], [3], [0, 2], [4, 5]])
+
+        tasks = [partial(abs, -float(i)) for i in range(1000)]
+        self.assertEqual({i: result for i, (result, _) in bind_task_group(tasks, [3, 7])()[2].items()}, {3: 3., 7: 7.})
+        self.assertLess(len(dumps(bind_task_group(tasks, [3, 7]))) * 100, len(dumps(tasks)))
+
+        executor = ParallelExecutor([[0], [1]], 1, 2, mode=ExecutionMode.DYNAMIC)
+        self.assertEqual(executor.execute([partial(abs, -i) for i in range(5)], [5., 4., 3., 2., 1.]),
+                         [0, 1, 2, 3, 4])
+        self.assertEqual(executor.report.mode, ExecutionMode.DYNAMIC)
+        self.assertEqual((executor.plan.backend, executor.plan.workers), (ExecutionBackend.PROCESS, 2))
+        self.assertIn("min_threshold 1", executor.plan.reason)
+        self.assertGreaterEqual(executor.report.total_idle, .0)
+        self.assertTrue(all(duration is not None for duration in executor.durations))
+
+    def test_speculative_execution_overtakes_straggler(self) -> None:
+        """Test a task running far past its estimate is re-executed and the faster backup copy wins."""
+
+        executor = ParallelExecutor([[0], [1]], 1, 2, mode=ExecutionMode.DYNAMIC, chunks_per_worker=4,
+                                    speculation_factor=3., speculation_poll=.01)
+        executor.execute([partial(sleep, .05)] * 3 + [partial(sleep, 5.)], [1.] * 4, backups=[partial(sleep, .05)] * 4)
+
+        self.assertEqual(executor.report.speculative_launches, 1)
+        self.assertEqual(executor.report.speculative_wins, 1)
+        self.assertLess(executor.report.makespan, 2.)
+        self.assertLess(executor.durations[3], 1.)
+
+    def test_task_graph_passes_dependency_results(self) -> None:
+        """Test graph tasks receive the results of their dependencies, sequentially and on a pool."""
+
+        tasks = [partial(int, 3), partial(int, 4), mul, partial(add, 1), add]
+        dependencies = [[], [], [0, 1], [2], [3, 0]]
+        for threshold in (10, 1):
+            executor = ParallelExecutor([[0]], threshold, 2)
+            self.assertEqual(executor.execute_graph(tasks, dependencies), [3, 4, 12, 13, 16])
+            self.assertTrue(all(duration is not None for duration in executor.durations))
+
+        with self.assertRaises(AssertionError):
+            ParallelExecutor([[0]], 1, 2).execute_graph([mul, mul], [[1], [0]])
+
+    def test_memory_budget_delays_and_backfills_tasks(self) -> None:
+        """Test two tasks exceeding the memory budget together never overlap, while a small task fills the gap."""
+
+        executor = ParallelExecutor([[0, 1, 2]], 1, 2, memory=[3., 3., 1.], memory_budget=4.)
+        executor.execute([partial(sleep, .3)] * 3, [3., 2., 1.])
+
+        self.assertGreaterEqual(executor.report.makespan, .6)
+        self.assertLess(executor.report.makespan, .85)
+
+    def test_worker_affinity_groups_keys_and_caches_lru(self) -> None:
+        """Test tasks of one affinity key share a group and the worker cache evicts the least recently used entry."""
+
+        groups = group_by_affinity([1, 1, 5, 1, 2, 1], [0, 1, 0, None, 1, 0], 2)
+        self.assertEqual(sorted(groups), [[0, 2, 5], [1, 3, 4]])
+        self.assertEqual(len(group_by_affinity([1] * 6, [0, 1, 0, 1, 0, 1], 2, 4)), 2)
+
+        cache = WorkerCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.take("c"), len(cache)), (1, None, 3, 1))
+
+    def test_planner_weighs_work_against_overheads(self) -> None:
+        """Test the planner runs small batches sequentially and large ones on processes, and explains why."""
+
+        planner = ExecutionPlanner(1., ExecutionOverheads(), max_workers=4)
+
+        plan = planner.plan([1e-4] * 8, 4)
+        self.assertEqual((plan.backend, plan.workers), (ExecutionBackend.SEQUENTIAL, 1))
+        self.assertIn("sequential", str(plan))
+
+        plan = planner.plan([1.] * 8, 4, payload_bytes=lambda: 1 << 10)
+        self.assertEqual((plan.backend, plan.workers), (ExecutionBackend.PROCESS, 4))
+        self.assertIn("process x4", plan.reason)
+
+        executor = ParallelExecutor([[0, 1]], None, 4, planner=planner)
+        self.assertEqual(executor.execute([partial(int, 1), partial(int, 2)], [1e-4] * 2), [1, 2])
+        self.assertEqual(executor.plan.backend, ExecutionBackend.SEQUENTIAL)
+
+        planner = ExecutionPlanner(1., ExecutionOverheads(process_startup=0., process_task=1., process_byte=0.),
+                                   max_workers=2)
+        executor = ParallelExecutor([list(range(8))], None, 2, memory_budget=1e9, planner=planner)
+        self.assertEqual(executor.execute([partial(int, i) for i in range(8)], [3.] * 8), list(range(8)))
+        self.assertEqual(executor.plan.backend, ExecutionBackend.PROCESS)
+        self.assertAlmostEqual(executor.plan.estimates["process x2"], 24. / 2 + 4 * 1.)
+
+    def test_runtime_history_smooths_and_drives_order(self) -> None:
+        """Test runs record smoothed element durations that later runs prefer over formula estimates."""
+
+        history = RuntimeHistory(smoothing=.5)
+        history.record("key", 2.)
+        history.record("key", 4.)
+        self.assertEqual(history.estimate("key"), 3.)
+        self.assertIsNone(history.estimate("missing"))
+        self.assertEqual(blend_durations([10., 20., 40.], [1., None, 4.]), [1., 20. * .1, 4.])
+
+        base_data = DataGenerator(3, [3, 2, 4], [2, 1, 3], seed=3).generate_center_data()
+        with TemporaryDirectory() as directory:
+            data = replace(base_data, config=replace(base_data.config, type=CenterType.WEIGHTED_BALANCE, num_threads=1,
+                                                     runtime_history_path=path.join(directory, "history.json")))
+            for _ in range(2):
+                solver = new_center_solver(data)
+                solver.coordinate()
+
+            history = RuntimeHistory.load(data.config.runtime_history_path)
+        self.assertEqual(len(history.entries), 3)
+        self.assertTrue(all(entry["samples"] == 2 for entry in history.entries.values()))
+        self.assertEqual(sorted(index for group in solver.order for index in group), [0, 1, 2])
+
+    def test_effective_problem_sizes_follow_formulation(self) -> None:
+        """Test effective sizes account for bounds, the NEGOTIATED formulation and strategy rows."""
+
+        data = DataGenerator(2, [3, 2], [4, 1], seed=4).generate_center_data()
+        data = replace(data, elements=[replace(data.elements[0], config=replace(
+            data.elements[0].config, type=ElementType.DECENTRALIZED)), replace(data.elements[1], config=replace(
+            data.elements[1].config, type=ElementType.NEGOTIATED))])
+        packed = PackedCenterData.from_center_data(data)
+
+        self.assertEqual(effective_problem_sizes(packed), [(4 + 6, 3, 12 + 6), (1 + 4, 4, 2 * 2 + 6)])
+        self.assertEqual(effective_problem_sizes(packed, CenterType.GUARANTEED_CONCESSION)[0], (11, 3, 21))
+        self.assertEqual(effective_problem_sizes(packed, element_type=ElementType.DECENTRALIZED)[1], (5, 2, 6))
+
+    def test_fit_empiric_recovers_coefficients_and_profile_round_trip(self) -> None:
+        """Test fit_empiric recovers known coefficients and a saved profile is loaded back."""
+
+        truth = EmpiricCoefficients(a=2e-5, b=1.1, c=.9, d=.3, e=1e-3, f=.1, g=.2)
+        sizes = [(m, n) for m in (3, 8, 20, 50, 120, 300) for n in (2, 6, 15, 40, 100, 250)]
+        fitted, rmse = fit_empiric(sizes, [empiric(size, truth) for size in sizes], regularization=0.)
+
+        self.assertLess(rmse, 1e-6)
+        for size in sizes:
+            self.assertAlmostEqual(empiric(size, fitted) / empiric(size, truth), 1., places=5)
+
+        with TemporaryDirectory() as directory:
+            save_coefficients(fitted, filepath := path.join(directory, "profile.json"))
+            self.assertEqual(load_coefficients(filepath), fitted)
+        self.assertEqual(load_coefficients(path.join(directory, "missing.json")), EmpiricCoefficients())
+
 
 class TestSolversFactories(TestCase):
     """Tests for solver factory functions."""
@@ -226,6 +761,21 @@ def test_new_element_solver_types(self) -> None:
         self.assertIsInstance(solver_dec, ElementLinearFirst)
         self.assertIsInstance(solver_neg, ElementLinearSecond)
 
+    def test_reused_element_solver_matches_a_fresh_one(self) -> None:
+        """Test a cached model is reused with incrementality off only from its second solve on."""
+
+        data = DataGenerator(1, [4], [3], seed=2).generate_center_data().elements[0]
+        solver = take_element_solver(data)
+        solver.setup()
+        first = solver.solve()
+        self.assertFalse(solver.reused)
+
+        keep_element_solver(solver)
+        self.assertIs(take_element_solver(data), solver)
+        self.assertTrue(solver.reused)
+        solver.setup()
+        self.assertAlmostEqual(solver.solve().objective, first.objective)
+
 
 class TestSolvers(TestCase):
     """Tests for main solver classes."""
@@ -251,6 +801,94 @@ def test_new_center_solver_types(self) -> None:
         self.assertIsInstance(solver_third, CenterLinearThird)
         self.assertIsInstance(solver_fourth, CenterLinkedFirst)
 
+    def test_modify_constraints_requires_preliminary_values(self) -> None:
+        """Test element problems fail clearly before their preliminary values are known, and solve after."""
+
+        base_data = DataGenerator(2, [3, 2], [2, 1], seed=1).generate_center_data()
+        base_data = replace(base_data, elements=[replace(element, delta=.5) for element in base_data.elements])
+        for center_type in (CenterType.STRICT_PRIORITY, CenterType.GUARANTEED_CONCESSION):
+            data = replace(base_data, config=replace(base_data.config, type=center_type, num_threads=1))
+            solver = new_center_solver(data)
+            with self.assertRaisesRegex(RuntimeError, "compute_preliminary_values"):
+                solver.modify_constraints(0, new_element_solver(data.elements[0]))
+
+            solver.compute_preliminary_values()
+            coordinated = new_center_solver(data)
+            coordinated.coordinate()
+            self.assertAlmostEqual(solver.solve_element(0).objective, coordinated.element_solutions[0].objective)
+
+    def test_weighted_balance_sweep_keeps_top_k_plans(self) -> None:
+        """Test the weighted balance sweep keeps all summaries but only the chosen and top-k plans."""
+
+        base_data = DataGenerator(2, [3, 2], [2, 1], seed=3).generate_center_data()
+        data = replace(base_data, config=replace(base_data.config, type=CenterType.WEIGHTED_BALANCE, num_threads=1,
+                                                 sweep_plans_top_k=1),
+                       elements=[replace(element, w=array([2., 0., 1., 1.])) for element in base_data.elements])
+
+        solver = new_center_solver(data)
+        solver.coordinate()
+        results = solver.get_results_dict()["center_type_specific_results"]["weighted_balance_analysis"]
+
+        self.assertEqual(solver.sweep.objectives.shape, (2, 3))
+        testing.assert_array_equal(solver.sweep.w[0], [0., 1., 2.])
+        self.assertAlmostEqual(solver.solve_element(0, 1.).objective, solver.sweep.objectives[0, 1])
+        for e, element_results in enumerate(results):
+            self.assertEqual(list(element_results["solutions_by_w"]), [0., 1., 2.])
+            kept = [payload for payload in element_results["solutions_by_w"].values() if payload["solution_plan"]]
+            self.assertLessEqual(len(kept), 2)
+            chosen = [payload for payload in element_results["solutions_by_w"].values() if payload["is_chosen"]]
+            self.assertEqual(chosen[0]["solution_plan"], solver.element_solutions[e].plan)
+
+        sweep = WeightSweep.allocate(data.elements, plans_top_k=1)
+        sweep.element_qf[0, 1] = 1.
+        self.assertEqual(sweep.plan_candidates(0), [1])
+        sweep.element_qf[0, 0] = 1.
+        self.assertEqual(sweep.plan_candidates(0), [0, 1])
+        sweep.element_qf[0, 2] = 3.
+        self.assertEqual(sweep.plan_candidates(0), [0, 2])
+
+    def test_sparse_costs_solve_like_dense(self) -> None:
+        """Test a center with sparse A_e reaches the same solution as with the equivalent dense A_e."""
+
+        dense_data = DataGenerator(2, [3, 2], [2, 3], seed=3).generate_center_data()
+        dense_data = replace(dense_data, config=replace(dense_data.config, num_threads=1))
+        sparse_data = replace(dense_data, elements=[replace(element, aggregated_plan_costs=SparseMatrix.from_dense(
+            element.aggregated_plan_costs)) for element in dense_data.elements])
+
+        results = list()
+        for data in (dense_data, sparse_data):
+            solver = new_center_solver(data)
+            solver.coordinate()
+            results.append([solution.objective for solution in solver.element_solutions])
+        testing.assert_array_almost_equal(results[0], results[1])
+
+    def test_weighted_balance_tasks_memory_flat_in_w_grid(self) -> None:
+        """Test the sweep tasks share element data, so the peak memory of a sweep does not scale with the w grid."""
+
+        base_data = DataGenerator(1, [2], [1], seed=3).generate_center_data()
+        element = base_data.elements[0]
+        large_element = replace(element, aggregated_plan_costs=ones((1000, 2)),
+                                resource_constraints=(ones(1000) * 1e4, *element.resource_constraints[1:]),
+                                config=replace(element.config, num_constraints=1000))
+
+        def coordinate_peak_memory(grid_size: int) -> int:
+            data = replace(base_data, config=replace(base_data.config, type=CenterType.WEIGHTED_BALANCE,
+                                                     num_threads=1),
+                           elements=[replace(large_element, w=array([float(w) for w in range(grid_size)]))])
+            solver = new_center_solver(data)
+
+            trace_start()
+            solver.coordinate()
+            peak = get_traced_memory()[1]
+            trace_stop()
+
+            self.assertEqual(len(solver.sweep.w[0]), grid_size)
+            return peak
+
+        coordinate_peak_memory(2)  # warm up the caches of the first solve
+        small, large = coordinate_peak_memory(2), coordinate_peak_memory(16)
+        self.assertLess(large - small, 4 * large_element.aggregated_plan_costs.nbytes)
+
 
 if __name__ == "__main__":
     main(argv=["first-arg-is-ignored"], exit=False)